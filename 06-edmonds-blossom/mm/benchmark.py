@@ -0,0 +1,44 @@
+"""A scaling benchmark of the blossom algorithm, validated against the ILP in mm.py."""
+import argparse
+import time
+
+import mm
+import mm_blossom
+
+from networkx import generators
+
+parser = argparse.ArgumentParser(description=__doc__)
+
+parser.add_argument("-d", "--degree", help="the average degree of the random graphs (defaults to 8)", type=int, default=8)
+parser.add_argument("-m", "--max-edges", help="the number of edges of the largest graph (defaults to 100000)", type=int, default=100_000)
+parser.add_argument("-o", "--oracle-limit", help="only validate graphs with at most this many edges (defaults to 30000)", type=int, default=30_000)
+parser.add_argument("-s", "--seed", help="the seed of the random graphs (defaults to 0)", type=int, default=0)
+
+arguments = parser.parse_args()
+
+print(f"{'n':>7} {'m':>7} | {'matching':>8} {'blossom':>9} | {'ILP':>9}")
+
+sizes = [100, 300, 1000, 3000, 10_000, 30_000, 100_000, 300_000, 1_000_000]
+
+for edges in [size for size in sizes if size <= arguments.max_edges]:
+    n = 2 * edges // arguments.degree
+    g = generators.random_graphs.gnm_random_graph(n, edges, seed=arguments.seed)
+
+    graph = (list(g.nodes), list(g.edges))
+
+    start = time.perf_counter()
+    result = mm_blossom.get_maximum_matching(graph)
+    blossom_time = time.perf_counter() - start
+
+    oracle = "-"
+    if edges <= arguments.oracle_limit:
+        start = time.perf_counter()
+        expected = mm.get_maximum_matching(graph[1])
+        oracle = f"{time.perf_counter() - start:.4f}s"
+
+        if len(result) != len(expected):
+            print(f"MISMATCH: the blossom algorithm found {len(result)} edges, the ILP {len(expected)}")
+            quit(1)
+
+    print(f"{n:>7} {edges:>7} | {len(result):>8} {blossom_time:>8.4f}s | {oracle:>9}")
+
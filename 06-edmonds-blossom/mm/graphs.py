@@ -0,0 +1 @@
+../../graphs.py
\ No newline at end of file
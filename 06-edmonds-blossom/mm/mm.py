@@ -1,24 +1,45 @@
 from pulp import *
 
 
-def get_maximum_matching(edges):
-    vertices = set([u for u, v in edges] + [v for u, v in edges])
+def get_greedy_matching(edges):
+    """Return a maximal (not necessarily maximum) matching, taking the edges in order."""
+    matched = set()
+    matching = []
 
-    n = len(vertices)
-    m = len(edges)
+    for u, v in edges:
+        if u != v and u not in matched and v not in matched:
+            matching.append((u, v))
+            matched.update((u, v))
+
+    return matching
+
+
+def get_maximum_matching(edges, warm_start=True):
+    """Return the maximum matching of the graph using ILP (optionally starting from a greedy one)."""
+    edges = [e for e in dict.fromkeys(edges) if e[0] != e[1]]
 
     model = LpProblem(sense=LpMaximize)
 
-    variables = {e: LpVariable(name=f"x_{e}", cat="Binary") for e in edges}
+    variables = {e: LpVariable(name=f"x_{i}", cat="Binary") for i, e in enumerate(edges)}
+
+    incident = {}
+    for e in edges:
+        for v in e:
+            incident.setdefault(v, []).append(variables[e])
+
+    # each vertex is covered by at most one of the edges
+    for v, vs in incident.items():
+        if len(vs) > 1:
+            model += lpSum(vs) <= 1
+
+    model += lpSum(variables.values())
 
-    for v in vertices:
-        for a in edges:
-            for b in edges:
-                if v in a and v in b and a != b:
-                    model += variables[a] + variables[b] <= 1
+    if warm_start:
+        greedy = set(get_greedy_matching(edges))
 
-    model += lpSum([variables[e] for e in variables])
+        for e, variable in variables.items():
+            variable.setInitialValue(1 if e in greedy else 0)
 
-    status = model.solve(PULP_CBC_CMD(msg=False))
+    status = model.solve(PULP_CBC_CMD(msg=False, warmStart=warm_start))
 
-    return [e for e in edges if variables[e].value()]
+    return [e for e in edges if variables[e].value() > 0.5]
@@ -1,301 +1,242 @@
-from typing import Tuple, List
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from graphs import CompactGraph
 
 Vertex = int
 Edge = Tuple[Vertex, Vertex]
 Graph = Tuple[List[Vertex], List[Edge]]
 
+# called with ("grow", v, w, x) when the even vertex v adds w (matched to x) to the forest,
+# ("blossom", base, cycle) when a blossom is contracted and ("augment", path) when a path is found
+EventHandler = Callable[..., None]
 
-def neighbours(v: Vertex, graph: Graph) -> List[Vertex]:
-    """Return the neighbours of the vertex v in the graph."""
-    return list(
-        set([a for a, b in graph[1] if b == v]).union(
-            set([b for a, b in graph[1] if a == v])
-        )
-    )
+UNMATCHED = -1
 
 
-def get_exposed_vertices(graph: Graph, matching: List[Edge]) -> List[Vertex]:
-    """Return the exposed vertices of the graph, given a matching."""
-    return [
-        v
-        for v in graph[0]
-        if v not in list(set([v for _, v in matching] + [v for v, _ in matching]))
-    ]
+class Bases:
+    """A union-find of the vertices of the contracted blossoms, each set remembering its base.
 
+    Contracting a blossom only joins the sets of its vertices, so the graph is never copied."""
 
-def path_to_root(v, parent):
-    """Return the path to the root of the forest, given a vertex."""
-    path = []
-    while parent[v] != v:
-        path.append((v, parent[v]))
-        v = parent[v]
-    return path
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.base = list(range(n))
 
+    def find(self, v: int) -> int:
+        """Return the base of the blossom containing v (or v itself)."""
+        root = v
+        while self.parent[root] != root:
+            root = self.parent[root]
 
-def reverse_tuples(l: List) -> List:
-    """[(0, 1), (2, 3)] -> [(1, 0), (3, 2)]."""
-    return list(map(lambda x: tuple(reversed(x)), l))
+        while self.parent[v] != root:
+            self.parent[v], v = root, self.parent[v]
 
+        return self.base[root]
 
-def reverse_list(l: List) -> List:
-    """[0, 1, 2] -> [2, 1, 0]"""
-    return list(reversed(l))
+    def join(self, v: int, base: int):
+        """Join the blossom containing v to the one with the given base."""
+        a, b = self._root(v), self._root(base)
 
+        if a != b:
+            self.parent[a] = b
+            self.base[b] = base
 
-def get_blossom_edges(v: Vertex, w: Vertex, parent) -> List[Edge]:
-    """Get the path around the blossom, starting from the root."""
-    v_path = reverse_list(reverse_tuples(path_to_root(v, parent)))
-    w_path = reverse_list(reverse_tuples(path_to_root(w, parent)))
+    def _root(self, v: int) -> int:
+        while self.parent[v] != v:
+            v = self.parent[v]
+        return v
 
-    while len(v_path) != 0 and len(w_path) != 0 and v_path[0] == w_path[0]:
-        v_path.pop(0)
-        w_path.pop(0)
 
-    return v_path + [(v, w)] + reverse_list(reverse_tuples(w_path))
+class Matcher:
+    """Edmonds' blossom algorithm on vertex-indexed arrays.
 
+    Each search grows an alternating tree from one exposed root, contracting the blossoms by
+    joining their vertices in Bases (instead of building a contracted graph) and keeping the path
+    around them in the parent array, so it takes O(E) time (up to the union-find) and the whole
+    algorithm O(V * E)."""
 
-def get_blossom_vertices(v: Vertex, w: Vertex, parent) -> List[Vertex]:
-    """Get the vertices of a blossom from the forest that ends in v, w.
-    It is guaranteed that the first vertex is the root."""
-    combined_path_vertices = [v for e in get_blossom_edges(v, w, parent) for v in e]
+    def __init__(self, graph: Graph, matching: List[Edge] = (), on_event: Optional[EventHandler] = None):
+        self.compact = CompactGraph(*graph)
+        self.n = len(self.compact)
+        self.on_event = on_event
 
-    return [combined_path_vertices[0]] + list(
-        set(combined_path_vertices) - {combined_path_vertices[0]}
-    )
+        # the neighbours are read many times, so they are unpacked from the CSR arrays once
+        self.adjacency = [list(dict.fromkeys(self.compact.adjacent(i))) for i in range(self.n)]
 
+        self.mate = [UNMATCHED] * self.n
+        for a, b in matching:
+            a, b = self.compact.index[a], self.compact.index[b]
+            self.mate[a], self.mate[b] = b, a
 
-def get_augmenting_blossom_path(v: Vertex, w: Vertex, edges: List[Edge]):
-    """Get the path around the blossom edges, with the root being v and exit point being w."""
-    if v == w:
-        return []
+    def _emit(self, kind: str, *args):
+        if self.on_event is not None:
+            self.on_event(kind, *args)
 
-    # first, try to go this way
-    cycle = edges + edges
-    s, e = -1, -1
-    path = []
-    for i, (a, b) in enumerate(cycle):
-        if a == v:
-            s = i
+    def _label(self, v: int) -> Vertex:
+        return self.compact.vertices[v]
 
-        if s != -1:
-            path.append((a, b))
+    def greedy(self):
+        """Match the vertices greedily (lowest degree first), which leaves far fewer searches."""
+        for v in sorted(range(self.n), key=lambda v: len(self.adjacency[v])):
+            if self.mate[v] != UNMATCHED:
+                continue
 
-        if b == w:
-            if len(path) % 2 == 0:
-                return path
-            break
+            for w in self.adjacency[v]:
+                if w != v and self.mate[w] == UNMATCHED:
+                    self.mate[v], self.mate[w] = w, v
+                    break
+
+    def _lca(self, a: int, b: int) -> int:
+        """Return the base of the blossom closing the even-even edge between a and b."""
+        seen = set()
+
+        # walking up from both sides in turns, so the cost is proportional to the blossom
+        while True:
+            if a != UNMATCHED:
+                a = self.bases.find(a)
+
+                if a in seen:
+                    return a
+
+                seen.add(a)
+                a = self.parent[self.mate[a]] if self.mate[a] != UNMATCHED else UNMATCHED
+
+            a, b = b, a
+
+    def _contract(self, v: int, base: int, child: int, cycle: List[int]):
+        """Contract the path from v to the base of the blossom, pointing the parents around it."""
+        while self.bases.find(v) != base:
+            w = self.mate[v]
+
+            # the odd vertices become even, so they are searched from too
+            self.parent[v] = child
+            for x in (v, w):
+                if not self.even[x]:
+                    self.even[x] = True
+                    self.queue.append(x)
+
+                self.bases.join(x, base)
+                cycle.append(x)
+
+            child = w
+            v = self.parent[w]
+
+    def search(self, root: int) -> Optional[List[int]]:
+        """Grow an alternating tree from the exposed root, returning the vertices of an augmenting
+        path (from the root to another exposed vertex) or None if there isn't one."""
+        self.bases = Bases(self.n)
+        self.parent = [UNMATCHED] * self.n
+        self.even = [False] * self.n
+
+        self.even[root] = True
+        self.queue = deque([root])
+
+        while self.queue:
+            v = self.queue.popleft()
+
+            for w in self.adjacency[v]:
+                if self.bases.find(v) == self.bases.find(w) or self.mate[v] == w:
+                    continue
+
+                # w is even too, so the edge closes a blossom
+                if w == root or (self.mate[w] != UNMATCHED and self.parent[self.mate[w]] != UNMATCHED):
+                    base = self._lca(v, w)
+
+                    cycle = [base]
+                    self._contract(v, base, w, cycle)
+                    self._contract(w, base, v, cycle)
 
-    # now try to go the other way
-    cycle = reverse_list(reverse_tuples(cycle))
-    s, e = -1, -1
-    path = []
-    for i, (a, b) in enumerate(cycle):
-        if a == v:
-            s = i
+                    self._emit("blossom", self._label(base), [self._label(x) for x in dict.fromkeys(cycle)])
 
-        if s != -1:
-            path.append((a, b))
+                elif self.parent[w] == UNMATCHED:
+                    self.parent[w] = v
 
-        if b == w:
-            if len(path) % 2 == 0:
+                    # w is exposed, so the path to it augments
+                    if self.mate[w] == UNMATCHED:
+                        path = [w]
+                        while True:
+                            path.append(self.parent[path[-1]])
+
+                            if self.mate[path[-1]] == UNMATCHED:
+                                return path[::-1]
+
+                            path.append(self.mate[path[-1]])
+
+                    x = self.mate[w]
+                    self._emit("grow", self._label(v), self._label(w), self._label(x))
+
+                    self.even[x] = True
+                    self.queue.append(x)
+
+        return None
+
+    def augment(self, path: List[int]):
+        """Flip the matching along the augmenting path."""
+        self._emit("augment", self._to_edges(path))
+
+        for i in range(0, len(path), 2):
+            a, b = path[i], path[i + 1]
+            self.mate[a], self.mate[b] = b, a
+
+    def _to_edges(self, path: List[int]) -> List[Edge]:
+        return [(self._label(a), self._label(b)) for a, b in zip(path, path[1:])]
+
+    def find_augmenting_path(self) -> Optional[List[int]]:
+        """Return an augmenting path from any of the exposed vertices (or None if there isn't one)."""
+        for v in range(self.n):
+            if self.mate[v] == UNMATCHED and (path := self.search(v)) is not None:
                 return path
-            break
 
-    print("This should not have happened, there is a bug somewhere.")
-    quit()
+        return None
 
+    def run(self):
+        """Augment the matching until it is maximum.
 
-def find_augmenting_path(graph: Graph, matching: List[Edge]) -> List[Edge]:
+        A vertex with no augmenting path from it never gets one later, so each vertex is searched
+        from at most once."""
+        for v in range(self.n):
+            if self.mate[v] == UNMATCHED and (path := self.search(v)) is not None:
+                self.augment(path)
+
+    def get_matching(self, edges: List[Edge]) -> List[Edge]:
+        """Return the matched edges, oriented like in the given edge list."""
+        index = self.compact.index
+
+        matching, matched = [], set()
+        for a, b in edges:
+            if self.mate[index[a]] == index[b] and a not in matched:
+                matching.append((a, b))
+                matched.update((a, b))
+
+        return matching
+
+
+def find_augmenting_path(graph: Graph, matching: List[Edge], on_event: Optional[EventHandler] = None) -> List[Edge]:
     """Find and return an augmenting path in the graph, or [] if there isn't one."""
-    # FOREST variables
-    parent = {}  # parent[v]... parent of v in the forest
-    root_node = {}  # root_node[v]... root node for v
-    layer = {}  # layer[v]... which layer is v in
-
-    # start with all exposed vertices as tree roots
-    queue = get_exposed_vertices(graph, matching)
-    marked = set(matching)
-
-    for v in queue:
-        parent[v] = v
-        root_node[v] = v
-        layer[v] = 0
-
-    # run a BFS to add the augmenting paths to the forest
-    while len(queue) != 0:
-        v = queue.pop(0)
-
-        # skip marked vertices
-        if v in marked:
-            continue
-
-        for w in neighbours(v, graph):
-            if (v, w) in marked or (w, v) in marked:
-                continue
+    matcher = Matcher(graph, matching, on_event)
+    path = matcher.find_augmenting_path()
 
-            # add neighbours of w that are in the matching to the forest
-            if w not in layer:
-                # w is in the forest, so it is matched
-                parent[w] = v
-                layer[w] = layer[v] + 1
-                root_node[w] = root_node[v]
-
-                # find the one vertex it is matched with
-                for x in neighbours(w, graph):
-                    if (w, x) in matching or (x, w) in matching:
-                        parent[x] = w
-                        layer[x] = layer[w] + 1
-                        root_node[x] = root_node[w]
-
-                        queue.append(x)
-            else:
-                if layer[w] % 2 == 0:
-                    if root_node[v] != root_node[w]:
-                        return (
-                            reverse_list(path_to_root(v, parent))
-                            + [(v, w)]
-                            + path_to_root(w, parent)
-                        )
-                    else:
-                        vertices = get_blossom_vertices(v, w, parent)
-                        root = vertices[0]
-
-                        # preserve the root as the new vertex
-                        new_vertices = list(set(graph[0]) - set(vertices[1:]))
-
-                        # transform all edges that previously went to the blossom to the new single vertex
-                        new_edges = [
-                            (
-                                a if a not in vertices else vertices[0],
-                                b if b not in vertices else vertices[0],
-                            )
-                            for a, b in graph[1]
-                        ]
-
-                        # remove loops and multi-edges
-                        new_edges = [(a, b) for a, b in new_edges if a != b]
-                        new_edges = [
-                            (a, b)
-                            for a, b in new_edges
-                            if (b, a) not in new_edges or b < a
-                        ]
-
-                        # remove removed edges from the matching
-                        new_matching = [
-                            (a, b)
-                            for a, b in matching
-                            if a not in vertices[1:] and b not in vertices[1:]
-                        ]
-                        new_graph = (new_vertices, new_edges)
-
-                        # recursively find the augmenting path in the new graph
-                        path = find_augmenting_path(new_graph, new_matching)
-
-                        # if no path was found, no path lifting will be done
-                        if path == []:
-                            return []
-
-                        # find the edges that are connected to the compressed vertex
-                        edges_in_vertices = []
-                        for a, b in path:
-                            if a in vertices or b in vertices:
-                                edges_in_vertices.append((a, b))
-
-                        # if the path doesn't cross the blossom, simply return it
-                        if len(edges_in_vertices) == 0:
-                            return path
-
-                        # find the other vertex that the blossom is connected to
-                        # it enters through the root and must leave somewhere...
-                        enter_edge = None
-                        leave_edge = None
-                        leave_edge_match = None
-                        for a_orig, b_orig in edges_in_vertices:
-                            vertex = a_orig if a_orig != root else b_orig
-
-                            candidates = []
-
-                            for b, c in graph[1]:
-                                if (
-                                    b == vertex
-                                    and c in vertices
-                                    or c == vertex
-                                    and b in vertices
-                                ):
-                                    candidates.append((b, c))
-
-                            for a, b in candidates:
-                                if a == root or b == root and enter_edge is None:
-                                    enter_edge = (a if a != root else b, root)
-                                    break
-                            else:
-                                # doesn't matter... we can make any vertex work
-                                a, b = candidates[0]
-
-                                leave_edge_match = (a_orig, b_orig)
-                                leave_edge = (
-                                    a if a not in vertices else b,
-                                    a if a in vertices else b,
-                                )
-
-                        if leave_edge is None:
-                            return path
-
-                        if leave_edge is not None and enter_edge is not None:
-                            print(graph)
-                            print("NICE")
-                            for a, b in graph[1]:
-                                print(a, b)
-                            quit()
-
-                        blossom_path = get_augmenting_blossom_path(
-                            root, leave_edge[1], get_blossom_edges(v, w, parent)
-                        )
-
-                        i = path.index(leave_edge_match)
-
-                        # improve the matching by injecting the lifted path
-                        if i - 1 >= 0 and root in path[i]:
-                            reverse_list(blossom_path)
-
-                        return path[:i] + blossom_path + [leave_edge] + path[i + 1 :]
-                else:
-                    pass  # do nothing!
-
-            marked.add((v, w))
-
-        marked.add(v)
-
-    return []
-
-
-def improve_matching(graph: Graph, matching: List[Edge]) -> List[Edge]:
-    """Attempt to improve the given matching in the graph."""
-    path = find_augmenting_path(graph, matching)
+    return matcher._to_edges(path) if path is not None else []
 
-    improved_matching = list(matching)
-    if path != []:
-        for i, e in enumerate(path):
-            # a bit of a hack since the edges are all messed up
-            if e not in graph[1]:
-                e = (e[1], e[0])
 
-            if i % 2 == 0:
-                improved_matching.append(e)
-            else:
-                improved_matching.remove(e)
+def improve_matching(graph: Graph, matching: List[Edge], on_event: Optional[EventHandler] = None) -> List[Edge]:
+    """Attempt to improve the given matching in the graph."""
+    matcher = Matcher(graph, matching, on_event)
+
+    if (path := matcher.find_augmenting_path()) is not None:
+        matcher.augment(path)
 
-    return improved_matching
+    return matcher.get_matching(graph[1])
 
 
-def get_maximum_matching(graph: Graph) -> List[Edge]:
-    """Find the maximum matching in a graph."""
-    matching = []
+def get_maximum_matching(graph: Graph, on_event: Optional[EventHandler] = None, greedy: bool = True) -> List[Edge]:
+    """Find the maximum matching in a graph (starting from a greedy one, unless disabled)."""
+    matcher = Matcher(graph, on_event=on_event)
 
-    while True:
-        improved_matching = improve_matching(graph, matching)
+    if greedy:
+        matcher.greedy()
 
-        if matching == improved_matching:
-            return matching
+    matcher.run()
 
-        matching = improved_matching
+    return matcher.get_matching(graph[1])
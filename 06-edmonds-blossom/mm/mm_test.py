@@ -1,29 +1,80 @@
+"""A differential test of the blossom algorithm against the ILP on seeded random graphs."""
+import argparse
+import os
+import statistics
+import time
+
 import mm
 import mm_blossom
 
-from networkx import generators, algorithms
+from concurrent.futures import ProcessPoolExecutor
+from networkx import generators
+
+parser = argparse.ArgumentParser(description=__doc__)
+
+parser.add_argument("-n", "--sizes", help="the numbers of vertices of the graphs (defaults to 20 50 100 200 500 1000 2000)",
+                    type=int, nargs="+", default=[20, 50, 100, 200, 500, 1000, 2000])
+parser.add_argument("-i", "--iterations", help="the number of graphs of each size (defaults to 20)", type=int, default=20)
+parser.add_argument("-d", "--degree", help="the average degree of the graphs (defaults to 2)", type=float, default=2)
+parser.add_argument("-s", "--seed", help="the seed of the first graph (defaults to 2)", type=int, default=2)
+parser.add_argument("-j", "--jobs", help="the number of graphs tested in parallel (the number of CPUs by default)",
+                    type=int, default=os.cpu_count())
+
+arguments = parser.parse_args()
+
+
+def is_matching(edges, matching):
+    """Return True if the matching is made of the edges and no two of its edges share a vertex."""
+    vertices = [v for e in matching for v in e]
+    return len(vertices) == len(set(vertices)) and set(matching) <= set(edges)
+
+
+def run_test(n, seed):
+    """Compare the two algorithms on the random graph, returning (n, seed, ok, ILP time, blossom time)."""
+    # the probability of the edges giving the average degree (a single vertex has no edges anyway)
+    p = 0 if n < 2 else min(1, arguments.degree / (n - 1))
+
+    g = generators.random_graphs.gnp_random_graph(n, p, seed=seed)
+    edges = list(g.edges)
+
+    start = time.perf_counter()
+    a_result = mm.get_maximum_matching(edges)
+    a_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    b_result = mm_blossom.get_maximum_matching((list(g.nodes), edges))
+    b_time = time.perf_counter() - start
+
+    ok = len(a_result) == len(b_result) and is_matching(edges, a_result) and is_matching(edges, b_result)
+
+    return n, seed, ok, a_time, b_time
+
+
+if __name__ == "__main__":
+    # each graph has its own seed, so a failing one can be rerun alone with -n N -i 1 -s SEED
+    tests = [(n, arguments.seed + i) for n in arguments.sizes for i in range(arguments.iterations)]
 
-sizes = [20]
-iterations = 5
-p = 0.1
+    times = {n: ([], []) for n in arguments.sizes}
+    failed = []
 
-from random import seed
-seed(2)
+    with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+        for n, seed, ok, a_time, b_time in executor.map(run_test, *zip(*tests)):
+            times[n][0].append(a_time)
+            times[n][1].append(b_time)
 
-while True:
-    for n in sizes:
-        for _ in range(iterations):
-            g = generators.random_graphs.gnp_random_graph(n, p)
+            if not ok:
+                print(f"MISMATCH: n = {n}, seed = {seed}")
+                failed.append((n, seed))
 
-            if not algorithms.components.is_connected(g):
-                continue
+    print(f"{'n':>5} | {'ILP mean':>9} {'median':>9} {'max':>9} | {'blossom mean':>12} {'median':>9} {'max':>9}")
 
-            a_result = mm.get_maximum_matching(g.edges)
-            b_result = mm_blossom.get_maximum_matching((list(g.nodes), list(g.edges)))
+    for n, (a_times, b_times) in times.items():
+        print(
+            f"{n:>5} | {statistics.mean(a_times):>8.4f}s {statistics.median(a_times):>8.4f}s {max(a_times):>8.4f}s"
+            f" | {statistics.mean(b_times):>11.4f}s {statistics.median(b_times):>8.4f}s {max(b_times):>8.4f}s"
+        )
 
-            if len(a_result) != len(b_result):
-                print(len(a_result), len(b_result))
-                print(g)
+    print(f"\n{len(tests) - len(failed)}/{len(tests)} graphs passed.")
 
-                for a, b in g.edges:
-                    print(a, b)
+    if len(failed) != 0:
+        quit(1)
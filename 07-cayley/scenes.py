@@ -1,4 +1,5 @@
 from utilities import *
+from spanning_trees import yield_spanning_trees, get_random_spanning_tree
 
 GRAPH_SCALE = 3.2
 
@@ -6,19 +7,6 @@ HIDDEN_COLOR = DARKER_GRAY
 HIGHLIGHT_COLOR = YELLOW
 
 
-def yield_spanning_trees(vertices, edges):
-    n = len(vertices)
-    for subset in itertools.combinations(edges, n - 1):
-        g = nx.Graph()
-        g.add_nodes_from(vertices)
-        g.add_edges_from(subset)
-
-        if nx.algorithms.components.is_connected(g):
-            yield subset
-
-def get_random_spanning_tree(vertices, edges):
-    return choice(list(yield_spanning_trees(vertices, edges)))
-
 def strip_graph(g, edges):
     for e in list(g.edges):
         if e not in edges:
@@ -0,0 +1 @@
+../spanning_trees.py
\ No newline at end of file
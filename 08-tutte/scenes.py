@@ -1,4 +1,6 @@
 from utilities import *
+from spanning_trees import yield_spanning_trees, get_random_spanning_tree
+from tutte import tutte
 
 GRAPH_SCALE = 3.6
 
@@ -8,57 +10,6 @@ HIGHLIGHT_COLOR = YELLOW
 QUICK_ANIMATION_TIME = 0.7
 
 
-def neighbours(v, E):
-    """Return the neighbours of v in E."""
-    t = []
-    for e in E:
-        if v in e:
-            t.append(e)
-    return [a for a in edgesToVertices(t) if a != v]
-
-
-def components(V, E):
-    """Calculate the number of components of the graph."""
-    total = 0
-    explored = set()
-    for v in V:
-        if v in explored:
-            continue
-
-        queue = [v]
-        explored.add(v)
-        total += 1
-        while len(queue) != 0:
-            v = queue.pop(0)
-
-            for w in neighbours(v, E):
-                if w not in explored:
-                    explored.add(w)
-                    queue.append(w)
-
-    return total
-
-
-def tutte(V, E):
-    """Return the Tutte polynomial of the graph."""
-    sum_parts = []
-
-    c_e = components(V, E)
-    for k in range(len(E)+1):
-
-        for F in combinations(E, k):
-            c_f = components(V, F)
-
-            r_e = len(V) - c_e
-            r_f = len(V) - c_f
-            n_f = len(F) - r_f
-
-            f = (lambda r_e, r_f, n_f: (lambda x, y: (x - 1) ** (r_e - r_f) * (y - 1) ** n_f))(r_e, r_f, n_f)
-            sum_parts.append(f)
-
-    return lambda x, y: sum(v(x, y) for v in sum_parts)
-
-
 class Intro(ThreeDScene):
     def construct(self):
         n = 4
@@ -130,20 +81,6 @@ def get_graph_background(g, vertex_scale=1.7, edge_scale=1.4, color=DARKER_GRAY)
     return u
 
 
-def yield_spanning_trees(vertices, edges):
-    n = len(vertices)
-    for subset in itertools.combinations(edges, n - 1):
-        g = nx.Graph()
-        g.add_nodes_from(vertices)
-        g.add_edges_from(subset)
-
-        if nx.algorithms.components.is_connected(g):
-            yield subset
-
-def get_random_spanning_tree(vertices, edges):
-    return choice(list(yield_spanning_trees(vertices, edges)))
-
-
 class Definitions(Scene):
     def construct(self):
         g = parse_graph(
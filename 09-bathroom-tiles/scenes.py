@@ -1,4 +1,5 @@
 from utilities import *
+from tiling import TileSolver
 
 from string import digits
 from random import seed, choice
@@ -545,62 +546,6 @@ def IndicateColorCharacter(char):
     return Indicate(char, color=YELLOW, scale=INDICATE_SCALE)
 
 
-def find_tiling_recursive(i, j, tileset, wallarray, w, h):
-    def at(x, y):
-        return wallarray[y + 1][x + 1]
-
-    def set(x, y, tile):
-        wallarray[y + 1][x + 1] = tile
-
-    def equal_or_none(a, b):
-        """If some of the tiles are none, it means that there is no color and it's ok"""
-        # AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA
-        # JESUS CHRIST BURN IT WITH FIRE
-        # I SHALL NOT BE REDEEMED FOR WRITING THIS UNHOLY ABOMINATION
-        return a == "None" or b == "None" or a == b
-
-    # if we're past (on the very right tile)
-    if i == w:
-        # check if the tile on the left is ok
-        if not equal_or_none(
-            at(i - 1, j).get_color_in_direction(RIGHT),
-            at(i, j).get_color_in_direction(LEFT),
-        ):
-            return
-
-        if j == h - 1:
-            return wallarray
-
-        i = 0
-        j += 1
-
-    for tile in tileset.tiles:
-        if not equal_or_none(
-            at(i, j - 1).get_color_in_direction(DOWN), tile.get_color_in_direction(UP)
-        ):
-            continue
-
-        if not equal_or_none(
-            at(i - 1, j).get_color_in_direction(RIGHT),
-            tile.get_color_in_direction(LEFT),
-        ):
-            continue
-
-        # if we're last row
-        if j == h - 1:
-            if not equal_or_none(
-                at(i, j + 1).get_color_in_direction(UP),
-                tile.get_color_in_direction(DOWN),
-            ):
-                continue
-
-        set(i, j, tile)
-        result = find_tiling_recursive(i + 1, j, tileset, wallarray, w, h)
-        if result is not None:
-            return result
-        set(i, j, None)
-
-
 def find_tiling(
     tileset,
     wall: Wall,
@@ -613,54 +558,28 @@ def find_tiling(
     if w is None:
         w = wall.w
 
-    for h in range(min_height, max_height + 1):
-        wallarray = [[None] * (w + 2) for _ in range(h + 2)]
-
-        for i in range(1, w + 1):
-            wallarray[0][i] = Tile(
-                [None, None, None, None if ignore_sides else wall.input[i - 1]]
-            )
-
-        for i in range(1, w + 1):
-            wallarray[-1][i] = Tile(
-                [
-                    None,
-                    None if ignore_sides else wall.get_color_in_direction(DOWN),
-                    None,
-                    None,
-                ]
-            )
-
-        for i in range(1, h + 1):
-            wallarray[i][-1] = Tile(
-                [
-                    None,
-                    None,
-                    None if ignore_sides else wall.get_color_in_direction(RIGHT),
-                    None,
-                ]
-            )
+    solver = TileSolver([tile.colors for tile in tileset.tiles])
 
-        for i in range(1, h + 1):
-            wallarray[i][0] = Tile(
-                [
-                    None if ignore_sides else wall.get_color_in_direction(LEFT),
-                    None,
-                    None,
-                    None,
-                ]
-            )
-
-        result = find_tiling_recursive(0, 0, tileset, wallarray, w, h)
+    if ignore_sides:
+        rows = solver.solve([None] * w, min_height=min_height, max_height=max_height)
+    else:
+        rows = solver.solve(
+            wall.input[:w],
+            bottom=wall.get_color_in_direction(DOWN),
+            left=wall.get_color_in_direction(LEFT),
+            right=wall.get_color_in_direction(RIGHT),
+            min_height=min_height,
+            max_height=max_height,
+        )
 
-        if result is not None:
-            wall = Wall(wall.colors, wall.input, width=w, height=h)
+    if rows is not None:
+        wall = Wall(wall.colors, wall.input, width=w, height=len(rows))
 
-            for x in range(w):
-                for y in range(h):
-                    wall.add_tile(result[y + 1][x + 1], x, y, copy=True)
+        for y, row in enumerate(rows):
+            for x, i in enumerate(row):
+                wall.add_tile(tileset.tiles[i], x, y, copy=True)
 
-            return wall
+        return wall
 
 
 def animate_tile_pasting(tile, wall, positions, speed=0.07, run_time=1.2):
@@ -0,0 +1,308 @@
+"""A Wang tile solver working on integer-encoded edge colors (independent of Manim).
+
+The tiles are given by their (right, up, left, down) colors, like Tile.colors in the scenes, the
+color "None" matching any other color. The wall is tiled row by row from the top: the bottom
+colors of a row (the boundary) are all that the rows below depend on, so the rows leading from
+each boundary are enumerated once and the boundaries that can't be finished in some number of
+rows are remembered. That makes trying larger heights incremental, since the boundaries are
+shared by all of them.
+
+Each row is enumerated with arc consistency: going from the right, the left colors that can still
+be completed to the right side of the wall are calculated for each column first, so the search
+never picks a tile it would have to backtrack from.
+
+The tilings are counted by a transfer matrix: the number of ways to reach each boundary is kept in
+a sparse vector (only the reachable boundaries are stored, the counts being Python's big ints),
+which is pushed through the wall one tile at a time.
+"""
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+WILDCARD = "None"
+
+# the encoded wildcard (the real colors are numbered from 1)
+ANY = 0
+
+RIGHT, UP, LEFT, DOWN = range(4)
+
+Boundary = Tuple[int, ...]
+Row = Tuple[int, ...]
+
+
+class TileSolver:
+    """Tilings of walls by the given tiles, reporting them as rows of the indexes of the tiles.
+
+    When there are more tilings, the first one in the row-major order of the tile indexes is
+    returned (i.e. the same one as a plain backtracking search trying the tiles in order)."""
+
+    def __init__(self, tiles: Sequence[Sequence[str]]):
+        self.codes = {WILDCARD: ANY}
+
+        self.tiles = [tuple(self.codes.setdefault(str(c), len(self.codes)) for c in tile) for tile in tiles]
+        self.colors = list(self.codes)
+
+        # the colors of the walls that none of the tiles have share the last code
+        self.other = len(self.codes)
+        self.color_count = self.other + 1
+
+        # table[up][left]... the indexes of the tiles fitting under up and right of left, in order
+        self.table = [[[] for _ in range(self.color_count)] for _ in range(self.color_count)]
+
+        for up in range(self.color_count):
+            for left in range(self.color_count):
+                for i, tile in enumerate(self.tiles):
+                    if self.matches(tile[UP], up) and self.matches(tile[LEFT], left):
+                        self.table[up][left].append(i)
+
+    def encode(self, color) -> int:
+        """Return the code of the color."""
+        return self.codes.get(str(color), self.other)
+
+    @staticmethod
+    def matches(a: int, b: int) -> bool:
+        return a == ANY or b == ANY or a == b
+
+    def solve(self, top: Sequence, bottom=WILDCARD, left=WILDCARD, right=WILDCARD,
+              min_height: int = 1, max_height: int = 1) -> Optional[List[Row]]:
+        """Return the rows of the lowest tiling with a height in the given range (or None).
+
+        The top colors are given for each of the columns, the other sides have a single color."""
+        search = _Search(self, [self.encode(c) for c in top], self.encode(bottom), self.encode(left), self.encode(right))
+
+        for height in range(min_height, max_height + 1):
+            if (rows := search.find(search.top, height)) is not None:
+                return rows
+
+        return None
+
+    def decode(self, boundary: Boundary) -> Tuple[str, ...]:
+        """Return the colors of the encoded boundary."""
+        return tuple(self.colors[c] if c != self.other else "?" for c in boundary)
+
+    def yield_boundaries(self, top: Sequence, left=WILDCARD, right=WILDCARD) -> Iterator[Dict[Boundary, int]]:
+        """Yield the reachable boundaries after each of the rows, along with the numbers of the ways
+        they can be reached (i.e. the sparse state vector of the transfer matrix)."""
+        left, right = self.encode(left), self.encode(right)
+        width, base = len(top), self.color_count
+
+        # the states are packed into ints: the boundary's colors are the digits (the first column
+        # being the lowest one), below which is the right color of the last tile placed
+        powers = [base ** (i + 1) for i in range(width)]
+
+        # moves[up][left]... the (down, right) colors of the tiles that fit
+        moves = [[[(self.tiles[t][DOWN], self.tiles[t][RIGHT]) for t in ts] for ts in row] for row in self.table]
+
+        vector = {sum(self.encode(c) * powers[i] for i, c in enumerate(top)): 1}
+
+        while len(vector) != 0:
+            states = {boundary + left: count for boundary, count in vector.items()}
+
+            # the first i colors of the boundaries are the bottom colors of the new row by now
+            for i, power in enumerate(powers):
+                next_states = defaultdict(int)
+
+                for state, count in states.items():
+                    color = state % base
+                    up = state // power % base
+                    rest = state - color - up * power
+
+                    for down, next_color in moves[up][color]:
+                        next_states[rest + down * power + next_color] += count
+
+                states = next_states
+
+            vector = defaultdict(int)
+            for state, count in states.items():
+                if self.matches(state % base, right):
+                    vector[state - state % base] += count
+
+            yield {self._unpack(boundary, width): count for boundary, count in vector.items()}
+
+    def _unpack(self, boundary: int, width: int) -> Boundary:
+        colors = []
+        for _ in range(width):
+            boundary //= self.color_count
+            colors.append(boundary % self.color_count)
+
+        return tuple(colors)
+
+    def count_tilings(self, top: Sequence, bottom=WILDCARD, left=WILDCARD, right=WILDCARD,
+                      max_height: int = 1) -> List[int]:
+        """Return the numbers of the tilings of the walls of heights 1 to max_height."""
+        bottom = self.encode(bottom)
+
+        counts = []
+        for vector in self.yield_boundaries(top, left, right):
+            if len(counts) == max_height:
+                break
+
+            counts.append(sum(
+                count for boundary, count in vector.items()
+                if all(self.matches(c, bottom) for c in boundary)
+            ))
+
+        return counts + [0] * (max_height - len(counts))
+
+
+class _Search:
+    """The caches of one wall (i.e. of its sides) shared by all of the heights."""
+
+    def __init__(self, solver: TileSolver, top: List[int], bottom: int, left: int, right: int):
+        self.solver = solver
+        self.top = tuple(top)
+        self.bottom, self.left, self.right = bottom, left, right
+        self.width = len(top)
+
+        # the rows from each boundary (the first one for each of the next boundaries), for the inner
+        # and the last row, generated lazily and kept for the other heights
+        self.transitions: Dict[Tuple[Boundary, bool], Tuple[List, Iterator]] = {}
+
+        # (boundary, rows left) -> the remaining rows of the tiling, or None if there are none
+        self.results: Dict[Tuple[Boundary, int], Optional[List[Row]]] = {}
+
+    def find(self, boundary: Boundary, height: int) -> Optional[List[Row]]:
+        """Return the first tiling of the given number of rows under the boundary."""
+        key = (boundary, height)
+        if key in self.results:
+            return self.results[key]
+
+        last = height == 1
+        result = None
+
+        for row, next_boundary in self.get_transitions(boundary, last):
+            if last:
+                result = [row]
+                break
+
+            if (rest := self.find(next_boundary, height - 1)) is not None:
+                result = [row] + rest
+                break
+
+        self.results[key] = result
+        return result
+
+    def get_transitions(self, boundary: Boundary, last: bool) -> Iterator[Tuple[Row, Boundary]]:
+        """Yield the rows that fit under the boundary (only the first one for each next boundary)."""
+        key = (boundary, last)
+
+        if key not in self.transitions:
+            self.transitions[key] = ([], self.yield_rows(boundary, last))
+
+        cached, generator = self.transitions[key]
+
+        i = 0
+        while True:
+            if i == len(cached):
+                item = next(generator, None)
+
+                if item is None:
+                    return
+
+                cached.append(item)
+
+            yield cached[i]
+            i += 1
+
+    def get_candidates(self, up: int, left: int, last: bool) -> List[int]:
+        candidates = self.solver.table[up][left]
+
+        if last:
+            candidates = [i for i in candidates if self.solver.matches(self.solver.tiles[i][DOWN], self.bottom)]
+
+        return candidates
+
+    def yield_rows(self, boundary: Boundary, last: bool) -> Iterator[Tuple[Row, Boundary]]:
+        tiles, colors = self.solver.tiles, range(self.solver.color_count)
+
+        # completable[i][c]... can the columns from i on be tiled when the tile left of them has the right color c
+        completable = [None] * (self.width + 1)
+        completable[self.width] = [self.solver.matches(c, self.right) for c in colors]
+
+        for i in reversed(range(self.width)):
+            completable[i] = [
+                any(completable[i + 1][tiles[t][RIGHT]] for t in self.get_candidates(boundary[i], c, last))
+                for c in colors
+            ]
+
+        if not completable[0][self.left]:
+            return
+
+        seen = set()
+        row = []
+
+        def search(i: int, left: int) -> Iterator[Tuple[Row, Boundary]]:
+            if i == self.width:
+                next_boundary = tuple(tiles[t][DOWN] for t in row)
+
+                if next_boundary not in seen:
+                    seen.add(next_boundary)
+                    yield tuple(row), next_boundary
+
+                return
+
+            for t in self.get_candidates(boundary[i], left, last):
+                if completable[i + 1][tiles[t][RIGHT]]:
+                    row.append(t)
+                    yield from search(i + 1, tiles[t][RIGHT])
+                    row.pop()
+
+        yield from search(0, self.left)
+
+
+if __name__ == "__main__":
+    import time
+
+    from itertools import product
+    from random import choice, randint, seed
+
+    def brute_force(tiles, top, bottom, left, right, height):
+        """Return the tilings of the wall in the row-major order, trying all of the tile placements."""
+        def fit(a, b):
+            return a == WILDCARD or b == WILDCARD or a == b
+
+        width = len(top)
+        tilings = []
+
+        for placement in product(range(len(tiles)), repeat=width * height):
+            rows = [placement[y * width:(y + 1) * width] for y in range(height)]
+
+            if all(fit(tiles[rows[0][x]][UP], top[x]) and fit(tiles[rows[-1][x]][DOWN], bottom)
+                   and all(fit(tiles[rows[y][x]][DOWN], tiles[rows[y + 1][x]][UP]) for y in range(height - 1))
+                   for x in range(width)) \
+                    and all(fit(tiles[row[0]][LEFT], left) and fit(tiles[row[-1]][RIGHT], right)
+                            and all(fit(tiles[a][RIGHT], tiles[b][LEFT]) for a, b in zip(row, row[1:]))
+                            for row in rows):
+                tilings.append([tuple(row) for row in rows])
+
+        return tilings
+
+    seed(0)
+
+    # random tiles on small walls (the wall colors may also be ones that no tile has)
+    for trial in range(300):
+        colors = ["r", "g", "b", WILDCARD][:randint(1, 3)] + [WILDCARD]
+        tiles = [tuple(choice(colors) for _ in range(4)) for _ in range(randint(1, 4))]
+
+        width, max_height = randint(1, 3), randint(1, 3)
+        while len(tiles) ** (width * max_height) > 5000:
+            max_height -= 1
+
+        sides = colors + ["w"]
+        top = [choice(sides) for _ in range(width)]
+        bottom, left, right = choice(sides), choice(sides), choice(sides)
+
+        solver = TileSolver(tiles)
+        counts = solver.count_tilings(top, bottom, left, right, max_height=max_height)
+
+        for height in range(1, max_height + 1):
+            tilings = brute_force(tiles, top, bottom, left, right, height)
+
+            assert counts[height - 1] == len(tilings), (tiles, top, bottom, left, right, height)
+            assert solver.solve(top, bottom, left, right, height, height) == (tilings[0] if tilings else None)
+
+    # the number of the tilings of a larger wall by a few tiles
+    tiles = [("r", "g", "r", "b"), ("b", "g", "b", "g"), ("r", "b", "b", "g"), ("b", "b", "r", "b"), ("g", "g", "g", "g")]
+
+    start = time.perf_counter()
+    counts = TileSolver(tiles).count_tilings([WILDCARD] * 8, max_height=20)
+    print(f"counted the tilings of 8x1 to 8x20 walls in {time.perf_counter() - start:.2f}s ({counts[-1]} of 8x20)")
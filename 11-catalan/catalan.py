@@ -0,0 +1,534 @@
+"""Ranking, unranking and generation of the Catalan families (independent of Manim).
+
+Each family is ordered like the old generators in utilities.py ordered it, so the indexes used by
+the scenes still point to the same objects:
+
+- Dyck paths are tuples of 1 (up) and -1 (down), in the lexicographic order with the up steps first
+  (i.e. the order of product([1, -1])),
+- binary trees are nested [left, right] lists (None being the empty tree), ordered by the size of
+  the left subtree, then by the left subtree and then by the right one,
+- triangulations of a polygon on m vertices are sorted tuples of their diagonals (u, v), u < v, in
+  the lexicographic order of the tuples (i.e. the order of combinations of the diagonals),
+- parenthesizations of n + 1 factors are strings like "(ab)c", ordered like their binary trees.
+
+Unranking takes a polynomial time, so single objects (or random samples, see sample_ranks) can be
+made even for sizes whose families are far too large to enumerate. Each family also has a successor
+function (next_dyck_path, next_binary_tree, ...) giving the object after a given one.
+"""
+import random
+import string
+
+from functools import lru_cache
+from math import comb
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+DyckPath = Tuple[int, ...]
+BinaryTree = Optional[list]
+Diagonal = Tuple[int, int]
+Triangulation = Tuple[Diagonal, ...]
+
+
+@lru_cache(maxsize=None)
+def catalan(n: int) -> int:
+    """Return the n-th Catalan number."""
+    return comb(2 * n, n) // (n + 1)
+
+
+def _check_rank(n: int, rank: int):
+    if not 0 <= rank < catalan(n):
+        raise ValueError(f"the rank must be between 0 and {catalan(n) - 1}, not {rank}")
+
+
+def sample_ranks(n: int, k: int, rng: random.Random = random) -> List[int]:
+    """Return k distinct random ranks of the objects of size n, sorted (random.sample can't take
+    ranges this large)."""
+    if k > catalan(n):
+        raise ValueError(f"there are only {catalan(n)} objects of size {n}")
+
+    ranks = set()
+    while len(ranks) < k:
+        ranks.add(rng.randrange(catalan(n)))
+
+    return sorted(ranks)
+
+
+# dyck paths
+
+def _count_dyck_suffixes(length: int, height: int) -> int:
+    """Return the number of ways to get from the height back to 0 in the given number of steps,
+    never going below 0 (the ballot numbers)."""
+    if height < 0 or height > length or (length - height) % 2 != 0:
+        return 0
+
+    downs = (length + height) // 2
+    return comb(length, downs) - comb(length, downs + 1)
+
+
+def rank_dyck_path(path: Sequence[int]) -> int:
+    """Return the index of the Dyck path in the order of the paths of its length."""
+    rank, height = 0, 0
+
+    for i, step in enumerate(path):
+        # all of the paths going up here come before this one
+        if step == -1:
+            rank += _count_dyck_suffixes(len(path) - i - 1, height + 1)
+
+        height += step
+
+    return rank
+
+
+def unrank_dyck_path(n: int, rank: int) -> DyckPath:
+    """Return the Dyck path with 2n steps of the given index."""
+    _check_rank(n, rank)
+
+    path, height = [], 0
+
+    for i in range(2 * n):
+        count = _count_dyck_suffixes(2 * n - i - 1, height + 1)
+
+        if rank < count:
+            path.append(1)
+        else:
+            rank -= count
+            path.append(-1)
+
+        height += path[-1]
+
+    return tuple(path)
+
+
+def next_dyck_path(path: Sequence[int]) -> Optional[DyckPath]:
+    """Return the Dyck path following the given one (or None if it's the last one).
+
+    Only the end of the path after the last up step that can be turned down changes, but the heights
+    are computed and the tuple is built for the whole path, so each call takes a linear time."""
+    heights = [0]
+    for step in path:
+        heights.append(heights[-1] + step)
+
+    for i in reversed(range(len(path))):
+        if path[i] == 1 and heights[i] > 0:
+            # the rest is the lowest one, going all the way up first
+            height, length = heights[i] - 1, len(path) - i - 1
+            ups = (length - height) // 2
+
+            return tuple(path[:i]) + (-1,) + (1,) * ups + (-1,) * (length - ups)
+
+    return None
+
+
+def yield_dyck_paths(n: int) -> Iterator[DyckPath]:
+    """Yield all of the Dyck paths with 2n steps, in order."""
+    path = (1,) * n + (-1,) * n
+
+    while path is not None:
+        yield path
+        path = next_dyck_path(path)
+
+
+# binary trees
+
+def _get_size_and_rank(tree: BinaryTree) -> Tuple[int, int]:
+    if tree is None:
+        return 0, 0
+
+    (l_size, l_rank), (r_size, r_rank) = _get_size_and_rank(tree[0]), _get_size_and_rank(tree[1])
+    n = l_size + r_size + 1
+
+    # the trees with smaller left subtrees come first
+    rank = sum(catalan(i) * catalan(n - i - 1) for i in range(l_size))
+
+    return n, rank + l_rank * catalan(r_size) + r_rank
+
+
+def get_binary_tree_size(tree: BinaryTree) -> int:
+    """Return the number of vertices of the binary tree."""
+    return 0 if tree is None else get_binary_tree_size(tree[0]) + get_binary_tree_size(tree[1]) + 1
+
+
+def rank_binary_tree(tree: BinaryTree) -> int:
+    """Return the index of the binary tree in the order of the trees of its size."""
+    return _get_size_and_rank(tree)[1]
+
+
+def unrank_binary_tree(n: int, rank: int) -> BinaryTree:
+    """Return the binary tree on n vertices of the given index."""
+    _check_rank(n, rank)
+
+    if n == 0:
+        return None
+
+    for i in range(n):
+        count = catalan(i) * catalan(n - i - 1)
+
+        if rank < count:
+            return [unrank_binary_tree(i, rank // catalan(n - i - 1)),
+                    unrank_binary_tree(n - i - 1, rank % catalan(n - i - 1))]
+
+        rank -= count
+
+
+def _first_binary_tree(n: int) -> BinaryTree:
+    """Return the first binary tree on n vertices (the path of the right children)."""
+    tree = None
+    for _ in range(n):
+        tree = [None, tree]
+
+    return tree
+
+
+def _next_binary_tree(tree: BinaryTree) -> Tuple[BinaryTree, int]:
+    """Return the binary tree following the given one (None if it's the last one) and its size."""
+    if tree is None:
+        return None, 0
+
+    right, r_size = _next_binary_tree(tree[1])
+    if right is not None:
+        return [tree[0], right], None
+
+    left, l_size = _next_binary_tree(tree[0])
+    if left is not None:
+        return [left, _first_binary_tree(r_size)], None
+
+    # both subtrees are the last ones, so the left one gets a vertex more
+    n = l_size + r_size + 1
+    if l_size + 1 < n:
+        return [_first_binary_tree(l_size + 1), _first_binary_tree(n - l_size - 2)], n
+
+    return None, n
+
+
+def next_binary_tree(tree: BinaryTree) -> BinaryTree:
+    """Return the binary tree following the given one (or None if it's the last one).
+
+    The subtrees that don't change are shared with the given tree rather than copied; the sizes of
+    the subtrees are only computed for the ones that are the last of their size, so the call takes
+    a time proportional to the part of the tree that changes (and the right spine above it)."""
+    return _next_binary_tree(tree)[0]
+
+
+def yield_binary_trees(n: int) -> Iterator[BinaryTree]:
+    """Yield all of the binary trees on n vertices, in order (the trees share their left subtrees)."""
+    if n == 0:
+        yield None
+        return
+
+    for i in range(n):
+        for left in yield_binary_trees(i):
+            for right in yield_binary_trees(n - i - 1):
+                yield [left, right]
+
+
+# triangulations
+
+def _get_diagonals(m: int) -> List[Diagonal]:
+    """Return all of the diagonals of a polygon on m vertices, sorted."""
+    return [(u, v) for u in range(m) for v in range(u + 2, m) if (u, v) != (0, m - 1)]
+
+
+def _crosses(a: Diagonal, b: Diagonal) -> bool:
+    return a[0] < b[0] < a[1] < b[1] or b[0] < a[0] < b[1] < a[1]
+
+
+def _count_triangulations(m: int, allowed: List[List[bool]]) -> int:
+    """Return the number of triangulations of the polygon on m vertices using only the allowed
+    diagonals (since a triangulation is maximal, it contains each of the allowed diagonals that
+    none of the allowed ones cross)."""
+    # counts[i][j]... the triangulations of the polygon i, i + 1, ..., j (closed by the edge (i, j))
+    counts = [[1 if j == i + 1 else 0 for j in range(m)] for i in range(m)]
+
+    for length in range(2, m):
+        for i in range(m - length):
+            j = i + length
+            counts[i][j] = sum(
+                counts[i][k] * counts[k][j]
+                for k in range(i + 1, j)
+                if (k == i + 1 or allowed[i][k]) and (k == j - 1 or allowed[k][j])
+            )
+
+    return counts[0][m - 1] if m > 1 else 1
+
+
+class _TriangulationCounter:
+    """The diagonals taken in their order, each either being included (forbidding the ones crossing
+    it) or excluded, with the numbers of triangulations that are left."""
+
+    def __init__(self, m: int):
+        self.m = m
+        self.diagonals = _get_diagonals(m)
+        self.allowed = [[True] * m for _ in range(m)]
+
+    def count_with(self, diagonal: Diagonal) -> int:
+        """Return the number of the remaining triangulations containing the diagonal."""
+        crossing = self.include(diagonal)
+        count = _count_triangulations(self.m, self.allowed)
+
+        for u, v in crossing:
+            self.allowed[u][v] = True
+
+        return count
+
+    def include(self, diagonal: Diagonal) -> List[Diagonal]:
+        crossing = [(u, v) for u, v in self.diagonals if self.allowed[u][v] and _crosses(diagonal, (u, v))]
+
+        for u, v in crossing:
+            self.allowed[u][v] = False
+
+        return crossing
+
+    def exclude(self, diagonal: Diagonal):
+        self.allowed[diagonal[0]][diagonal[1]] = False
+
+
+def rank_triangulation(m: int, diagonals: Sequence[Diagonal]) -> int:
+    """Return the index of the triangulation of the polygon on m vertices in the order of all of them."""
+    diagonals = {tuple(sorted(d)) for d in diagonals}
+    counter = _TriangulationCounter(m)
+
+    rank = 0
+    for diagonal in counter.diagonals:
+        if not counter.allowed[diagonal[0]][diagonal[1]]:
+            continue
+
+        # all of the triangulations containing the missing diagonal come before this one
+        if diagonal in diagonals:
+            counter.include(diagonal)
+        else:
+            rank += counter.count_with(diagonal)
+            counter.exclude(diagonal)
+
+    return rank
+
+
+def unrank_triangulation(m: int, rank: int) -> Triangulation:
+    """Return the triangulation of the polygon on m vertices of the given index."""
+    _check_rank(m - 2, rank)
+
+    counter = _TriangulationCounter(m)
+
+    triangulation = []
+    for diagonal in counter.diagonals:
+        if not counter.allowed[diagonal[0]][diagonal[1]]:
+            continue
+
+        count = counter.count_with(diagonal)
+
+        if rank < count:
+            triangulation.append(diagonal)
+            counter.include(diagonal)
+        else:
+            rank -= count
+            counter.exclude(diagonal)
+
+    return tuple(triangulation)
+
+
+def next_triangulation(m: int, diagonals: Sequence[Diagonal]) -> Optional[Triangulation]:
+    """Return the triangulation of the polygon on m vertices following the given one (or None if
+    it's the last one).
+
+    There is no known simple successor rule for the lexicographic order of the diagonals, so this
+    ranks and unranks, taking a polynomial time (rather than a constant amortized one) per call."""
+    rank = rank_triangulation(m, diagonals) + 1
+
+    return unrank_triangulation(m, rank) if rank < catalan(m - 2) else None
+
+
+def yield_triangulations(m: int) -> Iterator[Triangulation]:
+    """Yield all of the triangulations of the polygon on m vertices, in order.
+
+    They are made from the binary trees and sorted, so this is for polygons small enough for all of
+    their triangulations to fit into memory; use unrank_triangulation for the larger ones."""
+    yield from sorted(binary_tree_to_triangulation(tree) for tree in yield_binary_trees(m - 2))
+
+
+# parenthesizations
+
+def next_parenthesization(expression: str) -> Optional[str]:
+    """Return the parenthesization following the given one (or None if it's the last one), through
+    its binary tree (so in a linear time)."""
+    tree = next_binary_tree(parenthesization_to_binary_tree(expression))
+
+    return binary_tree_to_parenthesization(tree) if tree is not None else None
+
+
+def yield_parenthesizations(n: int) -> Iterator[str]:
+    """Yield all of the parenthesizations of n + 1 factors, in order."""
+    for tree in yield_binary_trees(n):
+        yield binary_tree_to_parenthesization(tree)
+
+
+# bijections
+
+def binary_tree_to_dyck_path(tree: BinaryTree) -> DyckPath:
+    """Return the Dyck path of the tree: up, the path of the left subtree, down, the path of the right one."""
+    path = []
+    stack = [tree]
+
+    while stack:
+        item = stack.pop()
+
+        if item is None:
+            continue
+        elif item == -1:
+            path.append(-1)
+        else:
+            path.append(1)
+            stack += [item[1], -1, item[0]]
+
+    return tuple(path)
+
+
+def dyck_path_to_binary_tree(path: Sequence[int]) -> BinaryTree:
+    """Return the binary tree of the Dyck path (the inverse of binary_tree_to_dyck_path)."""
+    def build(i: int, j: int) -> BinaryTree:
+        if i == j:
+            return None
+
+        # split the path at its first return to the ground
+        height, k = 0, i
+        while True:
+            height += path[k]
+            k += 1
+
+            if height == 0:
+                return [build(i + 1, k - 1), build(k, j)]
+
+    return build(0, len(path))
+
+
+def binary_tree_to_triangulation(tree: BinaryTree) -> Triangulation:
+    """Return the triangulation of the tree, with the polygon's edge (0, m - 1) as the root: each
+    vertex is a triangle, its subtrees triangulating the polygons to the left and to the right of it."""
+    m = get_binary_tree_size(tree) + 2
+    diagonals = []
+
+    def add(tree: BinaryTree, i: int, j: int):
+        if j - i >= 2 and (i, j) != (0, m - 1):
+            diagonals.append((i, j))
+
+        if tree is not None:
+            k = i + get_binary_tree_size(tree[0]) + 1
+
+            add(tree[0], i, k)
+            add(tree[1], k, j)
+
+    add(tree, 0, m - 1)
+
+    return tuple(sorted(diagonals))
+
+
+def triangulation_to_binary_tree(m: int, diagonals: Sequence[Diagonal]) -> BinaryTree:
+    """Return the binary tree of the triangulation of the polygon on m vertices (the inverse of
+    binary_tree_to_triangulation)."""
+    edges = {tuple(sorted(d)) for d in diagonals} | {(i, i + 1) for i in range(m - 1)}
+
+    def build(i: int, j: int) -> BinaryTree:
+        if j - i < 2:
+            return None
+
+        k = next(k for k in range(i + 1, j) if (i, k) in edges and (k, j) in edges)
+        return [build(i, k), build(k, j)]
+
+    return build(0, m - 1)
+
+
+def binary_tree_to_parenthesization(tree: BinaryTree, symbols: Sequence[str] = string.ascii_lowercase) -> str:
+    """Return the parenthesization of the tree: the leaves are the factors, each vertex multiplying
+    the products of its subtrees (without the parentheses around the whole product)."""
+    factors = iter(symbols)
+
+    def build(tree: BinaryTree) -> str:
+        if tree is None:
+            return next(factors)
+
+        return "(" + build(tree[0]) + build(tree[1]) + ")"
+
+    result = build(tree)
+    return result[1:-1] if tree is not None else result
+
+
+def parenthesization_to_binary_tree(expression: str) -> BinaryTree:
+    """Return the binary tree of the parenthesization (the inverse of binary_tree_to_parenthesization)."""
+    i = 0
+
+    def parse() -> BinaryTree:
+        nonlocal i
+
+        if expression[i] != "(":
+            i += 1
+            return None
+
+        i += 1
+        tree = [parse(), parse()]
+        i += 1
+
+        return tree
+
+    expression = "(" + expression + ")" if len(expression) > 1 else expression
+    return parse()
+
+
+def rank_parenthesization(expression: str) -> int:
+    """Return the index of the parenthesization in the order of the ones with as many factors."""
+    return rank_binary_tree(parenthesization_to_binary_tree(expression))
+
+
+def unrank_parenthesization(n: int, rank: int) -> str:
+    """Return the parenthesization of n + 1 factors of the given index."""
+    return binary_tree_to_parenthesization(unrank_binary_tree(n, rank))
+
+
+if __name__ == "__main__":
+    import time
+
+    from itertools import combinations, product
+
+    def old_dyck_paths(n):
+        return [p for p in product([1, -1], repeat=2 * n)
+                if all(sum(p[:i]) >= 0 for i in range(len(p))) and sum(p) == 0]
+
+    def old_triangulations(m):
+        diagonals = _get_diagonals(m)
+        return [s for s in combinations(diagonals, r=m - 3)
+                if not any(_crosses(a, b) for a, b in combinations(s, 2))]
+
+    for n in range(7):
+        paths, trees = list(yield_dyck_paths(n)), list(yield_binary_trees(n))
+        triangulations = list(yield_triangulations(n + 2))
+
+        assert paths == old_dyck_paths(n) and len(trees) == catalan(n)
+        assert n == 0 or triangulations == old_triangulations(n + 2)
+
+        # the successors go through the families in order
+        for family, successor in [(trees, next_binary_tree), (list(yield_parenthesizations(n)), next_parenthesization),
+                                  (triangulations, lambda t: next_triangulation(n + 2, t))]:
+            assert [successor(x) for x in family] == family[1:] + [None]
+
+        for i in range(catalan(n)):
+            assert rank_dyck_path(paths[i]) == i and unrank_dyck_path(n, i) == paths[i]
+            assert rank_binary_tree(trees[i]) == i and unrank_binary_tree(n, i) == trees[i]
+            assert rank_triangulation(n + 2, triangulations[i]) == i
+            assert unrank_triangulation(n + 2, i) == triangulations[i]
+            assert rank_parenthesization(unrank_parenthesization(n, i)) == i
+
+            assert dyck_path_to_binary_tree(binary_tree_to_dyck_path(trees[i])) == trees[i]
+            assert triangulation_to_binary_tree(n + 2, binary_tree_to_triangulation(trees[i])) == trees[i]
+
+    print(list(yield_parenthesizations(3)))
+
+    start = time.perf_counter()
+    rng = random.Random(0)
+
+    for i in sample_ranks(20, 100, rng):
+        assert rank_dyck_path(unrank_dyck_path(20, i)) == i
+        assert rank_binary_tree(unrank_binary_tree(20, i)) == i
+
+    for i in sample_ranks(20, 20, rng):
+        triangulation = unrank_triangulation(22, i)
+
+        assert rank_triangulation(22, triangulation) == i
+        assert len(triangulation) == 19 and not any(_crosses(a, b) for a, b in combinations(triangulation, 2))
+
+    print(f"sampled the size 20 families in {time.perf_counter() - start:.2f}s")
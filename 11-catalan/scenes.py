@@ -8,7 +8,7 @@ class ConstructStarsExample(MovingCameraScene):
         star_offset=0.25
 
         n = 4
-        tree = BinaryTree.generate_binary_trees(n)[6]
+        tree = BinaryTree.get_binary_tree(n, 6)
         tree_nolabels = tree.copy()
 
         StarUtilities.add_stars_to_graph(tree, star_offset=star_offset)
@@ -103,7 +103,7 @@ class ConstructStarsExample(MovingCameraScene):
         animation = self.camera.frame.animate.move_to(VGroup(tree, llb)).set_height(VGroup(tree, llb).height * height_scale)
         subtree.shift(UP)
 
-        v = BinaryTree.generate_binary_trees(1)[0].move_to(vpos)
+        v = BinaryTree.get_binary_tree(1, 0).move_to(vpos)
         v.set_z_index(1)
 
         self.play(
@@ -298,11 +298,11 @@ class DyckPathExamples(MovingCameraScene):
 class AllDyckPaths(Scene):
     def construct(self):
         dp = [
-            VGroup(*DyckPath.generate_dyck_paths(0)).arrange_in_grid(cols=1, buff=0.8).set_width(0.15),
-            VGroup(*DyckPath.generate_dyck_paths(1)).arrange_in_grid(cols=1, buff=0.8).set_width(1),
-            VGroup(*DyckPath.generate_dyck_paths(2)).arrange_in_grid(cols=1, buff=0.8).set_width(1.2),
-            VGroup(*DyckPath.generate_dyck_paths(3)).arrange_in_grid(cols=1, buff=0.8).set_width(1.2),
-            VGroup(*DyckPath.generate_dyck_paths(4)).arrange_in_grid(cols=2, buff=0.8).set_width(2.4),
+            DyckPath.get_gallery(0).arrange_in_grid(cols=1, buff=0.8).set_width(0.15).get_group(),
+            DyckPath.get_gallery(1).arrange_in_grid(cols=1, buff=0.8).set_width(1).get_group(),
+            DyckPath.get_gallery(2).arrange_in_grid(cols=1, buff=0.8).set_width(1.2).get_group(),
+            DyckPath.get_gallery(3).arrange_in_grid(cols=1, buff=0.8).set_width(1.2).get_group(),
+            DyckPath.get_gallery(4).arrange_in_grid(cols=2, buff=0.8).set_width(2.4).get_group(),
         ]
 
         for graph in dp[2]:
@@ -343,7 +343,7 @@ class AllDyckPaths(Scene):
 class FullBinaryTreeExample(MovingCameraScene):
     def construct(self):
         text = Tex("Full Binary Tree").scale(4.60)
-        tree = FullBinaryTree.generate_binary_trees(6)[50]
+        tree = FullBinaryTree.get_binary_tree(6, 50)
 
         self.camera.frame.set_width(text.width * 1.5)
 
@@ -696,18 +696,13 @@ class ExpressionExample(MovingCameraScene):
 
 
 class TriangulatedPolygonExample(MovingCameraScene):
-    """Note: this animation takes a few minutes to compute since we're creating a lot of shapes inefficiently."""
+    """Note: this animation takes a while to compute since it creates all of the 132 polygons."""
 
     def construct(self):
         n = 8
         count = 79
 
-        polygons = VGroup(*LinedPolygon.generate_triangulated_polygons(n))
-
-        for polygon in polygons:
-            polygon.rotate(PI / n)
-
-        p = polygons[count].scale(2.5)
+        p = LinedPolygon.get_triangulated_polygon(n, count).rotate(PI / n).scale(2.5)
 
         self.play(Write(p.polygon), run_time=1)
 
@@ -720,19 +715,14 @@ class TriangulatedPolygonExample(MovingCameraScene):
 
         p.add_to_back(triangles)
 
-        polygons = VGroup(*LinedPolygon.generate_triangulated_polygons(n))
-
-        for polygon in polygons:
-            polygon.rotate(PI / n)
-            polygon.add_to_back(create_polygon_triangles(polygon))
-
-        polygons.arrange_in_grid(cols=17, buff=0.3)
-        polygons.scale(2.5)
+        # the grid is arranged before building any of the polygons (all but one of them are then
+        # built by get_group, since all of them are written)
+        gallery = LinedPolygon.get_gallery(n, angle=PI / n, triangles=True)
+        gallery.arrange_in_grid(cols=17, buff=0.3).scale(2.5)
 
-        pos = polygons[count].get_center()
-        polygons.remove(polygons[count])
+        gallery.shift(p.get_center() - gallery.get_position(count))
 
-        align_object_by_coords(polygons, pos, p.get_center())
+        polygons = gallery.get_group([i for i in range(len(gallery)) if i != count])
 
         def dist(a, b):
             x1, y1, z1 = a.get_center()
@@ -750,11 +740,11 @@ class AllBinaryTrees(Scene):
     def construct(self):
 
         dp = [
-            VGroup(*FullBinaryTree.generate_binary_trees(0)).arrange_in_grid(cols=1, buff=0.6).set_width(0.2),
-            VGroup(*FullBinaryTree.generate_binary_trees(1)).arrange_in_grid(cols=1, buff=0.6).set_width(1),
-            VGroup(*FullBinaryTree.generate_binary_trees(2)).arrange_in_grid(cols=1, buff=0.6).set_width(1),
-            VGroup(*FullBinaryTree.generate_binary_trees(3)).arrange_in_grid(cols=2, buff=0.6).set_width(2),
-            VGroup(*FullBinaryTree.generate_binary_trees(4)).arrange_in_grid(cols=3, buff=1.2).set_width(2.2),
+            FullBinaryTree.get_gallery(0).arrange_in_grid(cols=1, buff=0.6).set_width(0.2).get_group(),
+            FullBinaryTree.get_gallery(1).arrange_in_grid(cols=1, buff=0.6).set_width(1).get_group(),
+            FullBinaryTree.get_gallery(2).arrange_in_grid(cols=1, buff=0.6).set_width(1).get_group(),
+            FullBinaryTree.get_gallery(3).arrange_in_grid(cols=2, buff=0.6).set_width(2).get_group(),
+            FullBinaryTree.get_gallery(4).arrange_in_grid(cols=3, buff=1.2).set_width(2.2).get_group(),
         ]
 
         for graph in dp[2]:
@@ -797,10 +787,10 @@ class AllTriangulatedPolygons(Scene):
     def construct(self):
 
         dp = [
-            VGroup(*LinedPolygon.generate_triangulated_polygons(3)).arrange_in_grid(cols=1, buff=0.8).set_width(1),
-            VGroup(*LinedPolygon.generate_triangulated_polygons(4)).arrange_in_grid(cols=1, buff=0.3).set_width(0.90),
-            VGroup(*LinedPolygon.generate_triangulated_polygons(5)).arrange_in_grid(cols=1, buff=0.5).set_width(0.75),
-            VGroup(*LinedPolygon.generate_triangulated_polygons(6)).arrange_in_grid(cols=2, buff=0.6).set_width(1.3),
+            LinedPolygon.get_gallery(3).arrange_in_grid(cols=1, buff=0.8).set_width(1).get_group(),
+            LinedPolygon.get_gallery(4).arrange_in_grid(cols=1, buff=0.3).set_width(0.90).get_group(),
+            LinedPolygon.get_gallery(5).arrange_in_grid(cols=1, buff=0.5).set_width(0.75).get_group(),
+            LinedPolygon.get_gallery(6).arrange_in_grid(cols=2, buff=0.6).set_width(1.3).get_group(),
         ]
 
         table = Table(
@@ -828,7 +818,7 @@ class AllTriangulatedPolygons(Scene):
 
 class PolygonToExpressionExample(MovingCameraScene):
     def construct(self):
-        polygon = LinedPolygon.generate_triangulated_polygons(6)[12].scale(2)
+        polygon = LinedPolygon.get_triangulated_polygon(6, 12).scale(2)
 
         self.play(Write(polygon))
 
@@ -1032,9 +1022,9 @@ class IntroCatalan(MovingCameraScene):
         )
 
         objects = VGroup(
-            BinaryTree.generate_binary_trees(2)[0],
+            BinaryTree.get_binary_tree(2, 0),
             DyckPath([1, -1, 1, 1, -1, 1, -1, -1]),
-            LinedPolygon.generate_triangulated_polygons(7)[10],
+            LinedPolygon.get_triangulated_polygon(7, 10),
         )
 
         StarUtilities.add_stars_to_graph(objects[0], no_labels=True)
@@ -4,9 +4,12 @@ from math import e
 from manim import *
 from typing import *
 from random import seed
-from itertools import permutations, combinations, product
+from collections import OrderedDict
+from itertools import permutations
 import sympy
 
+import catalan
+
 
 class StarUtilities:
     STAR_COLOR = GREEN
@@ -221,44 +224,161 @@ def RemoveHighestStar(graph) -> Animation:
             ]
 
 
-class LinedPolygon(VMobject):
+class Gallery:
+    """A lazily built grid of objects (like VGroup(...).arrange_in_grid(...)).
 
-    @classmethod
-    def generate_triangulated_polygons(cls, n: int) -> List[LinedPolygon]:
-        """Generate all possible triangulated polygons on n vertices.
-        Runs reasonably quickly for <= 10 vertices (~a minute)."""
-        # computers are fast
-        edges = list(combinations(range(n), r=2))
+    Only the descriptors of the objects (the paths, trees, ... from catalan.py) are kept, the
+    mobjects being built when they are first asked for. The ones that were handed out are kept
+    (they may be on the screen, so gallery[i] is the same mobject until it's released), and at most
+    capacity of the released ones are kept too, the least recently released being dropped. The grid
+    is calculated from the sizes returned by measure, so arranging, scaling and moving the gallery
+    doesn't build anything."""
+
+    def __init__(self, descriptors, build: Callable, measure: Callable, capacity: int = 64):
+        self.descriptors = list(descriptors)
+        self.build = build
+        self.capacity = capacity
+
+        # index -> (mobject, the scale it was built with), for the handed out and the released ones
+        self.handed_out = {}
+        self.released = OrderedDict()
+
+        self.sizes = [np.array(measure(d), dtype=float) for d in self.descriptors]
+
+        # the offsets of the cells from the center of the grid, before scaling
+        self.offsets = [np.zeros(3) for _ in self.descriptors]
+        self.grid_size = np.array(max(self.sizes, key=lambda s: s[0] * s[1], default=(0, 0)))
+
+        self.scale_factor = 1
+        self.center = ORIGIN.copy()
+
+    def __len__(self):
+        return len(self.descriptors)
+
+    def __getitem__(self, i: int) -> Mobject:
+        """Return the i-th object (building it if it isn't kept), placed into its cell."""
+        i = range(len(self))[i]
+
+        if i in self.handed_out:
+            mobject, scale = self.handed_out[i]
+        elif i in self.released:
+            mobject, scale = self.released.pop(i)
+        else:
+            mobject, scale = self.build(self.descriptors[i]), 1
+
+        if scale != self.scale_factor:
+            mobject.scale(self.scale_factor / scale)
+
+        self.handed_out[i] = (mobject, self.scale_factor)
+
+        return mobject.move_to(self.get_position(i))
+
+    def release(self, indexes=None) -> Gallery:
+        """Mark the given objects (all of them by default) as no longer used, so they can be dropped."""
+        for i in (indexes if indexes is not None else list(self.handed_out)):
+            if i in self.handed_out:
+                self.released[i] = self.handed_out.pop(i)
+
+        while len(self.released) > self.capacity:
+            self.released.popitem(last=False)
+
+        return self
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
 
-        # remove adjacent edges
-        edges = [e for e in edges if abs(e[0] - e[1]) != 1 and abs(e[0] - e[1]) != n - 1]
+    def get_position(self, i: int) -> np.ndarray:
+        """Return the center of the i-th cell (without building its object)."""
+        return self.center + self.offsets[i] * self.scale_factor
 
-        def _is_subset_intesecting(subset) -> bool:
-            # check for intersections
-            for i in range(len(subset)):
-                for j in range(i + 1, len(subset)):
-                    e1 = subset[i]
-                    e2 = subset[j]
+    def arrange_in_grid(self, rows=None, cols=None, buff=MED_SMALL_BUFF) -> Gallery:
+        """Arrange the objects row by row, like Mobject.arrange_in_grid (with centered cells)."""
+        n = len(self)
 
-                    # if they share a vertex, they don't intersect
-                    if len(set(e1 + e2)) != len(e1) + len(e2):
-                        continue
+        if cols is None:
+            cols = int(np.ceil(n / rows)) if rows is not None else int(np.ceil(np.sqrt(n)))
+        rows = int(np.ceil(n / cols))
 
-                    p1, p2 = e1
-                    p3, p4 = e2
+        widths = [max((self.sizes[i][0] for i in range(c, n, cols)), default=0) for c in range(cols)]
+        heights = [max(self.sizes[i][1] for i in range(r * cols, min(n, (r + 1) * cols))) for r in range(rows)]
 
-                    if p1 < p3 < p2 and p3 < p2 < p4:
-                        return True
+        # the left and top sides of the cells
+        xs = np.cumsum([0] + [w + buff for w in widths])
+        ys = np.cumsum([0] + [h + buff for h in heights])
 
-            return False
+        self.grid_size = np.array([xs[-1] - buff, ys[-1] - buff])
+
+        for i in range(n):
+            r, c = divmod(i, cols)
+            self.offsets[i] = np.array([
+                xs[c] + widths[c] / 2 - self.grid_size[0] / 2,
+                self.grid_size[1] / 2 - ys[r] - heights[r] / 2,
+                0,
+            ])
+
+        return self
+
+    @property
+    def width(self) -> float:
+        return self.grid_size[0] * self.scale_factor
+
+    @property
+    def height(self) -> float:
+        return self.grid_size[1] * self.scale_factor
+
+    def get_center(self) -> np.ndarray:
+        return self.center.copy()
+
+    def scale(self, factor: float) -> Gallery:
+        self.scale_factor *= factor
+        return self
+
+    def set_width(self, width: float) -> Gallery:
+        return self.scale(width / self.width)
+
+    def move_to(self, point) -> Gallery:
+        self.center = np.array(point, dtype=float)
+        return self
+
+    def shift(self, vector) -> Gallery:
+        return self.move_to(self.center + vector)
+
+    def get_group(self, indexes=None) -> VGroup:
+        """Return the given objects (all of them by default) as a VGroup."""
+        return VGroup(*[self[i] for i in (indexes if indexes is not None else range(len(self)))])
+
+
+class LinedPolygon(VMobject):
+
+    @classmethod
+    def generate_triangulated_polygons(cls, n: int) -> List[LinedPolygon]:
+        """Generate all possible triangulated polygons on n vertices (sorted by their edges)."""
+        return [LinedPolygon(n, edges) for edges in catalan.yield_triangulations(n)]
+
+    @classmethod
+    def get_triangulated_polygon(cls, n: int, rank: int) -> LinedPolygon:
+        """Get the triangulated polygon on n vertices at the given index of the generated ones,
+        without generating the others."""
+        return LinedPolygon(n, catalan.unrank_triangulation(n, rank))
+
+    @classmethod
+    def get_gallery(cls, n: int, angle=0, triangles=False, **kwargs) -> Gallery:
+        """Get a gallery of all of the triangulated polygons on n vertices (rotated by the angle,
+        optionally with their triangles); the keyword arguments go to Gallery."""
+        def build(edges):
+            polygon = LinedPolygon(n, edges).rotate(angle)
 
-        polygons = []
+            if triangles:
+                polygon.add_to_back(create_polygon_triangles(polygon))
 
-        for subset in combinations(edges, r = n - 3):
-            if not _is_subset_intesecting(subset):
-                polygons.append(LinedPolygon(n, subset))
+            return polygon
 
-        return polygons
+        # the polygons are all the same size
+        size = LinedPolygon(n, []).rotate(angle)
+        size = (size.width, size.height)
+
+        return Gallery(catalan.yield_triangulations(n), build, lambda _: size, **kwargs)
 
 
     def __init__(self, n, edges):
@@ -342,19 +462,24 @@ class DyckPath(VMobject):
 
     @classmethod
     def generate_dyck_paths(cls, n: int) -> List[DyckPath]:
-        paths = []
-
-        for path in product([1, -1], repeat=n * 2):
-            i = 0
-            for j in path:
-                i += j
-                if i < 0:
-                    break
-            else:
-                if i == 0:
-                    paths.append(cls(path))
+        return [cls(path) for path in catalan.yield_dyck_paths(n)]
+
+    @classmethod
+    def get_dyck_path(cls, n: int, rank: int) -> DyckPath:
+        """Get the Dyck path of length 2n at the given index of the generated ones."""
+        return cls(catalan.unrank_dyck_path(n, rank))
+
+    @classmethod
+    def get_gallery(cls, n: int, spacing=0.5, **kwargs) -> Gallery:
+        """Get a gallery of all of the Dyck paths of length 2n (the keyword arguments go to Gallery)."""
+        def measure(delta):
+            heights = np.cumsum([0] + list(delta))
+            return (
+                len(delta) * spacing + 2 * DEFAULT_DOT_RADIUS,
+                (max(heights) - min(heights)) * spacing + 2 * DEFAULT_DOT_RADIUS,
+            )
 
-        return paths
+        return Gallery(catalan.yield_dyck_paths(n), lambda delta: cls(delta, spacing=spacing), measure, **kwargs)
 
     def get_last_hill_animations(self):
         dot = Dot().scale(0.01)
@@ -459,7 +584,74 @@ class DyckPath(VMobject):
     __repr__ = __str__
 
 
+def get_tree_layout(edges, root) -> Dict[Hashable, Tuple[float, float]]:
+    """Return the unscaled positions of the vertices of the tree, in the same way as Manim's "tree"
+    layout (which is SageMath's tree layout) places them before scaling them by the vertex spacing."""
+    neighbours = {root: []}
+    for u, v in edges:
+        neighbours.setdefault(u, []).append(v)
+        neighbours.setdefault(v, []).append(u)
+
+    children = {root: list(neighbours[root])}
+
+    # the children are eaten from the lists on the stack
+    stack = [list(children[root])]
+    stick = [root]
+    parent = {u: root for u in children[root]}
+    pos = {}
+    obstruction = [0.0] * len(neighbours)
+
+    def slide(v, dx):
+        """Shift the vertex and its descendants (which are already placed) to the right by dx."""
+        level = [v]
+        while level:
+            next_level = []
+            for u in level:
+                x, y = pos[u]
+                x += dx
+                obstruction[y] = max(x + 1, obstruction[y])
+                pos[u] = x, y
+                next_level += children[u]
+            level = next_level
+
+    while stack:
+        current = stack[-1]
+
+        if not current:
+            p = stick.pop()
+            stack.pop()
+            cp = children[p]
+            y = -len(stack)
+
+            if not cp:
+                x = obstruction[y]
+                pos[p] = x, y
+            else:
+                x = sum(pos[c][0] for c in cp) / len(cp)
+                pos[p] = x, y
+                ox = obstruction[y]
+                if x < ox:
+                    slide(p, ox - x)
+                    x = ox
+
+            obstruction[y] = x + 1
+            continue
+
+        t = current.pop()
+        ct = [u for u in neighbours[t] if u != parent[t]]
+        for c in ct:
+            parent[c] = t
+        children[t] = list(ct)
+
+        stack.append(ct)
+        stick.append(t)
+
+    return pos
+
+
 class BinaryTree(Graph):
+    VERTEX_SPACING = (1.15, 1)
+    VERTEX_SCALE = 1.5
 
     def get_parent(self, v) -> str:
         """Return the parent of a vertex (given that it's not the root), else return None."""
@@ -516,34 +708,20 @@ class BinaryTree(Graph):
         n = 1: [None, None]
         n = 2: [[None, None], None] and [None, [None, None]]
         n = 3: ..."""
-
         if n == 0:
             return None
 
-        else:
-            previous_trees = []
-            trees = []
-
-            for i in range(n):
-                previous_trees.append(cls._generate_parentheses(i))
-
-            for i in range(n):
-                for l1 in (previous_trees[i] or [None]):
-                    for l2 in (previous_trees[n - i - 1] or [None]):
-                        trees.append([l1, l2])
-
-            return trees
+        return list(catalan.yield_binary_trees(n))
 
     @classmethod
-    def _binary_tree_from_parentheses(cls, graph) -> VMobject:
-        """Generate a binary tree from nested parentheses.
-        Sample input: [None, [None, None]] (generating a 2-vertex binary tree)."""
+    def _get_vertices_and_edges(cls, graph) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Return the vertices and edges of the binary tree of the nested parentheses.
+        Vertices to be deleted contain the 'L' symbol (leaf), for aligning."""
         vertices = [""]
         edges = []
 
         def _populate(g, v):
-            """Populate vertices and edges.
-            Vertices to be deleted contain the 'L' symbol (leaf), for aligning."""
+            """Populate vertices and edges."""
             if g == [None, None]:
                 if cls == FullBinaryTree:
                     vertices.append(v + "lL")
@@ -569,13 +747,21 @@ class BinaryTree(Graph):
         if graph is not None:
             _populate(graph, "")
 
+        return vertices, edges
+
+    @classmethod
+    def _binary_tree_from_parentheses(cls, graph) -> VMobject:
+        """Generate a binary tree from nested parentheses.
+        Sample input: [None, [None, None]] (generating a 2-vertex binary tree)."""
+        vertices, edges = cls._get_vertices_and_edges(graph)
+
         g = cls(
             vertices,
             edges,
             layout="tree",
             root_vertex="",
-            layout_config={"vertex_spacing": (1.15, 1)},
-            vertex_type=lambda: Dot().scale(1.5),
+            layout_config={"vertex_spacing": cls.VERTEX_SPACING},
+            vertex_type=lambda: Dot().scale(cls.VERTEX_SCALE),
         )
 
         if graph is not None and cls != FullBinaryTree:
@@ -585,6 +771,21 @@ class BinaryTree(Graph):
 
         return g
 
+    @classmethod
+    def _measure_parentheses(cls, graph) -> Tuple[float, float]:
+        """Return the size of the binary tree of the nested parentheses, without building it."""
+        vertices, edges = cls._get_vertices_and_edges(graph)
+
+        layout = get_tree_layout(edges, root="")
+
+        if graph is not None and cls != FullBinaryTree:
+            layout = {v: p for v, p in layout.items() if "L" not in v}
+
+        points = np.array(list(layout.values()), dtype=float) * cls.VERTEX_SPACING
+        radius = DEFAULT_DOT_RADIUS * cls.VERTEX_SCALE
+
+        return tuple(points.max(axis=0) - points.min(axis=0) + 2 * radius)
+
     @classmethod
     def generate_binary_trees(cls, n: int) -> List[BinaryTree]:
         """Generate all binary trees on n vertices."""
@@ -594,6 +795,16 @@ class BinaryTree(Graph):
         return [cls._binary_tree_from_parentheses(p)
                 for p in cls._generate_parentheses(n)]
 
+    @classmethod
+    def get_binary_tree(cls, n: int, rank: int) -> BinaryTree:
+        """Get the binary tree on n vertices at the given index of the generated ones."""
+        return cls._binary_tree_from_parentheses(catalan.unrank_binary_tree(n, rank))
+
+    @classmethod
+    def get_gallery(cls, n: int, **kwargs) -> Gallery:
+        """Get a gallery of all of the binary trees on n vertices (the keyword arguments go to Gallery)."""
+        return Gallery(catalan.yield_binary_trees(n), cls._binary_tree_from_parentheses, cls._measure_parentheses, **kwargs)
+
 
 class FullBinaryTree(BinaryTree):
     pass
@@ -0,0 +1,240 @@
+"""The most geodes of the robot blueprints, on states packed into single ints.
+
+The ores and the robots of a state are packed into 12-bit fields of one int, the robots' fields
+being right above the ores' ones: shifting the state right by ROBOTS gives the ores that the robots
+mine in a minute, so a minute passing is a single addition. The top bit of each of the ores' fields
+is kept clear, so "are there enough ores for the robot" is a single subtraction too (a field that
+goes negative borrows its top bit).
+
+The states are searched layer by layer (the minutes), only keeping the ones that can still beat
+the best geodes found so far (by an upper bound from a relaxation of the problem), capping the ores
+that can't be spent anymore and dropping the states dominated by another one with the same robots.
+"""
+import argparse
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+ORE, CLAY, OBSIDIAN, GEODE = range(4)
+
+BITS = 12
+MASK = (1 << BITS) - 1
+
+# the shift of the robots' fields and the mask of the ores' ones
+ROBOTS = 4 * BITS
+ORES = (1 << ROBOTS) - 1
+
+# the top bits of the ores' fields
+GUARD = sum(1 << (BITS * i + BITS - 1) for i in range(4))
+
+Costs = Tuple[Tuple[int, int, int, int], ...]
+
+EXAMPLE = "Blueprint 1: Each ore robot costs 4 ore.  Each clay robot costs 2 ore.  " \
+          "Each obsidian robot costs 3 ore and 14 clay.  Each geode robot costs 2 ore and 7 obsidian."
+
+
+def parse_blueprint(line: str) -> Costs:
+    """Return the (ore, clay, obsidian, geode) costs of each of the robots of the blueprint."""
+    parts = line.split()
+
+    return (
+        (int(parts[6]), 0, 0, 0),  # ore
+        (int(parts[12]), 0, 0, 0),  # clay
+        (int(parts[18]), int(parts[21]), 0, 0),  # obsidian
+        (int(parts[27]), 0, int(parts[30]), 0),  # geode
+    )
+
+
+def pack(ores: Sequence[int], robots: Sequence[int]) -> int:
+    return sum(o << (BITS * i) for i, o in enumerate(ores)) + sum(r << (ROBOTS + BITS * i) for i, r in enumerate(robots))
+
+
+def unpack(state: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    fields = tuple((state >> (BITS * i)) & MASK for i in range(8))
+    return fields[:4], fields[4:]
+
+
+START = pack((0, 0, 0, 0), (1, 0, 0, 0))
+
+
+class BlueprintSolver:
+    """The packed transitions of one blueprint and the searches on them."""
+
+    def __init__(self, costs: Costs):
+        self.costs = costs
+
+        self.cost_codes = [pack(cost, (0, 0, 0, 0)) for cost in costs]
+        self.robot_codes = [1 << (ROBOTS + BITS * i) for i in range(4)]
+
+        # more robots of a mineral than any robot costs can't be spent (the geode ones always can)
+        self.max_robots = [max(cost[i] for cost in costs) for i in range(3)] + [MASK]
+
+    def can_build(self, state: int, robot: int) -> bool:
+        return ((state & ORES | GUARD) - self.cost_codes[robot]) & GUARD == GUARD
+
+    def get_robots(self, state: int, robot: int) -> int:
+        return (state >> (ROBOTS + BITS * robot)) & MASK
+
+    def next_states(self, state: int, want_to_build: bool = True, must_build: bool = False) -> List[int]:
+        """Return the states after a minute: waiting first, then building each of the robots.
+
+        Without want_to_build, the robots are built even when there are enough of them; with
+        must_build, the state doesn't wait when it can build all of the robots."""
+        income = state >> ROBOTS
+        states = [state + income]
+
+        for i in range(4):
+            if want_to_build and self.get_robots(state, i) >= self.max_robots[i]:
+                continue
+
+            if self.can_build(state, i):
+                states.append(state + income - self.cost_codes[i] + self.robot_codes[i])
+
+        if must_build and len(states) == 5:
+            states.pop(0)
+
+        return states
+
+    def cap(self, state: int, remaining: int) -> int:
+        """Return the state with the ores that can't all be spent in the remaining minutes capped
+        (which merges the states that only differ in them)."""
+        for i in range(3):
+            robots = self.get_robots(state, i)
+            ores = (state >> (BITS * i)) & MASK
+
+            # spending the most each minute, the robots make up for the rest
+            limit = self.max_robots[i] * remaining - robots * (remaining - 1)
+
+            if ores > limit:
+                state -= (ores - limit) << (BITS * i)
+
+        return state
+
+    def get_lower_bound(self, state: int, remaining: int) -> int:
+        """The geodes of the state if it doesn't build any more geode robots."""
+        return ((state >> (BITS * GEODE)) & MASK) + self.get_robots(state, GEODE) * remaining
+
+    def get_upper_bound(self, state: int, remaining: int) -> int:
+        """The most geodes of the state if the ore was free and all of the other robots could be
+        built each minute (building each of them as soon as possible is then the best)."""
+        (_, clay, obsidian, geodes), (_, clay_robots, obsidian_robots, geode_robots) = unpack(state)
+
+        obsidian_cost, geode_cost = self.costs[OBSIDIAN][CLAY], self.costs[GEODE][OBSIDIAN]
+
+        for _ in range(remaining):
+            new_obsidian_robot = clay >= obsidian_cost
+            new_geode_robot = obsidian >= geode_cost
+
+            if new_obsidian_robot:
+                clay -= obsidian_cost
+
+            if new_geode_robot:
+                obsidian -= geode_cost
+
+            clay += clay_robots
+            obsidian += obsidian_robots
+            geodes += geode_robots
+
+            clay_robots += 1
+            obsidian_robots += new_obsidian_robot
+            geode_robots += new_geode_robot
+
+        return geodes
+
+    @staticmethod
+    def _remove_dominated(layer: List[int]) -> List[int]:
+        """Return the states that don't have fewer of all of the ores than a state with the same robots."""
+        groups: Dict[int, List[int]] = {}
+        for state in layer:
+            groups.setdefault(state >> ROBOTS, []).append(state)
+
+        kept = []
+        for group in groups.values():
+            # the ones with the most ores first, so a state can only be dominated by a kept one
+            group.sort(key=lambda state: -sum(unpack(state)[0]))
+
+            front = []
+            for state in group:
+                ores = state & ORES
+
+                if all(((other & ORES | GUARD) - ores) & GUARD != GUARD for other in front):
+                    front.append(state)
+
+            kept += front
+
+        return kept
+
+    def get_max_geodes(self, minutes: int) -> Tuple[int, int]:
+        """Return the most geodes that can be opened in the given number of minutes (and the number
+        of the states that were searched)."""
+        best = 0
+        layer = [START]
+        searched = 1
+
+        for remaining in reversed(range(minutes)):
+            next_layer = set()
+
+            for state in layer:
+                for next_state in self.next_states(state):
+                    next_layer.add(self.cap(next_state, remaining))
+
+            best = max([best, *(self.get_lower_bound(state, remaining) for state in next_layer)])
+
+            layer = [state for state in self._remove_dominated(list(next_layer))
+                     if self.get_upper_bound(state, remaining) > best]
+
+            searched += len(layer)
+
+        return best, searched
+
+
+def get_max_geodes(line: str, minutes: int) -> Tuple[int, int]:
+    """Return the most geodes of the blueprint (and the number of the searched states)."""
+    return BlueprintSolver(parse_blueprint(line)).get_max_geodes(minutes)
+
+
+def solve_all(lines: List[str], minutes: int, jobs: int = 1) -> Iterator[Tuple[int, int]]:
+    """Yield the most geodes of each of the blueprints (and the numbers of the searched states), in order."""
+    if jobs <= 1:
+        yield from (get_max_geodes(line, minutes) for line in lines)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(get_max_geodes, lines, [minutes] * len(lines))
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+
+    parser.add_argument("input", help="the file with the blueprints (one per line)", nargs="?")
+    parser.add_argument("-m", "--minutes", help="the number of minutes (defaults to 24)", type=int, default=24)
+    parser.add_argument("-j", "--jobs", help="the number of blueprints solved in parallel (the number of CPUs by default)",
+                        type=int, default=os.cpu_count())
+
+    arguments = parser.parse_args()
+
+    if arguments.input is None:
+        # the example blueprints
+        second = "Blueprint 2: Each ore robot costs 2 ore.  Each clay robot costs 3 ore.  " \
+                 "Each obsidian robot costs 3 ore and 8 clay.  Each geode robot costs 3 ore and 12 obsidian."
+
+        assert [geodes for geodes, _ in solve_all([EXAMPLE, second], 24, arguments.jobs)] == [9, 12]
+        assert [geodes for geodes, _ in solve_all([EXAMPLE, second], 32, arguments.jobs)] == [56, 62]
+
+        lines = [EXAMPLE, second]
+    else:
+        with open(arguments.input) as f:
+            lines = [line for line in f.read().splitlines() if line.strip() != ""]
+
+    start = time.perf_counter()
+    quality, product = 0, 1
+
+    for i, (geodes, searched) in enumerate(solve_all(lines, arguments.minutes, arguments.jobs)):
+        print(f"blueprint {i + 1}: {geodes} geodes ({searched} states)")
+
+        quality += (i + 1) * geodes
+        product *= geodes
+
+    print(f"quality levels: {quality}, product: {product} ({time.perf_counter() - start:.2f}s)")
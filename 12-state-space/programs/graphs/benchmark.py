@@ -0,0 +1,166 @@
+"""Reproduce the growth curves in results/ (the numbers of the states searched by each version of the
+blueprint search, for each number of minutes) on the packed states, next to the pruned solver."""
+import argparse
+import heapq
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from blueprints import BITS, EXAMPLE, GEODE, MASK, ROBOTS, START, BlueprintSolver, parse_blueprint, unpack
+
+# the versions of the search, with the files of their published results
+VERSIONS = {
+    "bfs": "bfs.txt",
+    "wtb": "bfs-wtb.txt",
+    "prune": "bfs-wtb-max-prune.txt",
+    "astar": "astar-best.txt",
+}
+
+solver = BlueprintSolver(parse_blueprint(EXAMPLE))
+
+
+def can_be_best(state: int, remaining: int, max_geodes: int) -> bool:
+    """The bound of the original scripts: a geode robot built every remaining minute."""
+    return (remaining * (remaining - 1)) // 2 + solver.get_lower_bound(state, remaining) > max_geodes
+
+
+def count_layers(depth: int, want_to_build: bool):
+    """Return the numbers of the states of plain BFS for each depth up to the given one (the layers
+    don't depend on the depth, so they're all counted at once)."""
+    counts = [1]
+    layer = [START]
+
+    for _ in range(depth):
+        layer = list(dict.fromkeys(s for state in layer for s in solver.next_states(state, want_to_build)))
+        counts.append(counts[-1] + len(layer))
+
+    return counts
+
+
+def count_pruned(depth: int) -> int:
+    """BFS that drops the states which can't beat the most geodes of the states taken out of the queue."""
+    count, max_geodes = 1, 0
+    layer = [START]
+
+    for remaining in reversed(range(depth + 1)):
+        next_layer = {}
+
+        for state in layer:
+            max_geodes = max(max_geodes, (state >> (BITS * GEODE)) & MASK)
+
+            if remaining == 0 or not can_be_best(state, remaining, max_geodes):
+                continue
+
+            for next_state in solver.next_states(state):
+                next_layer.setdefault(next_state)
+
+        count += len(next_layer)
+        layer = list(next_layer)
+
+    return count
+
+
+def _get_priority(parent: int, remaining: int, state: int) -> int:
+    """The order of the heap of the original script, packed: the most geodes (then obsidian, ...) of
+    the parent first, then the fewest remaining minutes, then the fewest ores and robots."""
+    (ores, _), (next_ores, robots) = unpack(parent), unpack(state)
+
+    priority = 0
+    for field in [MASK - o for o in reversed(ores)] + [remaining] + list(next_ores) + list(robots):
+        priority = (priority << BITS) | field
+
+    return priority
+
+
+def count_astar(depth: int) -> int:
+    """Best-first search ordered by the minerals, pruning the states both when taken out of the heap
+    and when added to it."""
+    heap = [(0, depth, START)]
+    visited = set()
+    max_geodes = 0
+
+    while len(heap) != 0:
+        _, remaining, state = heapq.heappop(heap)
+
+        max_geodes = max(max_geodes, (state >> (BITS * GEODE)) & MASK)
+
+        if remaining == 0 or not can_be_best(state, remaining, max_geodes):
+            continue
+
+        for next_state in solver.next_states(state):
+            key = next_state | (remaining - 1) << (2 * ROBOTS)
+
+            if key not in visited and can_be_best(next_state, remaining - 1, max_geodes):
+                heapq.heappush(heap, (_get_priority(state, remaining - 1, next_state), remaining - 1, next_state))
+                visited.add(key)
+
+    return len(visited) + 1
+
+
+def run(version: str, depth: int):
+    """Return the numbers of the states of the version for the depths up to the given one (or just
+    for the given one, for the versions depending on it)."""
+    if version in ("bfs", "wtb"):
+        return count_layers(depth, version == "wtb")
+    elif version == "prune":
+        return count_pruned(depth)
+    elif version == "astar":
+        return count_astar(depth)
+    else:
+        return solver.get_max_geodes(depth)[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument("-d", "--depth", help="the largest number of minutes (defaults to 20, the results go up to 24)",
+                        type=int, default=20)
+    parser.add_argument("-j", "--jobs", help="the number of searches run in parallel (the number of CPUs by default)",
+                        type=int, default=os.cpu_count())
+
+    arguments = parser.parse_args()
+
+    published = {}
+    for version, name in VERSIONS.items():
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", name)) as f:
+            published[version] = [int(line.split()[1]) for line in f.read().splitlines()]
+
+    depths = range(arguments.depth + 1)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+        # the largest depths first, so they don't end up running alone at the end
+        futures = {}
+        for version in ["bfs", "wtb"]:
+            futures[version] = executor.submit(run, version, arguments.depth)
+
+        for depth in reversed(depths):
+            for version in ["prune", "astar", "packed"]:
+                futures[version, depth] = executor.submit(run, version, depth)
+
+        counts = {version: futures[version].result() for version in ["bfs", "wtb"]}
+        for version in ["prune", "astar", "packed"]:
+            counts[version] = [futures[version, depth].result() for depth in depths]
+
+    print(f"{'depth':>5} | " + " ".join(f"{version:>9}" for version in list(VERSIONS) + ["packed"]))
+
+    mismatches = 0
+    for depth in depths:
+        cells = []
+        for version in VERSIONS:
+            count = counts[version][depth]
+            expected = published[version][depth] if depth < len(published[version]) else count
+
+            cells.append(f"{count:>9}" if count == expected else f"{count:>8}!")
+            mismatches += count != expected
+
+        print(f"{depth:>5} | " + " ".join(cells) + f" {counts['packed'][depth]:>9}")
+
+    print(f"{time.perf_counter() - start:.2f}s")
+
+    if mismatches != 0:
+        print(f"MISMATCH: {mismatches} of the counts differ from the published results (marked by !)")
+        quit(1)
@@ -0,0 +1,238 @@
+"""The problems of the video as adapters of the search engine in search.py: the maze, Theseus and
+the Minotaur and the robot blueprints."""
+from typing import List, Optional, Tuple
+
+from blueprints import ROBOTS, START, BlueprintSolver, parse_blueprint
+from search import bfs
+
+Position = Tuple[int, int]
+
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+
+class Maze:
+    """A maze given by its rows; the walls can't be entered and the costs of entering the other
+    characters default to 1. The positions are encoded as their indexes in the rows."""
+
+    def __init__(self, maze: List[str], walls: str = "#", costs: Optional[dict] = None):
+        self.maze = maze
+        self.walls = walls
+        self.costs = costs or {}
+
+        self.width = len(maze[0])
+        self.height = len(maze)
+
+    def find(self, char: str) -> Optional[Position]:
+        """Return the position of the character in the maze (or None if it isn't there)."""
+        for y, row in enumerate(self.maze):
+            if char in row:
+                return row.index(char), y
+
+        return None
+
+    def is_position_valid(self, position: Position) -> bool:
+        x, y = position
+
+        return 0 <= x < self.width \
+            and 0 <= y < self.height \
+            and self.maze[y][x] not in self.walls
+
+    def next_states(self, position: Position) -> List[Position]:
+        x, y = position
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS if self.is_position_valid((x + dx, y + dy))]
+
+    def weighted_next_states(self, position: Position) -> List[Tuple[int, Position]]:
+        return [(self.costs.get(self.maze[y][x], 1), (x, y)) for x, y in self.next_states(position)]
+
+    def get_heuristic(self, goal: Position):
+        """Return the Manhattan distance to the goal (times the cheapest cost of a move)."""
+        cheapest = min([1, *self.costs.values()])
+        gx, gy = goal
+
+        return lambda position: (abs(position[0] - gx) + abs(position[1] - gy)) * cheapest
+
+    def encode(self, position: Position) -> int:
+        return position[1] * self.width + position[0]
+
+    def decode(self, code: int) -> Position:
+        return code % self.width, code // self.width
+
+
+class MinotaurMaze(Maze):
+    """The states are the (Theseus, Minotaur) positions; the Minotaur makes two moves towards Theseus
+    after each of his, horizontal ones first."""
+
+    def next_minotaur_position(self, theseus: Position, minotaur: Position) -> Position:
+        tx, ty = theseus
+        mx, my = minotaur
+
+        for _ in range(2):
+            # horizontal movement
+            dx = (mx < tx) - (mx > tx)
+            if dx != 0 and self.is_position_valid((mx + dx, my)):
+                mx += dx
+                continue
+
+            # vertical movement
+            dy = (my < ty) - (my > ty)
+            if dy != 0 and self.is_position_valid((mx, my + dy)):
+                my += dy
+                continue
+
+        return mx, my
+
+    def next_states(self, state: Tuple[Position, Position]) -> List[Tuple[Position, Position]]:
+        t, m = state
+
+        states = []
+        for new_t in super().next_states(t):
+            new_m = self.next_minotaur_position(new_t, m)
+
+            if new_t != new_m:
+                states.append((new_t, new_m))
+
+        return states
+
+    def encode(self, state: Tuple[Position, Position]) -> int:
+        return super().encode(state[0]) * self.width * self.height + super().encode(state[1])
+
+    def decode(self, code: int) -> Tuple[Position, Position]:
+        t, m = divmod(code, self.width * self.height)
+        return super().decode(t), super().decode(m)
+
+
+class Blueprint:
+    """The robot blueprint problem on the packed states of blueprints.py, with the remaining minutes
+    packed above the robots; the goal is to have the most geodes when the time runs out.
+
+    The searches don't stop at a goal, so the geodes are maximized by exploring all of the states,
+    pruning the ones that can't beat the best geodes found so far."""
+
+    # the shift of the remaining minutes
+    TIME = 2 * ROBOTS
+
+    def __init__(self, line: str):
+        self.solver = BlueprintSolver(parse_blueprint(line))
+        self.max_geodes = 0
+
+    def next_states(self, state: int) -> List[int]:
+        remaining, state = state >> self.TIME, state & ((1 << self.TIME) - 1)
+
+        if remaining == 0 or self.solver.get_upper_bound(state, remaining) <= self.max_geodes:
+            return []
+
+        states = []
+        for next_state in self.solver.next_states(state):
+            next_state = self.solver.cap(next_state, remaining - 1)
+
+            # the geodes of the state if no more geode robots are built
+            self.max_geodes = max(self.max_geodes, self.solver.get_lower_bound(next_state, remaining - 1))
+
+            states.append(next_state | (remaining - 1) << self.TIME)
+
+        return states
+
+    def get_max_geodes(self, minutes: int) -> int:
+        """Return the most geodes that can be opened in the given number of minutes."""
+        self.max_geodes = 0
+
+        bfs(START | minutes << self.TIME, self.next_states, lambda state: False)
+
+        return self.max_geodes
+
+
+if __name__ == "__main__":
+    import time
+
+    from random import random, seed
+
+    from blueprints import EXAMPLE
+    from search import a_star, bidirectional_bfs, dijkstra, ida_star
+
+    # the examples of the video
+    maze = Maze([
+        "##########",
+        "# #     E#",
+        "# # # ####",
+        "# T #    #",
+        "### # ## #",
+        "#   #    #",
+        "## ## # ##",
+        "#  #  #  #",
+        "##########",
+    ])
+
+    theseus, escape = maze.find("T"), maze.find("E")
+
+    result = bfs(theseus, maze.next_states, lambda state: state == escape, maze.encode, maze.decode)
+    assert result.path == [(2, 3), (3, 3), (3, 2), (3, 1), (4, 1), (5, 1), (6, 1), (7, 1), (8, 1)]
+
+    minotaur_maze = MinotaurMaze(maze.maze[:3] + ["# T # M  #"] + maze.maze[4:])
+
+    result = bfs((theseus, minotaur_maze.find("M")), minotaur_maze.next_states, lambda state: state[0] == escape,
+                 minotaur_maze.encode, minotaur_maze.decode)
+    assert result.cost == 18 and result.path[-1] == ((8, 1), (8, 4))
+
+    assert Blueprint(EXAMPLE).get_max_geodes(24) == 9
+
+    # all of the searches find the shortest paths in random mazes (with some walls costing 10)
+    seed(0)
+
+    for trial in range(100):
+        size = 4 + trial // 10
+        rows = ["".join(" " if random() < 0.7 else "#" if random() < 0.5 else "." for _ in range(size))
+                for _ in range(size)]
+
+        maze = Maze(rows, walls=".", costs={"#": 10})
+        start, goal = (0, 0), (size - 1, size - 1)
+
+        if not maze.is_position_valid(start) or not maze.is_position_valid(goal):
+            continue
+
+        def is_goal(position):
+            return position == goal
+
+        unweighted = bfs(start, maze.next_states, is_goal, maze.encode, maze.decode)
+        assert bidirectional_bfs(start, goal, maze.next_states, encode=maze.encode, decode=maze.decode).cost \
+            == unweighted.cost
+
+        weighted = dijkstra(start, maze.weighted_next_states, is_goal, maze.encode, maze.decode)
+        heuristic = maze.get_heuristic(goal)
+
+        results = [a_star(start, maze.weighted_next_states, is_goal, heuristic, maze.encode, maze.decode)]
+
+        # IDA* only remembers the current path, so it's exponential in the mazes with many cycles
+        if weighted.path is not None and size <= 8:
+            results.append(ida_star(start, maze.weighted_next_states, is_goal, heuristic, maze.encode))
+
+        for result in results:
+            assert result.cost == weighted.cost
+
+            if result.path is not None:
+                assert sum(dict((s, c) for c, s in maze.weighted_next_states(u))[v]
+                           for u, v in zip(result.path, result.path[1:])) == result.cost
+
+    # an unreachable escape (where IDA* runs out of paths to cut off instead of raising its bound forever)
+    maze = Maze(["   ", " ##", " # "])
+    start, goal = (0, 0), (2, 2)
+    heuristic = maze.get_heuristic(goal)
+
+    assert bfs(start, maze.next_states, goal.__eq__, maze.encode, maze.decode).path is None
+    assert a_star(start, maze.weighted_next_states, goal.__eq__, heuristic, maze.encode, maze.decode).path is None
+    assert ida_star(start, maze.weighted_next_states, goal.__eq__, heuristic, maze.encode).path is None
+
+    # the counters of the searches on an open maze
+    maze = Maze([" " * 40] * 40)
+    start, goal = (0, 0), (39, 39)
+    heuristic = maze.get_heuristic(goal)
+
+    for name, search in [
+        ("BFS", lambda: bfs(start, maze.next_states, goal.__eq__, maze.encode, maze.decode)),
+        ("bidirectional BFS", lambda: bidirectional_bfs(start, goal, maze.next_states, encode=maze.encode, decode=maze.decode)),
+        ("Dijkstra", lambda: dijkstra(start, maze.weighted_next_states, goal.__eq__, maze.encode, maze.decode)),
+        ("A*", lambda: a_star(start, maze.weighted_next_states, goal.__eq__, heuristic, maze.encode, maze.decode)),
+        ("IDA*", lambda: ida_star(start, maze.weighted_next_states, goal.__eq__, heuristic, maze.encode)),
+    ]:
+        start_time = time.perf_counter()
+        result = search()
+        print(f"{name:>17}: {result} in {time.perf_counter() - start_time:.4f}s")
@@ -0,0 +1,281 @@
+"""A state-space search engine: BFS, Dijkstra, A*, bidirectional BFS and IDA*.
+
+The problems are given by callables, like in the programs of the video: next_states(state) returns
+the next states (as (cost, state) pairs for the weighted searches), stop_condition(state) tells
+whether the state is a solution and heuristic(state) estimates the cost from the state to one.
+
+The discovered states are stored by their codes (encode(state), e.g. a Packer packing a tuple of
+small ints into a single int), which are much cheaper to hash and keep around than nested tuples;
+the paths are then rebuilt from the codes by decode. Each search returns a SearchResult with the
+path it found and the counters of the run.
+"""
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+from math import isinf
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+State = Hashable
+
+
+class Packer:
+    """Packs tuples of non-negative ints into single ints, the i-th one taking bits[i] bits."""
+
+    def __init__(self, bits: Sequence[int]):
+        self.shifts = []
+        self.masks = [(1 << b) - 1 for b in bits]
+
+        shift = 0
+        for b in bits:
+            self.shifts.append(shift)
+            shift += b
+
+    def pack(self, values: Sequence[int]) -> int:
+        code = 0
+        for value, shift, mask in zip(values, self.shifts, self.masks):
+            if not 0 <= value <= mask:
+                raise ValueError(f"{value} doesn't fit into {mask.bit_length()} bits")
+
+            code |= value << shift
+
+        return code
+
+    def unpack(self, code: int) -> Tuple[int, ...]:
+        return tuple((code >> shift) & mask for shift, mask in zip(self.shifts, self.masks))
+
+
+class SearchResult:
+    """The path found by a search (None if there is none), its cost and the counters of the run:
+    the number of the expanded states, of the generated ones (the next states looked at) and the
+    largest size of the frontier (the queue, the heap or the stack of the search)."""
+
+    def __init__(self):
+        self.path: Optional[List[State]] = None
+        self.cost = None
+
+        self.expanded = 0
+        self.generated = 0
+        self.peak_frontier = 0
+
+    def __repr__(self):
+        return f"SearchResult(cost={self.cost}, expanded={self.expanded}, " \
+               f"generated={self.generated}, peak_frontier={self.peak_frontier})"
+
+
+def _identity(state):
+    return state
+
+
+def _get_path(discovered: Dict, code, decode: Callable) -> List[State]:
+    """Return the path to the state of the code, following the codes of the parents."""
+    path = [code]
+    while discovered[path[-1]] is not None:
+        path.append(discovered[path[-1]])
+
+    return [decode(code) for code in reversed(path)]
+
+
+def bfs(starting_state: State, next_states: Callable[[State], Iterable[State]],
+        stop_condition: Callable[[State], bool],
+        encode: Callable = _identity, decode: Callable = _identity) -> SearchResult:
+    """Breadth-first search; the cost of the path is the number of its moves."""
+    result = SearchResult()
+
+    queue = deque([starting_state])
+    discovered = {encode(starting_state): None}
+
+    while len(queue) != 0:
+        current = queue.popleft()
+        result.expanded += 1
+
+        if stop_condition(current):
+            result.path = _get_path(discovered, encode(current), decode)
+            result.cost = len(result.path) - 1
+            return result
+
+        current_code = encode(current)
+
+        for next_state in next_states(current):
+            result.generated += 1
+            code = encode(next_state)
+
+            if code not in discovered:
+                queue.append(next_state)
+                discovered[code] = current_code
+
+        result.peak_frontier = max(result.peak_frontier, len(queue))
+
+    return result
+
+
+def a_star(starting_state: State, next_states: Callable[[State], Iterable[Tuple[float, State]]],
+           stop_condition: Callable[[State], bool], heuristic: Callable[[State], float],
+           encode: Callable = _identity, decode: Callable = _identity) -> SearchResult:
+    """A* with lazy deletion: a state is pushed again whenever a shorter path to it is found and
+    the stale entries are skipped when popped (instead of being removed from the heap).
+
+    The path is the shortest one if the heuristic doesn't overestimate."""
+    result = SearchResult()
+
+    # the ties are broken by the longer paths (which are closer to the goal) and then by the
+    # counter, so the states themselves are never compared
+    tiebreaker = count()
+
+    code = encode(starting_state)
+    queue = [(heuristic(starting_state), 0, next(tiebreaker), 0, starting_state)]
+    discovered = {code: None}
+    distance = {code: 0}
+
+    while len(queue) != 0:
+        _, _, _, d_start_to_curr, current = heappop(queue)
+        current_code = encode(current)
+
+        # a shorter path to the state has been found since this entry was pushed
+        if distance[current_code] < d_start_to_curr:
+            continue
+
+        result.expanded += 1
+
+        if stop_condition(current):
+            result.path = _get_path(discovered, current_code, decode)
+            result.cost = d_start_to_curr
+            return result
+
+        for d_curr_to_next, next_state in next_states(current):
+            result.generated += 1
+
+            code = encode(next_state)
+            d_start_to_next = d_start_to_curr + d_curr_to_next
+
+            if code not in distance or distance[code] > d_start_to_next:
+                heappush(queue, (d_start_to_next + heuristic(next_state), -d_start_to_next, next(tiebreaker),
+                                 d_start_to_next, next_state))
+
+                discovered[code] = current_code
+                distance[code] = d_start_to_next
+
+        result.peak_frontier = max(result.peak_frontier, len(queue))
+
+    return result
+
+
+def dijkstra(starting_state: State, next_states: Callable[[State], Iterable[Tuple[float, State]]],
+             stop_condition: Callable[[State], bool],
+             encode: Callable = _identity, decode: Callable = _identity) -> SearchResult:
+    """Dijkstra's algorithm (with lazy deletion), i.e. A* without a heuristic."""
+    return a_star(starting_state, next_states, stop_condition, lambda state: 0, encode, decode)
+
+
+def bidirectional_bfs(starting_state: State, goal_state: State,
+                      next_states: Callable[[State], Iterable[State]],
+                      previous_states: Optional[Callable[[State], Iterable[State]]] = None,
+                      encode: Callable = _identity, decode: Callable = _identity) -> SearchResult:
+    """Breadth-first search from both of the ends, expanding a whole layer of the smaller frontier
+    at a time, until they meet. The previous states default to the next ones (for the problems
+    whose moves can be undone)."""
+    result = SearchResult()
+    previous_states = previous_states or next_states
+
+    start, goal = encode(starting_state), encode(goal_state)
+
+    # the parents (towards the start) and the children (towards the goal) of the discovered states
+    forward, backward = {start: None}, {goal: None}
+    forward_layer, backward_layer = [starting_state], [goal_state]
+
+    meeting = start if start == goal else None
+
+    while meeting is None and len(forward_layer) != 0 and len(backward_layer) != 0:
+        is_forward = len(forward_layer) <= len(backward_layer)
+
+        layer = forward_layer if is_forward else backward_layer
+        moves = next_states if is_forward else previous_states
+        discovered, other = (forward, backward) if is_forward else (backward, forward)
+
+        next_layer = []
+        for current in layer:
+            result.expanded += 1
+            current_code = encode(current)
+
+            for next_state in moves(current):
+                result.generated += 1
+                code = encode(next_state)
+
+                if code not in discovered:
+                    discovered[code] = current_code
+                    next_layer.append(next_state)
+
+                    # all of the meetings in one layer give paths of the same length
+                    if meeting is None and code in other:
+                        meeting = code
+
+        if is_forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+        result.peak_frontier = max(result.peak_frontier, len(forward_layer) + len(backward_layer))
+
+    if meeting is not None:
+        result.path = _get_path(forward, meeting, decode) + _get_path(backward, meeting, decode)[-2::-1]
+        result.cost = len(result.path) - 1
+
+    return result
+
+
+def ida_star(starting_state: State, next_states: Callable[[State], Iterable[Tuple[float, State]]],
+             stop_condition: Callable[[State], bool], heuristic: Callable[[State], float],
+             encode: Callable = _identity, max_cost: float = float("inf")) -> SearchResult:
+    """Iterative deepening A*: depth-first searches bounded by the estimated cost of the path, the
+    bound being raised to the smallest estimate exceeding it after each of them. Only the current
+    path is stored, so the memory is linear in its length (the frontier being the path)."""
+    result = SearchResult()
+
+    path = [starting_state]
+    on_path = {encode(starting_state)}
+
+    def search(d_start_to_curr: float, bound: float) -> float:
+        """Return the cost of the solution (stored in the path) or the next bound (if there is none)."""
+        current = path[-1]
+        estimate = d_start_to_curr + heuristic(current)
+
+        if estimate > bound:
+            return estimate
+
+        result.expanded += 1
+
+        if stop_condition(current):
+            result.path = list(path)
+            result.cost = d_start_to_curr
+            return d_start_to_curr
+
+        next_bound = float("inf")
+
+        for d_curr_to_next, next_state in next_states(current):
+            result.generated += 1
+            code = encode(next_state)
+
+            if code in on_path:
+                continue
+
+            path.append(next_state)
+            on_path.add(code)
+            result.peak_frontier = max(result.peak_frontier, len(path))
+
+            t = search(d_start_to_curr + d_curr_to_next, bound)
+
+            path.pop()
+            on_path.remove(code)
+
+            if result.path is not None:
+                return t
+
+            next_bound = min(next_bound, t)
+
+        return next_bound
+
+    # the bound is infinite when the last search didn't cut off any path (so there is no solution)
+    bound = heuristic(starting_state)
+    while result.path is None and not isinf(bound) and bound <= max_cost:
+        bound = search(0, bound)
+
+    return result
@@ -1,10 +1,15 @@
 from manim import *
-from typing import Dict
+from typing import Dict, List, Tuple
+from functools import lru_cache
 import networkx as nx
-import networkx as nx
-import pydot
-from networkx.drawing.nx_pydot import graphviz_layout
-from math import pi
+from math import pi, cos, sin
+
+import os
+import sys
+
+# the blueprints (and their parser) are shared with the programs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs"))
+from blueprints import EXAMPLE as BLUEPRINT, parse_blueprint
 
 
 BIG_OPACITY = 0.2
@@ -280,133 +285,242 @@ def align_object_by_coords(obj, current, desired, animation=False):
     else:
         obj.shift(desired - current)
 
-def get_tree(depth, root=(0, (0, 0, 0, 0), (1, 0, 0, 0)), force_expand=[]):
+def next_blueprint_states(state, blueprint):
+    """Return the next states, given the current ores and robots."""
+    time, ores, robots = state
+    states = [(ores, robots)]
+
+    # attempt to build more robots
+    # we're assuming that we can built at most one each turn
+    for i, cost in enumerate(blueprint):
+        if all(o >= c for o, c in zip(ores, cost)):
+            states.append((
+                tuple(o - c for o, c in zip(ores, cost)),
+                tuple(r + (i == j) for j, r in enumerate(robots)),
+            ))
+
+    return [(time + 1, tuple(o + r for o, r in zip(new_ores, robots)), new_robots) for new_ores, new_robots in states]
+
+
+def _spread_on_circle(targets, separation):
+    """Return the angles closest to the targets (in the least squares sense) that are at least the
+    separation apart, keeping their order around the circle (the ties in the order of the list)."""
+    n = len(targets)
+    order = sorted(range(n), key=lambda i: (targets[i] % (2 * pi), i))
+
+    # the circle is cut in the largest gap between the targets
+    angles = [targets[i] % (2 * pi) for i in order]
+    gaps = [(angles[(k + 1) % n] - angles[k]) % (2 * pi) if n > 1 else 2 * pi for k in range(n)]
+    cut = max(range(n), key=lambda k: gaps[k])
+
+    order = order[cut + 1:] + order[:cut + 1]
+    start = targets[order[0]]
+    unwrapped = [start + (targets[i] - start) % (2 * pi) for i in order]
+
+    # with y_k = x_k - k * separation the constraint is y being non-decreasing, which is the
+    # isotonic regression of the shifted targets (the pool adjacent violators algorithm)
+    blocks = []
+    for k, target in enumerate(unwrapped):
+        blocks.append([target - k * separation, 1])
+
+        while len(blocks) > 1 and blocks[-2][0] * blocks[-1][1] >= blocks[-1][0] * blocks[-2][1]:
+            total, count = blocks.pop()
+            blocks[-1][0] += total
+            blocks[-1][1] += count
+
+    result = [0] * n
+    k = 0
+    for total, count in blocks:
+        for _ in range(count):
+            result[order[k]] = total / count + k * separation
+            k += 1
+
+    # each of the angles as close to its target as possible (not just modulo 2 pi)
+    return [t + (a - t + pi) % (2 * pi) - pi for a, t in zip(result, targets)]
+
+
+@lru_cache
+def _get_state_assets():
+    robots = VGroup(*[
+        SVGMobject("assets/robot-ore.svg"),
+        SVGMobject("assets/robot-clay.svg"),
+        SVGMobject("assets/robot-obsidian.svg"),
+        SVGMobject("assets/robot-geode.svg"),
+    ]).arrange(buff=0.8)
 
-    def can_build_robot(ores, cost):
-        for o, c in zip(ores, cost):
-            if o < c:
-                return False
-        return True
-
-    def next_states(remaining, ores, robots, blueprint):
-        """Return the next state, given the current ores and robots."""
-        states = [(list(ores), list(robots))]
-
-        # attempt to build more robots
-        # we're assuming that we can built at most one each turn
-        for i, cost in enumerate(blueprint):
-            if can_build_robot(ores, cost):
-                states.append(
-                    (
-                        [o - c - (0 if i != j else 1)
-                         for j, (o, c) in enumerate(zip(ores, cost))],
-                        [r + (0 if i != j else 1)
-                         for j, r in enumerate(robots)],
-                    )
-                )
-
-        for (ores, robots) in states:
-            for i in range(len(ores)):
-                ores[i] += robots[i]
-
-            yield remaining + 1, tuple(ores), tuple(robots)
-
-
-    blueprint = """Blueprint 1: Each ore robot costs 4 ore.  Each clay robot costs 2 ore.  Each obsidian robot costs 3 ore and 14 clay.  Each geode robot costs 2 ore and 7 obsidian."""
-    parts = blueprint.strip().split()
-
-    # robot costs
-    blueprint = (
-        (
-            (int(parts[6]), 0, 0, 0), # ore
-            (int(parts[12]), 0, 0, 0), # clay
-            (int(parts[18]), int(parts[21]), 0, 0),  # obsidian
-            (int(parts[27]), 0, int(parts[30]), 0),  # geode
+    minerals = Group(*[
+        ImageMobject("assets/minerals/ore.png"),
+        ImageMobject("assets/minerals/clay.png"),
+        ImageMobject("assets/minerals/obsidian.png"),
+        ImageMobject("assets/minerals/geode.png"),
+    ])
+
+    return robots, minerals
+
+
+# the built visuals of the states, copied when they're needed again
+_vertex_cache = {}
+
+
+def vertex_from_state(state, only_layout=False):
+    if only_layout:
+        return Dot()
+
+    if state in _vertex_cache:
+        return _vertex_cache[state].copy()
+
+    myrobots, myminerals = _get_state_assets()
+
+    text = Tex("$$" + str(state) + "$$").set_z_index(10)
+    g = Group(text)
+
+    start = 1 + len(str(state[0])) + 2
+    for i in range(4):
+        s = start
+        e = start + len(str(state[1][i]))
+
+        g.add(
+            myminerals[i].copy().set_height(text.get_height() * 0.5).next_to(text[0][s:e], UP, buff=0.05).set_z_index(10),
         )
-    )
 
-    queue = [root]
-    visited = {queue[0]: None}
+        start += len(str(state[1][i])) + 1
 
-    while len(queue) != 0:
-        current = queue.pop(0)
+    start += 2
+    for i in range(4):
+        s = start
+        e = start + len(str(state[2][i]))
 
-        if current[0] >= depth and not current in force_expand:
-            continue
+        g.add(
+            myrobots[i].copy().set_height(text.get_height() * 0.5).next_to(text[0][s:e], UP, buff=0.05).set_z_index(10),
+        )
 
-        for next_state in next_states(*current, blueprint):
-            if next_state not in visited:
-                queue.append(next_state)
-                visited[next_state] = current
+        start += len(str(state[2][i])) + 1
 
-    for k, v in visited.items():
-        if v == None:
-            del visited[k]
-            break
+    _vertex_cache[state] = g
 
-    return nx.from_edgelist([(k, v) for (k, v) in visited.items()])
+    return g.copy()
 
-def actually_get_tree(depth, root, angle, force_expand=[], only_layout=False):
-    if not only_layout:
-        myrobots = VGroup(*[
-            SVGMobject("assets/robot-ore.svg"),
-            SVGMobject("assets/robot-clay.svg"),
-            SVGMobject("assets/robot-obsidian.svg"),
-            SVGMobject("assets/robot-geode.svg"),
-        ]).arrange(buff=0.8)
-
-        myminerals = Group(*[
-            ImageMobject("assets/minerals/ore.png"),
-            ImageMobject("assets/minerals/clay.png"),
-            ImageMobject("assets/minerals/obsidian.png"),
-            ImageMobject("assets/minerals/geode.png"),
-        ])
-
-    def vertex_from_state(state, only_layout):
-        if only_layout:
-            return Dot()
-
-        text = Tex("$$" + str(state) + "$$").set_z_index(10)
-        g = Group(text)
-
-        start = 1 + len(str(state[0])) + 2
-        for i in range(4):
-            s = start
-            e = start + len(str(state[1][i]))
-
-            g.add(
-                myminerals[i].copy().set_height(text.get_height() * 0.5).next_to(text[0][s:e], UP, buff=0.05).set_z_index(10),
-            )
 
-            start += len(str(state[1][i])) + 1
+class StateTree:
+    """The tree of the states discovered by BFS from the root, laid out radially as it grows.
 
-        start += 2
-        for i in range(4):
-            s = start
-            e = start + len(str(state[2][i]))
+    Each level is a ring around the root, its states placed as close to the angles of their parents
+    as they fit (the ring is widened until none of them is too far off). The states of the previous
+    levels never move, so the tree can be expanded a level at a time; the states forced to expand
+    past the depth are placed on their own ring though, which the later levels don't avoid."""
 
-            g.add(
-                myrobots[i].copy().set_height(text.get_height() * 0.5).next_to(text[0][s:e], UP, buff=0.05).set_z_index(10),
-            )
+    LEVEL_SPACING = 7.2
+    VERTEX_GAP = 6
+    MAX_SHIFT = pi / 6
 
-            start += len(str(state[2][i])) + 1
+    def __init__(self, root, angle=0, blueprint=BLUEPRINT):
+        self.root = root
+        self.blueprint = parse_blueprint(blueprint)
 
-        return g
+        self.parents = {root: None}
+        self.angles = {root: angle}
+        self.positions = {root: np.array([0.0, 0.0, 0.0])}
+        self.radii = [0]
 
+        # the discovered states that weren't expanded yet by their levels, in the order of BFS
+        self.pending = {0: [root]}
+
+        self.vertices = {}
+
+    def get_level(self, state):
+        return state[0] - self.root[0]
+
+    def expand(self, depth, force_expand=()) -> Tuple[List, List]:
+        """Expand the states before the depth (and the forced ones), returning the new states and
+        the new (state, parent) edges."""
+        force_expand = set(force_expand)
+        new_states = []
+
+        # one level at a time, since it's laid out at once (expanding it only adds to the next one)
+        level = min(self.pending, default=0)
+        while level <= max(self.pending, default=-1):
+            states = self.pending.pop(level, [])
+
+            if self.root[0] + level < depth:
+                expanded = states
+            else:
+                expanded = [s for s in states if s in force_expand]
+
+                if len(expanded) != len(states):
+                    self.pending[level] = [s for s in states if s not in force_expand]
+
+            children = []
+            for state in expanded:
+                for next_state in next_blueprint_states(state, self.blueprint):
+                    if next_state not in self.parents:
+                        self.parents[next_state] = state
+                        children.append(next_state)
+
+            if len(children) != 0:
+                self.pending.setdefault(level + 1, []).extend(children)
+
+            self._place(children, level + 1)
+            new_states += children
+
+            level += 1
+
+        return new_states, [(s, self.parents[s]) for s in new_states]
+
+    def _place(self, states, level):
+        if len(states) == 0:
+            return
+
+        # the ring of the level can only be widened when it's new
+        is_new = level == len(self.radii)
+
+        if is_new:
+            self.radii.append(max(self.radii[-1] + self.LEVEL_SPACING, len(states) * self.VERTEX_GAP / (2 * pi)))
+
+        targets = [self.angles[self.parents[s]] for s in states]
+
+        while True:
+            angles = _spread_on_circle(targets, self.VERTEX_GAP / self.radii[level])
+
+            if not is_new or max(abs(a - t) for a, t in zip(angles, targets)) <= self.MAX_SHIFT:
+                break
+
+            self.radii[level] *= 1.1
+
+        radius = self.radii[level]
+
+        for state, angle in zip(states, angles):
+            self.angles[state] = angle
+            self.positions[state] = np.array([radius * cos(angle), radius * sin(angle), 0])
+
+    def get_edges(self):
+        return [(k, v) for k, v in self.parents.items() if v is not None]
+
+    def get_vertex(self, state, only_layout=False):
+        """Return the visual of the state (the same one each time)."""
+        if (state, only_layout) not in self.vertices:
+            self.vertices[state, only_layout] = vertex_from_state(state, only_layout).move_to(self.positions[state])
+
+        return self.vertices[state, only_layout]
+
+
+def get_tree(depth, root=(0, (0, 0, 0, 0), (1, 0, 0, 0)), force_expand=[]):
+    tree = StateTree(root)
+    tree.expand(depth, force_expand)
+
+    return nx.from_edgelist(tree.get_edges())
+
+def actually_get_tree(depth, root, angle, force_expand=[], only_layout=False):
     def vertex_bg_from_vertex(vertex):
         return SurroundingRectangle(vertex, corner_radius=0, color=BLACK, fill_color=BLACK, fill_opacity=1).set_z_index(5).scale(1.25)
 
-    T = get_tree(depth, root=root, force_expand=force_expand)
-    pos = graphviz_layout(T, prog="neato", root=root)
-
-    scale = 10
+    state_tree = StateTree(root, angle)
+    state_tree.expand(depth, force_expand)
 
-    lt = {k: [(v[0] - pos[root][0]) / scale, (v[1] - pos[root][1]) / scale, 0] for k, v in pos.items()}
+    T = nx.from_edgelist(state_tree.get_edges())
 
-    tree = Graph.from_networkx(T, layout=lt)
-    tree.rotate(angle, about_point=tree.vertices[root].get_center())
+    tree = Graph.from_networkx(T, layout=state_tree.positions)
 
-    state_objects = {k: vertex_from_state(k, only_layout).move_to(tree.vertices[k]) for k in tree.vertices}
+    state_objects = {k: state_tree.get_vertex(k, only_layout) for k in tree.vertices}
     state_bgs = {k: vertex_bg_from_vertex(state_objects[k]) for k in tree.vertices}
 
     return tree, state_objects, state_bgs
@@ -1,12 +1,13 @@
 from manim import *
 from random import seed, shuffle, uniform
 from math import comb
-from itertools import combinations, product
+from itertools import product
 import sympy
-from sympy.abc import x, y
 import networkx as nx
 from pulp import *
 
+from tutte import chromatic
+
 
 def get_coloring(vertices, edges):
     """Get the coloring of a set of edges, returning a vertex: color dictionary."""
@@ -47,66 +48,6 @@ def get_coloring(vertices, edges):
           for i in range(n) for j in range(n) if variables[i][j].value()}
 
 
-def edgesToVertices(edges):
-    return list(set([u for u, v in edges] + [v for u, v in edges]))
-
-def neighbours(v, E):
-    """Return the neighbours of v in E."""
-    t = []
-    for e in E:
-        if v in e:
-            t.append(e)
-    return [a for a in edgesToVertices(t) if a != v]
-
-
-def components(V, E):
-    """Calculate the number of components of the graph."""
-    total = 0
-    explored = set()
-    for v in V:
-        if v in explored:
-            continue
-
-        queue = [v]
-        explored.add(v)
-        total += 1
-        while len(queue) != 0:
-            v = queue.pop(0)
-
-            for w in neighbours(v, E):
-                if w not in explored:
-                    explored.add(w)
-                    queue.append(w)
-
-    return total
-
-
-def tutte(V, E):
-    """Return the Tutte polynomial of the graph."""
-    polynomial = 0
-
-    c_e = components(V, E)
-    for k in range(len(E)+1):
-
-        for F in combinations(E, k):
-            c_f = components(V, F)
-
-            r_e = len(V) - c_e
-            r_f = len(V) - c_f
-            n_f = len(F) - r_f
-
-            polynomial += (x - 1) ** (r_e - r_f) * (y - 1) ** (n_f)
-
-    return polynomial.as_poly()
-
-
-def chromatic(V, E):
-    p = tutte(V, E)
-    k = components(V, E)
-
-    return ((-1) ** (len(V) + k) * x ** k * p.subs(x, 1 - x).subs(y, 0))
-
-
 def polynomial_to_tex(p):
     return sympy.latex(p.as_expr().expand())
 
@@ -144,7 +85,8 @@ class Introo(MovingCameraScene):
             },
         )
 
-        f = lambda i: float(chromatic(g_nx.nodes, g_nx.edges).subs(x, i))
+        p = chromatic(g_nx.nodes, g_nx.edges)
+        f = lambda i: float(p(i))
         graph = ax.plot(f, x_range=[-0.35, 3.10, 0.01])
 
         a = Dot(ax.c2p(0, 0)).scale(1.5).set_z_index(1)
@@ -0,0 +1 @@
+../tutte.py
\ No newline at end of file
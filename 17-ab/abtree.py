@@ -0,0 +1,433 @@
+"""An (a,b)-tree as plain data that logs the structural changes of its operations (independent of Manim).
+
+Each of the nodes has an id that stays the same for as long as the node exists, so the changes
+can refer to them: insert and delete return the list of the changes they made (adding a key to a
+node, splitting a node, merging two of them, ...), and applying the same changes to a copy of the
+tree (see Tree.apply) gives the same tree. ABTree in utilities.py applies them to its mobjects,
+recreating only the nodes that the changes touched.
+
+The leafs of the video (the empty ones under the lowest nodes) aren't stored at all.
+"""
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+class AddKey(NamedTuple):
+    """The key is added to a lowest node at the index."""
+    node: int
+    index: int
+    key: int
+
+
+class RemoveKey(NamedTuple):
+    """The key at the index is removed from a lowest node."""
+    node: int
+    index: int
+
+
+class ReplaceKey(NamedTuple):
+    """The key at the index of the node is replaced by another one."""
+    node: int
+    index: int
+    key: int
+
+
+class NewRoot(NamedTuple):
+    """A new root with no keys is added above the current one (which is its only child)."""
+    node: int
+
+
+class RemoveRoot(NamedTuple):
+    """The root with no keys is removed (its only child becoming the root)."""
+    node: int
+
+
+class Split(NamedTuple):
+    """The key at the index of the node moves to its parent; the keys (and the children) after it
+    move to a new right sibling."""
+    node: int
+    new_node: int
+    index: int
+
+
+class Merge(NamedTuple):
+    """The children at the index and right after it merge into the first one, together with the
+    key of the node between them."""
+    node: int
+    index: int
+
+
+class Rotate(NamedTuple):
+    """A key moves between the children at the index and right after it, through the key of the
+    node between them (to the right one if to_right, taking the closest child of its sibling along)."""
+    node: int
+    index: int
+    to_right: bool
+
+
+Change = Union[AddKey, RemoveKey, ReplaceKey, NewRoot, RemoveRoot, Split, Merge, Rotate]
+
+
+class Node:
+    __slots__ = ("id", "keys", "children", "parent")
+
+    def __init__(self, id: int, keys: List[int], children: Optional[List["Node"]] = None):
+        self.id = id
+        self.keys = keys
+        self.children = children or []
+        self.parent: Optional[Node] = None
+
+        for child in self.children:
+            child.parent = self
+
+    def __repr__(self):
+        return f"Node({self.id}, {self.keys})"
+
+
+class Tree:
+    """An (a,b)-tree: all of the nodes but the root have between a and b children (so between a - 1
+    and b - 1 keys), the root has at least two (unless it's the only node)."""
+
+    def __init__(self, a: int, b: int):
+        if a < 2 or b < 2 * a - 1:
+            raise ValueError(f"an ({a},{b})-tree needs a >= 2 and b >= 2a - 1")
+
+        self.a = a
+        self.b = b
+
+        self.root = Node(0, [])
+        self.nodes: Dict[int, Node] = {0: self.root}
+        self.next_id = 1
+
+    @classmethod
+    def from_layers(cls, a: int, b: int, layers: List[List[List[int]]]) -> "Tree":
+        """Return the tree of the layers in the format of ABTree (the keys of the nodes of each of
+        the layers, the children of a node being the next ones in the layer below)."""
+        tree = cls(a, b)
+        tree.nodes = {}
+
+        below: List[Node] = []
+        for layer in reversed(layers):
+            nodes = []
+            for keys in layer:
+                children = below[:len(keys) + 1] if below else []
+                below = below[len(children):]
+
+                nodes.append(tree._add_node(list(keys), children))
+
+            below = nodes
+
+        tree.root = below[0]
+
+        return tree
+
+    def copy(self) -> "Tree":
+        tree = Tree(self.a, self.b)
+        tree.nodes = {}
+
+        def copy_node(node):
+            tree.nodes[node.id] = Node(node.id, list(node.keys), [copy_node(child) for child in node.children])
+            return tree.nodes[node.id]
+
+        tree.root = copy_node(self.root)
+        tree.next_id = self.next_id
+
+        return tree
+
+    def _add_node(self, keys: List[int], children: List[Node], id: Optional[int] = None) -> Node:
+        if id is None:
+            id = self.next_id
+
+        self.next_id = max(self.next_id, id + 1)
+        self.nodes[id] = Node(id, keys, children)
+
+        return self.nodes[id]
+
+    def _find(self, key: int) -> Tuple[List[Node], int, bool]:
+        """Return the path to the node where the key is (or should be added), its index there and
+        whether it is there."""
+        path = [self.root]
+
+        while True:
+            node = path[-1]
+            index = bisect_left(node.keys, key)
+
+            if index < len(node.keys) and node.keys[index] == key:
+                return path, index, True
+
+            if len(node.children) == 0:
+                return path, index, False
+
+            path.append(node.children[index])
+
+    def search(self, key: int) -> Tuple[List[int], bool]:
+        """Return the ids of the nodes that the search for the key goes through and whether it's in
+        the tree (in the last one of them)."""
+        path, _, found = self._find(key)
+        return [node.id for node in path], found
+
+    def __contains__(self, key: int) -> bool:
+        return self._find(key)[2]
+
+    def apply(self, change: Change) -> Set[int]:
+        """Apply the change to the tree, returning the ids of the nodes whose keys or children it
+        changed (including the new and the removed ones)."""
+        if isinstance(change, NewRoot):
+            self.root = self._add_node([], [self.root], change.node)
+            return {self.root.id}
+
+        node = self.nodes[change.node]
+
+        if isinstance(change, AddKey):
+            node.keys.insert(change.index, change.key)
+            return {node.id}
+
+        elif isinstance(change, RemoveKey):
+            node.keys.pop(change.index)
+            return {node.id}
+
+        elif isinstance(change, ReplaceKey):
+            node.keys[change.index] = change.key
+            return {node.id}
+
+        elif isinstance(change, RemoveRoot):
+            self.root = node.children[0]
+            self.root.parent = None
+            del self.nodes[node.id]
+
+            return {node.id}
+
+        elif isinstance(change, Split):
+            parent = node.parent
+            position = parent.children.index(node)
+
+            right = self._add_node(node.keys[change.index + 1:], node.children[change.index + 1:], change.new_node)
+            parent.keys.insert(position, node.keys[change.index])
+            parent.children.insert(position + 1, right)
+            right.parent = parent
+
+            del node.keys[change.index:]
+            del node.children[change.index + 1:]
+
+            return {node.id, right.id, parent.id}
+
+        left, right = node.children[change.index], node.children[change.index + 1]
+
+        if isinstance(change, Merge):
+            left.keys += [node.keys.pop(change.index)] + right.keys
+
+            for child in right.children:
+                child.parent = left
+            left.children += right.children
+
+            node.children.pop(change.index + 1)
+            del self.nodes[right.id]
+
+        elif isinstance(change, Rotate):
+            if change.to_right:
+                right.keys.insert(0, node.keys[change.index])
+                node.keys[change.index] = left.keys.pop()
+
+                if len(left.children) != 0:
+                    right.children.insert(0, left.children.pop())
+                    right.children[0].parent = right
+            else:
+                left.keys.append(node.keys[change.index])
+                node.keys[change.index] = right.keys.pop(0)
+
+                if len(right.children) != 0:
+                    left.children.append(right.children.pop(0))
+                    left.children[-1].parent = left
+
+        return {node.id, left.id, right.id}
+
+    def insert(self, key: int) -> List[Change]:
+        """Insert the key (if it isn't in the tree already), returning the changes that it took."""
+        path, index, found = self._find(key)
+
+        if found:
+            return []
+
+        changes: List[Change] = [AddKey(path[-1].id, index, key)]
+        self.apply(changes[-1])
+
+        # split the nodes that have too many children, going up
+        node = path[-1]
+        while len(node.keys) == self.b:
+            if node.parent is None:
+                changes.append(NewRoot(self.next_id))
+                self.apply(changes[-1])
+
+            # the same middle as the video (the left half is the smaller one)
+            changes.append(Split(node.id, self.next_id, (len(node.keys) - 1) // 2))
+            self.apply(changes[-1])
+
+            node = node.parent
+
+        return changes
+
+    def delete(self, key: int) -> List[Change]:
+        """Delete the key (if it's in the tree), returning the changes that it took."""
+        path, index, found = self._find(key)
+
+        if not found:
+            return []
+
+        changes: List[Change] = []
+        node = path[-1]
+
+        # keys are only removed from the lowest nodes, so an inner one is replaced by its predecessor
+        if len(node.children) != 0:
+            lowest = node.children[index]
+            while len(lowest.children) != 0:
+                lowest = lowest.children[-1]
+
+            changes.append(ReplaceKey(node.id, index, lowest.keys[-1]))
+            self.apply(changes[-1])
+
+            node, index = lowest, len(lowest.keys) - 1
+
+        changes.append(RemoveKey(node.id, index))
+        self.apply(changes[-1])
+
+        # fix the nodes that have too few children, going up
+        while node.parent is not None and len(node.keys) < self.a - 1:
+            parent = node.parent
+            position = parent.children.index(node)
+
+            left = parent.children[position - 1] if position > 0 else None
+            right = parent.children[position + 1] if position + 1 < len(parent.children) else None
+
+            if left is not None and len(left.keys) > self.a - 1:
+                changes.append(Rotate(parent.id, position - 1, True))
+            elif right is not None and len(right.keys) > self.a - 1:
+                changes.append(Rotate(parent.id, position, False))
+            else:
+                changes.append(Merge(parent.id, position - 1 if left is not None else position))
+
+            self.apply(changes[-1])
+
+            if isinstance(changes[-1], Rotate):
+                break
+
+            node = parent
+
+        if len(self.root.keys) == 0 and len(self.root.children) != 0:
+            changes.append(RemoveRoot(self.root.id))
+            self.apply(changes[-1])
+
+        return changes
+
+    def _get_layer_nodes(self) -> List[List[Node]]:
+        layers = [[self.root]]
+
+        while len(layers[-1][0].children) != 0:
+            layers.append([child for node in layers[-1] for child in node.children])
+
+        return layers
+
+    def get_layers(self) -> List[List[List[int]]]:
+        """Return the keys of the nodes of each of the layers (the format of ABTree)."""
+        return [[list(node.keys) for node in layer] for layer in self._get_layer_nodes()]
+
+    def get_layer_ids(self) -> List[List[int]]:
+        """Return the ids of the nodes of each of the layers (in the same order as get_layers)."""
+        return [[node.id for node in layer] for layer in self._get_layer_nodes()]
+
+    def __iter__(self):
+        """Iterate the keys in order."""
+        def walk(node):
+            for i, key in enumerate(node.keys):
+                if len(node.children) != 0:
+                    yield from walk(node.children[i])
+                yield key
+
+            if len(node.children) != 0:
+                yield from walk(node.children[-1])
+
+        yield from walk(self.root)
+
+
+if __name__ == "__main__":
+    import time
+
+    from random import randint, seed, shuffle
+
+    def check(tree):
+        """Assert that the tree is a valid (a,b)-tree."""
+        keys = list(tree)
+        assert keys == sorted(set(keys))
+
+        layers = tree._get_layer_nodes()
+        assert sum(len(layer) for layer in layers) == len(tree.nodes)
+
+        for i, layer in enumerate(layers):
+            for node in layer:
+                assert tree.nodes[node.id] is node
+                assert all(child.parent is node for child in node.children)
+                assert len(node.children) in (0, len(node.keys) + 1)
+                assert (len(node.children) == 0) == (i == len(layers) - 1)
+
+                if node is tree.root:
+                    assert node.parent is None
+                    assert len(node.keys) <= tree.b - 1 and (len(node.keys) != 0 or len(layers) == 1)
+                else:
+                    assert tree.a - 1 <= len(node.keys) <= tree.b - 1
+
+    # inserting in order into a (2,3)-tree splits the right nodes, the left halves being the smaller ones
+    tree = Tree(2, 3)
+    for i in range(1, 8):
+        tree.insert(i)
+
+    assert tree.get_layers() == [[[4]], [[2], [6]], [[1], [3], [5], [7]]]
+    assert Tree.from_layers(2, 3, tree.get_layers()).get_layers() == tree.get_layers()
+
+    seed(0)
+
+    for a, b in [(2, 3), (2, 4), (3, 5), (3, 6), (5, 9)]:
+        tree = Tree(a, b)
+        mirror = tree.copy()
+        expected = set()
+
+        for step in range(3000):
+            key = randint(0, 300)
+
+            before = {node.id: (list(node.keys), [child.id for child in node.children]) for node in tree.nodes.values()}
+
+            if randint(0, 2) != 0:
+                changes = tree.insert(key)
+                assert (len(changes) != 0) == (key not in expected)
+                expected.add(key)
+            else:
+                changes = tree.delete(key)
+                assert (len(changes) != 0) == (key in expected)
+                expected.discard(key)
+
+            check(tree)
+            assert list(tree) == sorted(expected)
+            assert all((key in tree) == (key in expected) for key in range(-1, 302, 7))
+
+            # replaying the changes gives the same tree, and they touch all of the changed nodes
+            touched = set()
+            for change in changes:
+                touched |= mirror.apply(change)
+
+            assert mirror.get_layers() == tree.get_layers() and mirror.get_layer_ids() == tree.get_layer_ids()
+            assert all(i in touched for i in before if i not in tree.nodes)
+            assert all(i in touched for i, node in tree.nodes.items()
+                       if before.get(i) != (node.keys, [child.id for child in node.children]))
+
+        check(Tree.from_layers(a, b, tree.get_layers()))
+
+    # a long insertion sequence, and the number of the changes that it takes
+    tree = Tree(2, 3)
+    keys = list(range(100_000))
+    shuffle(keys)
+
+    start = time.perf_counter()
+    changes = sum(len(tree.insert(key)) for key in keys)
+    print(f"inserted {len(keys)} keys in {time.perf_counter() - start:.2f}s ({changes} changes, {len(tree.nodes)} nodes)")
+
+    start = time.perf_counter()
+    changes = sum(len(tree.delete(key)) for key in keys)
+    print(f"deleted {len(keys)} keys in {time.perf_counter() - start:.2f}s ({changes} changes, {len(tree.nodes)} nodes)")
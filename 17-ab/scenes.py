@@ -1,5 +1,6 @@
 from manim import *
 from utilities import *
+from abtree import NewRoot, Tree
 
 from random import shuffle, seed
 from math import sqrt
@@ -1265,12 +1266,9 @@ class Basics(MovingCameraScene):
 
 class Outro(MovingCameraScene):
     def construct(self):
-        tree = ABTree(
-            [
-                [[]],
-            ],
-            fill_background=False
-        ).scale(S)
+        ab = Tree(2, 3)
+        tree = ABTree.from_tree(ab.copy(), fill_background=False).scale(S)
+        self.add(tree)
 
         self.camera.frame.scale(0.75)
 
@@ -1280,46 +1278,33 @@ class Outro(MovingCameraScene):
         seed(0xDEADBEEF)
         shuffle(nums)
 
-        def get_camera_anim():
-            w_ratio = (tree.get_width() * 1.2) / self.camera.frame.get_width()
-            h_ratio = (tree.get_height() * 1.5) / self.camera.frame.get_height()
+        def get_camera_anim(bounds):
+            w_ratio = (bounds.get_width() * 1.2) / self.camera.frame.get_width()
+            h_ratio = (bounds.get_height() * 1.5) / self.camera.frame.get_height()
 
             print(w_ratio, h_ratio)
 
-            return self.camera.frame.animate.move_to(tree).scale(max(w_ratio, h_ratio, 1))
+            return self.camera.frame.animate.move_to(bounds).scale(max(w_ratio, h_ratio, 1))
 
         for ii, i in enumerate(nums):
-            anim, tree = tree.insert(i, scale=S)
-
-            self.play(
-                anim,
-                get_camera_anim(),
-                run_time = (1 if ii <= 3 else 0.7 if ii <= 5 else 0.4 if ii <= 7 else 0.25),
-            )
-
-            # yuck
-            for mobject in self.mobjects:
-                self.remove(mobject)
-            self.add(tree)
-
-            result = tree.bubble_insert(3, scale=S, pause_between_shift=False)
+            # the insertion, then each of the splits (a new root appearing together with its split)
+            steps = []
+            for change in ab.insert(i):
+                if len(steps) != 0 and isinstance(steps[-1][-1], NewRoot):
+                    steps[-1].append(change)
+                else:
+                    steps.append([change])
 
-            while result is not None:
-                anim, tree = result
+            for changes in steps:
+                # the tree changes in place (bounds being where it ends up)
+                anim, bounds = tree.apply(changes, scale=S)
 
                 self.play(
                     anim,
-                    get_camera_anim(),
+                    get_camera_anim(bounds),
                     run_time = (1 if ii <= 3 else 0.7 if ii <= 5 else 0.4 if ii <= 7 else 0.25),
                 )
 
-                for mobject in self.mobjects:
-                    self.remove(mobject)
-
-                self.add(tree)
-
-                result = tree.bubble_insert(3, scale=S, pause_between_shift=False)
-
 
 class Interlude(MovingCameraScene):
     @fade
@@ -1,5 +1,8 @@
 from manim import *
 from copy import deepcopy
+from functools import lru_cache
+
+from abtree import Tree
 
 
 BIG_OPACITY = 0.15
@@ -226,6 +229,36 @@ def create_node(keys, fill_background=True, half=None, short=False):
         return border
 
 
+# how many of the created nodes are kept by their keys (creating the Tex of the keys is most of the
+# time of creating a tree)
+NODE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=NODE_CACHE_SIZE)
+def _create_cached_node(keys, fill_background):
+    return create_node(keys, fill_background)
+
+
+def get_node(keys, fill_background=True):
+    """Return a copy of the node from create_node (creating each one only once, as long as it's
+    among the recently used ones)."""
+    return _create_cached_node(None if keys is None else tuple(keys), fill_background).copy()
+
+
+def get_edge_spacing(key_count, is_interlude=False):
+    """Return the spacing of the tops of the edges of a node with the number of keys."""
+    # NOTE: last change, maybe fucks everything up
+    modifier = 0.9 if key_count == 1\
+            else 1.15 if key_count == 2\
+            else 1.35
+
+    if is_interlude:
+        modifier = 1.8
+    # NOTE: fuckup ends here
+
+    return KEYS_IN_NODE_BUFF * modifier
+
+
 class ABTree(VMobject):
     def __init__(self, layers, fill_background=True, add_leafs=True, leaf_buffer=0.25, node_buffer=0.4, layer_buffer=0.4, is_interlude=False, **kwargs):
         super().__init__(**kwargs)
@@ -252,7 +285,7 @@ class ABTree(VMobject):
         for layer in layers:
             layer_mobject = VGroup()
             for node in layer:
-                node_mobject = create_node(node, fill_background)
+                node_mobject = get_node(node, fill_background)
 
                 for key in node_mobject[0]:
                     self.keys.add(key)
@@ -332,22 +365,307 @@ class ABTree(VMobject):
         self.add(self.layer_mobjects)
         self.add(self.edges)
 
-    def _create_edges(self, node, fill_background=True, is_interlude=False):
-        node_keys = self.nodes_to_keys[node]
+        # what apply needs to lay out the changed tree the same way
+        self.fill_background = fill_background
+        self.add_leafs = add_leafs
+        self.leaf_buffer = leaf_buffer
+        self.node_buffer = node_buffer
+        self.layer_buffer = layer_buffer
+        self.is_interlude = is_interlude
+
+        # the (a,b)-tree of the tree and its node (and leaf) mobjects by the ids of its nodes (see from_tree)
+        self.tree = None
+        self.id_to_node = {}
+        self.id_to_leafs = {}
+
+    @classmethod
+    def from_tree(cls, tree: Tree, **kwargs):
+        """Return the ABTree of the (a,b)-tree, which it keeps (not copied) to apply its changes to."""
+        ab_tree = cls(tree.get_layers(), **kwargs)
+        ab_tree.tree = tree
+
+        layer_ids = tree.get_layer_ids()
+        for i, layer in enumerate(layer_ids):
+            for j, node_id in enumerate(layer):
+                ab_tree.id_to_node[node_id] = ab_tree.node_by_index(i, j)
+
+        if ab_tree.add_leafs:
+            leafs = iter(ab_tree.leafs)
+            for node_id in layer_ids[-1]:
+                ab_tree.id_to_leafs[node_id] = [next(leafs) for _ in range(len(tree.nodes[node_id].keys) + 1)]
+
+        # the sizes are before any scaling (as is the layout), so they don't change when the tree is scaled
+        leaf = get_node(None, ab_tree.fill_background)
+        ab_tree.leaf_size = (leaf.width, leaf.height)
+        ab_tree.node_sizes = {node_id: (node.width, node.height) for node_id, node in ab_tree.id_to_node.items()}
+        ab_tree.layout = ab_tree._get_layout()
+
+        # the mobjects that fade out during the animation of apply (removed by the next one)
+        ab_tree.vanishing = VGroup()
+        ab_tree.add(ab_tree.vanishing)
+
+        return ab_tree
+
+    def _get_layout(self):
+        """Return the centers of the nodes and of the leafs (by the ids of the nodes) and the size of
+        the tree, laid out like the constructor does (relative to the top of the root, without scaling)."""
+        layer_ids = self.tree.get_layer_ids()
+        leaf_width, leaf_height = self.leaf_size
+
+        heights = [max(self.node_sizes[node_id][1] for node_id in layer) for layer in layer_ids]
+        if self.add_leafs:
+            heights.append(leaf_height)
+
+        tops = [0]
+        for height in heights[:-1]:
+            tops.append(tops[-1] - height - self.layer_buffer)
+
+        # the widths of the subtrees and of the children of their roots, going up
+        spans, widths = {}, {}
+        for layer in reversed(layer_ids):
+            for node_id in layer:
+                node = self.tree.nodes[node_id]
+
+                if len(node.children) != 0:
+                    spans[node_id] = sum(widths[child.id] for child in node.children) \
+                        + self.node_buffer * (len(node.children) - 1)
+                elif self.add_leafs:
+                    spans[node_id] = (len(node.keys) + 1) * leaf_width + len(node.keys) * self.leaf_buffer
+                else:
+                    spans[node_id] = 0
+
+                widths[node_id] = max(self.node_sizes[node_id][0], spans[node_id])
+
+        # the nodes are centered above their children, going down
+        centers, leaf_centers = {}, {}
+        lefts = {self.tree.root.id: -widths[self.tree.root.id] / 2}
+
+        for i, layer in enumerate(layer_ids):
+            for node_id in layer:
+                node = self.tree.nodes[node_id]
+
+                x = lefts[node_id] + widths[node_id] / 2
+                centers[node_id] = np.array([x, tops[i] - heights[i] / 2, 0])
+
+                left = x - spans[node_id] / 2
+                if len(node.children) != 0:
+                    for child in node.children:
+                        lefts[child.id] = left
+                        left += widths[child.id] + self.node_buffer
+                elif self.add_leafs:
+                    leaf_centers[node_id] = [
+                        np.array([left + leaf_width / 2 + k * (leaf_width + self.leaf_buffer), tops[-1] - leaf_height / 2, 0])
+                        for k in range(len(node.keys) + 1)
+                    ]
+
+        return centers, leaf_centers, (widths[self.tree.root.id], heights[-1] - tops[-1])
+
+    def _get_edges(self, node_id, place):
+        """Return the edges of the node of the id in the current layout (place giving the positions
+        of its points in the scene)."""
+        centers, leaf_centers, _ = self.layout
+        node = self.tree.nodes[node_id]
+
+        if len(node.children) != 0:
+            ends = [centers[child.id] + UP * self.node_sizes[child.id][1] / 2 for child in node.children]
+        else:
+            ends = [center + UP * self.leaf_size[1] / 2 for center in leaf_centers[node_id]]
+
+        spacing = get_edge_spacing(len(node.keys), self.is_interlude)
+        bottom = centers[node_id] + DOWN * self.node_sizes[node_id][1] / 2
+
+        return VGroup(*[Line(start=place(bottom + RIGHT * spacing * (k - len(node.keys) / 2)), end=place(end))
+                        for k, end in enumerate(ends)])
+
+    def apply(self, changes, scale=1):
+        """Apply the changes of the (a,b)-tree (from its insert or delete) to the mobjects of its nodes,
+        returning the animation of them and a rectangle of where the tree ends up (i.e. for the camera).
+
+        Only the nodes that the changes touched get new mobjects (their keys moving between them by
+        their values); the rest of them only move to their new positions, if they moved. The scale
+        is the one that the tree was scaled by after from_tree."""
+        self.vanishing.remove(*self.vanishing.submobjects)
+
+        # the top of the root stays where it is
+        anchor = self.id_to_node[self.tree.root.id].get_top()
+
+        def place(point):
+            return anchor + point * scale
+
+        touched = set()
+        for change in changes:
+            touched |= self.tree.apply(change)
+
+        animations = []
+
+        def vanish(mobject):
+            self.vanishing.add(mobject)
+            animations.append(mobject.animate.set_opacity(0))
+
+        # take the keys out of the touched nodes, so they can move to other ones by their values
+        old_keys = {}
+        for node_id in touched:
+            node = self.id_to_node.get(node_id)
+
+            if node is not None:
+                old_keys.update(zip(self.nodes_to_keys[node], node[0]))
+                node[0].remove(*node[0].submobjects)
+
+        targets = {}
+        for node_id in touched:
+            if node_id in self.tree.nodes:
+                targets[node_id] = get_node(self.tree.nodes[node_id].keys, self.fill_background)
+                self.node_sizes[node_id] = (targets[node_id].width, targets[node_id].height)
+
+            elif node_id in self.id_to_node:
+                node = self.id_to_node.pop(node_id)
+
+                vanish(node[1])
+                if self.node_edges.get(node) is not None:
+                    vanish(self.node_edges[node])
+
+                del self.node_sizes[node_id]
+                self.id_to_leafs.pop(node_id, None)
+
+        old_centers = self.layout[0]
+        self.layout = self._get_layout()
+        centers, leaf_centers, (width, height) = self.layout
+
+        moved = {node_id for node_id, center in centers.items()
+                 if node_id not in old_centers or not np.allclose(old_centers[node_id], center)}
+
+        for node_id, target in targets.items():
+            target.scale(scale).move_to(place(centers[node_id]))
+            key_targets = list(target[0])
+
+            node = self.id_to_node.get(node_id)
+            if node is None:
+                node = self.id_to_node[node_id] = target
+                node[0].remove(*key_targets)
+
+                animations.append(FadeIn(node[1]))
+            else:
+                animations.append(Transform(node[1], target[1]))
+
+            for key, key_target in zip(self.tree.nodes[node_id].keys, key_targets):
+                if key in old_keys:
+                    node[0].add(old_keys.pop(key))
+                    animations.append(Transform(node[0][-1], key_target))
+                else:
+                    node[0].add(key_target)
+                    animations.append(FadeIn(key_target))
+
+            self.nodes_to_keys[node] = list(self.tree.nodes[node_id].keys)
 
-        # NOTE: last change, maybe fucks everything up
-        key_count = len(node_keys)
-        modifier = 0.9 if key_count == 1\
-                else 1.15 if key_count == 2\
-                else 1.35
+        for mobject in old_keys.values():
+            vanish(mobject)
 
-        if is_interlude:
-            modifier = 1.8
-        # NOTE: fuckup ends here
+        for node_id, node in self.id_to_node.items():
+            if node_id in moved and node_id not in touched:
+                animations.append(node.animate.move_to(place(centers[node_id])))
+
+            children = self.tree.nodes[node_id].children
+            if node_id not in moved and node_id not in touched and all(child.id not in moved for child in children):
+                continue
+
+            # the leafs are invisible, so they just move
+            if node_id in leaf_centers:
+                leafs = self.id_to_leafs.setdefault(node_id, [])
+
+                while len(leafs) < len(leaf_centers[node_id]):
+                    leafs.append(get_node(None, self.fill_background).scale(scale))
+                del leafs[len(leaf_centers[node_id]):]
+
+                for leaf, center in zip(leafs, leaf_centers[node_id]):
+                    leaf.move_to(place(center))
+            elif len(children) == 0:
+                continue
+
+            new_edges = self._get_edges(node_id, place)
+            edges = self.node_edges.get(node)
+
+            if edges is None:
+                self.node_edges[node] = new_edges
+                animations.append(FadeIn(new_edges))
+                continue
+
+            # the added edges split off of the last one and the removed ones fade out
+            while len(edges) < len(new_edges):
+                edges.add(edges[-1].copy())
+
+            while len(edges) > len(new_edges):
+                edge = edges[-1]
+                edges.remove(edge)
+                vanish(edge)
+
+            animations.append(Transform(edges, new_edges))
+
+        self._regroup()
+
+        bounds = Rectangle(width=width * scale, height=height * scale).move_to(anchor + DOWN * height * scale / 2)
+
+        return AnimationGroup(*animations), bounds
+
+    def _regroup(self):
+        """Group the mobjects of the nodes like the constructor does, after apply changed them."""
+        layer_ids = self.tree.get_layer_ids()
+
+        self.layers = [[list(self.tree.nodes[node_id].keys) for node_id in layer] for layer in layer_ids]
+        layer_nodes = [[self.id_to_node[node_id] for node_id in layer] for layer in layer_ids]
+
+        if self.add_leafs:
+            leafs = [leaf for node_id in layer_ids[-1] for leaf in self.id_to_leafs[node_id]]
+
+            self.layers.append([None] * len(leafs))
+            layer_nodes.append(leafs)
+
+            for leaf in leafs:
+                self.nodes_to_keys[leaf] = None
+                self.node_edges[leaf] = None
+
+        self.remove(self.layer_mobjects, self.edges, self.vanishing)
+
+        self.layer_mobjects = VGroup(*[VGroup(*layer) for layer in layer_nodes])
+        self.nodes = [node for layer in layer_nodes for node in layer]
+        self.nodes_to_keys = {node: self.nodes_to_keys[node] for node in self.nodes}
+        self.node_edges = {node: self.node_edges.get(node) for node in self.nodes}
+        self.node_mobjects = VGroup(*self.nodes)
+        self.leafs = VGroup(*layer_nodes[-1])
+        self.keys = VGroup(*[key for node in self.nodes for key in node[0]])
+
+        self.index_neighbours = {}
+        self.node_subtree_mobjects = {node: node for node in layer_nodes[-1]}
+
+        for i in reversed(range(len(layer_nodes) - 1)):
+            position = 0
+
+            for j, node in enumerate(layer_nodes[i]):
+                children = range(position, position + len(self.layers[i][j]) + 1)
+                position += len(children)
+
+                self.index_neighbours[i, j] = [(i + 1, k) for k in children]
+                self.node_subtree_mobjects[node] = VGroup(
+                    node, VGroup(*[self.node_subtree_mobjects[layer_nodes[i + 1][k]] for k in children]),
+                )
+
+                if self.node_edges[node] is not None:
+                    self.node_subtree_mobjects[node].add(self.node_edges[node])
+
+        self.reversed_index_neighbours = {value: key for key, values in self.index_neighbours.items() for value in values}
+
+        edges = [self.node_edges[node] for node in self.nodes if self.node_edges[node] is not None]
+        self.edges = VGroup(*edges)
+        self.edges_individually = VGroup(*[edge for group in edges for edge in group])
+        self.skeleton = VGroup(*[node[1] for node in self.nodes], *self.edges_individually)
+
+        self.add(self.layer_mobjects, self.edges, self.vanishing)
+
+    def _create_edges(self, node, fill_background=True, is_interlude=False):
+        node_keys = self.nodes_to_keys[node]
 
         top = VGroup(*[Dot().scale(0.001)
                        for _ in range(len(node_keys) + 1)])\
-                .arrange(RIGHT, KEYS_IN_NODE_BUFF * modifier)\
+                .arrange(RIGHT, get_edge_spacing(len(node_keys), is_interlude))\
                 .move_to(node)\
                 .align_to(node, DOWN)\
 
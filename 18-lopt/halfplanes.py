@@ -0,0 +1,164 @@
+"""The intersection of half-planes as a convex polygon (independent of Manim).
+
+The half-planes are given by their normals and offsets (n . p <= d) and are bounded by a large
+square, so the result is always a (possibly empty) convex polygon. They are sorted by the angles of
+their boundaries and swept with a deque (the usual O(n log n) algorithm): each new boundary removes
+the vertices from both ends of the deque that are outside of it, so only the boundaries of the
+polygon remain.
+"""
+import math
+
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+
+EPSILON = 1e-9
+
+# the half-size of the square bounding the intersection (like the "infinite" square of the scenes)
+BOUND = 100
+
+
+def intersect_half_planes(normals, offsets, bound: float = BOUND) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """Return the vertices of the intersection of the half-planes n . p <= d (counterclockwise) and
+    the pairs of the indexes of the half-planes each of them is on (the ones of the bounding
+    square being len(normals) and above)."""
+    # the sweep is on plain floats, which is much faster than NumPy for the few half-planes of a scene
+    xs, ys = [float(n[0]) for n in normals], [float(n[1]) for n in normals]
+    ds = [float(d) for d in offsets]
+
+    # the bounding square
+    xs += [1, 0, -1, 0]
+    ys += [0, 1, 0, -1]
+    ds += [bound] * 4
+
+    indexes = []
+    for i in range(len(xs)):
+        length = math.hypot(xs[i], ys[i])
+
+        # a zero normal is either always or never satisfied
+        if length < EPSILON:
+            if ds[i] < 0:
+                return np.zeros((0, 2)), []
+            continue
+
+        xs[i], ys[i], ds[i] = xs[i] / length, ys[i] / length, ds[i] / length
+        indexes.append(i)
+
+    # sorted by the angles of the normals (and so of the boundaries)
+    angles = {i: math.atan2(ys[i], xs[i]) for i in indexes}
+
+    # only the tightest of the parallel half-planes matters
+    order = []
+    for i in sorted(indexes, key=angles.get):
+        if order and angles[i] - angles[order[-1]] < EPSILON:
+            if ds[i] < ds[order[-1]]:
+                order[-1] = i
+        else:
+            order.append(i)
+
+    def intersect(i: int, j: int) -> Tuple[float, float]:
+        """Return the intersection of the boundaries of the two half-planes (they can't be parallel)."""
+        det = xs[i] * ys[j] - xs[j] * ys[i]
+        return (ds[i] * ys[j] - ds[j] * ys[i]) / det, (xs[i] * ds[j] - xs[j] * ds[i]) / det
+
+    def outside(point: Tuple[float, float], i: int, epsilon: float = EPSILON) -> bool:
+        return xs[i] * point[0] + ys[i] * point[1] > ds[i] + epsilon
+
+    lines = deque()
+    for i in order:
+        while len(lines) >= 2 and outside(intersect(lines[-1], lines[-2]), i):
+            lines.pop()
+
+        while len(lines) >= 2 and outside(intersect(lines[0], lines[1]), i):
+            lines.popleft()
+
+        # the new boundary is parallel to the last one (they point in opposite directions)
+        if lines and abs(xs[lines[-1]] * ys[i] - xs[i] * ys[lines[-1]]) < EPSILON:
+            if ds[lines[-1]] + ds[i] < -EPSILON:
+                return np.zeros((0, 2)), []
+
+            continue
+
+        lines.append(i)
+
+    while len(lines) >= 3 and outside(intersect(lines[-1], lines[-2]), lines[0]):
+        lines.pop()
+
+    while len(lines) >= 3 and outside(intersect(lines[0], lines[1]), lines[-1]):
+        lines.popleft()
+
+    if len(lines) < 3:
+        return np.zeros((0, 2)), []
+
+    lines = list(lines)
+    pairs = list(zip(lines, lines[1:] + lines[:1]))
+    vertices = [intersect(i, j) for i, j in pairs]
+
+    # the sweep can't tell an empty intersection from a tiny one, so the vertices are checked
+    tolerance = EPSILON * max(1, bound)
+    if any(outside(vertex, i, 100 * tolerance) for vertex in vertices for i in indexes):
+        return np.zeros((0, 2)), []
+
+    # the vertices on more than two of the boundaries are repeated
+    def same(p: Tuple[float, float], q: Tuple[float, float]) -> bool:
+        return abs(p[0] - q[0]) <= tolerance and abs(p[1] - q[1]) <= tolerance
+
+    keep = [k for k in range(len(vertices)) if k == 0 or not same(vertices[k], vertices[k - 1])]
+    if len(keep) > 1 and same(vertices[keep[0]], vertices[keep[-1]]):
+        keep.pop()
+
+    return np.array([vertices[k] for k in keep]), [pairs[k] for k in keep]
+
+
+if __name__ == "__main__":
+    import time
+
+    from itertools import combinations
+
+    def brute_force(normals, offsets, bound=BOUND):
+        """The pairwise intersections of the boundaries that satisfy all of the half-planes."""
+        normals = np.vstack([normals, [(1, 0), (0, 1), (-1, 0), (0, -1)]])
+        offsets = np.concatenate([offsets, [bound] * 4])
+
+        points = []
+        for i, j in combinations(range(len(normals)), 2):
+            if abs(np.linalg.det(normals[[i, j]])) > 1e-9:
+                point = np.linalg.solve(normals[[i, j]], offsets[[i, j]])
+
+                if np.all(normals @ point <= offsets + 1e-7) and all(np.abs(point - p).max() > 1e-7 for p in points):
+                    points.append(point)
+
+        return points
+
+    rng = np.random.default_rng(0)
+
+    for trial in range(2000):
+        n = int(rng.integers(0, 12))
+
+        normals = rng.normal(size=(n, 2))
+        offsets = rng.normal(size=n) * rng.choice([0.1, 1, 10])
+
+        # some parallel and repeated ones too
+        if n >= 2 and rng.random() < 0.3:
+            normals[1] = normals[0] * rng.choice([-2, 1, 3])
+
+        vertices, pairs = intersect_half_planes(normals, offsets)
+        expected = brute_force(normals, offsets)
+
+        assert len(vertices) == len(expected), (trial, vertices, expected)
+        assert all(np.abs(vertices - p).max(axis=1).min() < 1e-6 for p in expected)
+
+        # counterclockwise
+        if len(vertices) >= 3:
+            edges = np.roll(vertices, -1, axis=0) - vertices
+            assert all(u[0] * v[1] - u[1] * v[0] > -1e-9 for u, v in zip(edges, np.roll(edges, -1, axis=0)))
+
+    normals = rng.normal(size=(15, 2))
+    offsets = rng.uniform(1, 2, size=15)
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        intersect_half_planes(normals, offsets)
+
+    print(f"15 half-planes: {(time.perf_counter() - start) * 1000:.0f}us per intersection")
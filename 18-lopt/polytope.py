@@ -0,0 +1,235 @@
+"""Exact vertices, edges and faces of 3D polytopes given by inequalities (independent of Manim).
+
+The inequalities are (a, b, c, d) for a*x + b*y + c*z <= d and the polytope is assumed to be
+bounded. The vertices are found by intersecting all triples of the planes at once with NumPy
+(keeping the ones satisfying all of the inequalities), the faces are the vertices tight on each of
+the planes (ordered around it) and the edges are the sides of the faces.
+
+The polytopes are cached by their inequalities; when one that differs from a cached one by a single
+added inequality is asked for, the cached one is just cut by the plane of the new inequality.
+"""
+from itertools import combinations
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+Inequality = Tuple[float, float, float, float]
+
+# the tolerance of the tightness and of merging the vertices (relative to the scale of the polytope)
+EPSILON = 1e-7
+
+
+class Polytope:
+    """The vertices (an array of points), the faces (the cycles of the indexes of their vertices,
+    each with its inequality) and the edges (the pairs of the indexes of their vertices)."""
+
+    def __init__(self, vertices: np.ndarray, faces: List[Tuple[Inequality, List[int]]]):
+        self.vertices = vertices
+        self.faces = faces
+
+        edges = set()
+        for _, cycle in faces:
+            for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+                edges.add((min(u, v), max(u, v)))
+
+        self.edges = sorted(edges)
+
+    @classmethod
+    def from_inequalities(cls, inequalities: Sequence[Inequality]) -> "Polytope":
+        """Calculate the polytope from scratch, from the triples of its planes."""
+        if len(inequalities) < 3:
+            return cls(np.zeros((0, 3)), [])
+
+        rows = np.array(inequalities, dtype=float)
+
+        # scaled to unit normals, so the distances to the planes are comparable
+        rows /= np.linalg.norm(rows[:, :3], axis=1)[:, np.newaxis]
+        normals, offsets = rows[:, :3], rows[:, 3]
+
+        tolerance = EPSILON * max(1, np.abs(offsets).max())
+
+        triples = np.array(list(combinations(range(len(rows)), 3)))
+        matrices = normals[triples]
+
+        # the triples of planes meeting in a single point
+        regular = np.abs(np.linalg.det(matrices)) > EPSILON
+        matrices, triples = matrices[regular], triples[regular]
+
+        points = np.linalg.solve(matrices, offsets[triples][..., np.newaxis])[..., 0]
+        feasible = np.all(points @ normals.T <= offsets + tolerance, axis=1)
+
+        return cls._from_points(points[feasible], inequalities, tolerance)
+
+    @classmethod
+    def _from_points(cls, points: np.ndarray, inequalities: Sequence[Inequality], tolerance: float) -> "Polytope":
+        """Merge the (possibly repeated) vertices and find the faces they are on."""
+        vertices = []
+        for point in points:
+            if all(np.abs(point - v).max() > tolerance for v in vertices):
+                vertices.append(point)
+
+        vertices = np.array(vertices).reshape(-1, 3)
+
+        faces, seen = [], set()
+        for inequality in inequalities:
+            normal, offset = np.array(inequality[:3]), inequality[3]
+            tight = np.flatnonzero(np.abs(vertices @ normal - offset) <= tolerance * np.linalg.norm(normal))
+
+            if len(tight) >= 3 and frozenset(tight) not in seen:
+                seen.add(frozenset(tight))
+                faces.append((tuple(inequality), _order_around(vertices, list(tight), normal)))
+
+        return cls(vertices, faces)
+
+    def cut(self, inequality: Inequality) -> "Polytope":
+        """Return the polytope cut by the inequality (clipping each of the faces by its plane)."""
+        normal, offset = np.array(inequality[:3], dtype=float), inequality[3]
+
+        length = np.linalg.norm(normal)
+        normal, offset = normal / length, offset / length
+
+        tolerance = EPSILON * max(1, np.abs(self.vertices).max(initial=0))
+        distances = self.vertices @ normal - offset
+
+        if np.all(distances <= tolerance):
+            return self
+
+        points = list(self.vertices)
+
+        # the new vertices on the cut edges, shared by the two faces of each edge
+        cut_points: Dict[Tuple[int, int], int] = {}
+
+        def cut_edge(u: int, v: int) -> int:
+            key = (min(u, v), max(u, v))
+
+            if key not in cut_points:
+                t = distances[u] / (distances[u] - distances[v])
+                points.append(self.vertices[u] + t * (self.vertices[v] - self.vertices[u]))
+                cut_points[key] = len(points) - 1
+
+            return cut_points[key]
+
+        faces = []
+        on_plane = set()
+
+        for face_inequality, cycle in self.faces:
+            new_cycle = []
+
+            for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+                if distances[u] <= tolerance:
+                    new_cycle.append(u)
+
+                    if distances[u] >= -tolerance:
+                        on_plane.add(u)
+
+                if (distances[u] < -tolerance and distances[v] > tolerance) or \
+                        (distances[u] > tolerance and distances[v] < -tolerance):
+                    new_cycle.append(cut_edge(u, v))
+
+            if len(new_cycle) >= 3:
+                faces.append((face_inequality, new_cycle))
+
+        cap = list(on_plane) + list(cut_points.values())
+        if len(cap) >= 3:
+            faces.append((tuple(inequality), _order_around(np.array(points), cap, normal)))
+
+        # keep only the vertices of the remaining faces, renumbering them
+        used = sorted({v for _, cycle in faces for v in cycle})
+        index = {v: i for i, v in enumerate(used)}
+
+        return Polytope(
+            np.array([points[v] for v in used]).reshape(-1, 3),
+            [(face_inequality, [index[v] for v in cycle]) for face_inequality, cycle in faces],
+        )
+
+
+def _order_around(vertices: np.ndarray, indexes: List[int], normal: np.ndarray) -> List[int]:
+    """Return the indexes of the vertices of a face, ordered counterclockwise around its normal."""
+    points = vertices[indexes]
+    center = points.mean(axis=0)
+
+    u = points[0] - center
+    u /= np.linalg.norm(u)
+    w = np.cross(normal / np.linalg.norm(normal), u)
+
+    angles = np.arctan2((points - center) @ w, (points - center) @ u)
+
+    return [indexes[i] for i in np.argsort(angles)]
+
+
+# the polytopes of the sorted tuples of their inequalities
+_cache: Dict[Tuple[Inequality, ...], Polytope] = {}
+
+
+def get_polytope(inequalities: Sequence[Inequality]) -> Polytope:
+    """Return the polytope of the inequalities, cutting a cached one if it lacks only one of them."""
+    inequalities = [tuple(float(x) for x in inequality) for inequality in inequalities]
+    key = tuple(sorted(inequalities))
+
+    if key not in _cache:
+        for i in range(len(key)):
+            previous = key[:i] + key[i + 1:]
+
+            if previous in _cache:
+                _cache[key] = _cache[previous].cut(key[i])
+                break
+        else:
+            _cache[key] = Polytope.from_inequalities(key)
+
+    return _cache[key]
+
+
+if __name__ == "__main__":
+    import time
+
+    from scipy.spatial import ConvexHull, HalfspaceIntersection
+
+    rng = np.random.default_rng(0)
+
+    def random_inequalities(n):
+        """Tangent planes of random points around the unit sphere, inside a box."""
+        normals = rng.normal(size=(n, 3))
+        normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+
+        box = [(1, 0, 0, 2), (-1, 0, 0, 2), (0, 1, 0, 2), (0, -1, 0, 2), (0, 0, 1, 2), (0, 0, -1, 2)]
+        return box + [(*normal, rng.uniform(0.8, 1.2)) for normal in normals]
+
+    for trial in range(200):
+        inequalities = random_inequalities(int(rng.integers(1, 30)))
+
+        fresh = Polytope.from_inequalities(inequalities)
+        incremental = Polytope.from_inequalities(inequalities[:6])
+        for inequality in inequalities[6:]:
+            incremental = incremental.cut(inequality)
+
+        # qhull merges nearly coplanar facets, so only the volumes are compared with it
+        halfspaces = np.array(inequalities) * [1, 1, 1, -1]
+        expected = ConvexHull(HalfspaceIntersection(halfspaces, np.zeros(3)).intersections).volume
+        assert np.isclose(ConvexHull(fresh.vertices).volume, expected)
+
+        for polytope in (fresh, incremental):
+            assert len(polytope.vertices) == len(fresh.vertices)
+            assert np.allclose(np.sort(polytope.vertices, axis=0), np.sort(fresh.vertices, axis=0))
+
+            # euler's formula (the faces are the facets, so this checks they are all there)
+            assert len(polytope.vertices) - len(polytope.edges) + len(polytope.faces) == 2
+
+    # the degenerate ones (four planes meeting in the apex of a pyramid, repeated planes, a thin slab)
+    pyramid = [(0, 0, -1, 0), (1, 0, 1, 1), (-1, 0, 1, 1), (0, 1, 1, 1), (0, -1, 1, 1), (0, 0, -1, 0)]
+    polytope = get_polytope(pyramid)
+    assert (len(polytope.vertices), len(polytope.edges), len(polytope.faces)) == (5, 8, 5)
+
+    slab = [(1, 0, 0, 1), (-1, 0, 0, 1), (0, 1, 0, 1), (0, -1, 0, 1), (0, 0, 1, 0.0035), (0, 0, -1, 0.0035)]
+    polytope = get_polytope(slab)
+    assert (len(polytope.vertices), len(polytope.edges), len(polytope.faces)) == (8, 12, 6)
+
+    inequalities = random_inequalities(40)
+    start = time.perf_counter()
+    polytope = Polytope.from_inequalities(inequalities)
+    print(f"{len(inequalities)} inequalities: {len(polytope.vertices)} vertices, {len(polytope.edges)} edges, "
+          f"{len(polytope.faces)} faces in {time.perf_counter() - start:.4f}s")
+
+    start = time.perf_counter()
+    get_polytope(inequalities[:-1])
+    get_polytope(inequalities)
+    print(f"adding an inequality to a cached polytope: {time.perf_counter() - start:.4f}s")
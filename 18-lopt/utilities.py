@@ -1,5 +1,4 @@
 import numpy as np
-from shapely import geometry
 from manim.mobject.opengl.opengl_compatibility import ConvertToOpenGL
 from manim import *
 from typing import List, Tuple
@@ -10,6 +9,9 @@ from pulp import *
 
 import networkx as nx
 
+from halfplanes import intersect_half_planes
+from polytope import get_polytope
+
 LINE_STROKE = 7
 
 BIG_OPACITY = 0.2
@@ -254,24 +256,25 @@ class AffineLine2D(VMobject):
         crop_line_to_screen(self.line, *args, **kwargs)
 
     def get_area_border_intersection(self, area):
-        possible_points = []
+        start, end = self.line.get_start()[:2], self.line.get_end()[:2]
+        normal = np.array([start[1] - end[1], end[0] - start[0]])
 
-        for i in range(len(area.inequalities)):
-            point = intersection(
-                line(area.inequalities[i].line.get_start(), area.inequalities[i].line.get_end()),
-                line(self.line.get_start(), self.line.get_end()),
-            )
+        dots = VGroup()
 
-            if point:
-                possible_points.append(point)
+        if len(area.inequalities) == 0:
+            return dots
 
-        dots = VGroup()
+        coefficients = np.array([iq.get_coefficients() for iq in area.inequalities])
 
-        for point in possible_points:
-            for inequality in area.inequalities:
-                if not inequality.satisfies(*point, epsilon=0.01):
-                    break
-            else:
+        # the intersections with each of the (non-parallel) borders, solved all at once
+        matrices = np.stack([np.broadcast_to(normal, (len(coefficients), 2)), coefficients[:, :2]], axis=1)
+        regular = np.abs(np.linalg.det(matrices)) > 1e-9
+
+        rhs = np.stack([np.full(len(coefficients), normal @ start), coefficients[:, 2]], axis=1)
+        points = np.linalg.solve(matrices[regular], rhs[regular][..., np.newaxis])[..., 0]
+
+        for point in points:
+            if np.all(coefficients[:, :2] @ point <= coefficients[:, 2] + 0.01):
                 dots.add(Dot().move_to([*point, 0]).set_z_index(10000).scale(OPTIMUM_DOT_SCALE))
 
         return dots
@@ -337,11 +340,23 @@ class Inequality2D(VMobject):
         else:
             return lambda x, y: self.a * x + self.b * y >= self.c - epsilon
 
+    def get_coefficients(self) -> Tuple[float, float, float]:
+        """Return the (a, b, c) of the inequality as a*x + b*y <= c, where it currently is on the
+        screen (i.e. from its line, with the normal of length 1)."""
+        start, end = self.line.get_start()[:2], self.line.get_end()[:2]
+
+        normal = unit_vector(np.array([start[1] - end[1], end[0] - start[0]]))
+
+        # pointing out of the satisfying side, like (a, b) for <= (which is the side it's on)
+        if (np.dot(normal, (self.a, self.b)) < 0) == (self.operation == "<="):
+            normal = -normal
+
+        return (normal[0], normal[1], np.dot(normal, start))
+
     def satisfies(self, x, y, epsilon=0):
-        """Return True if the point satisfies the inequality."""
-        plane = self.get_half_plane()
-        polygon = geometry.Polygon(plane.get_anchors()).buffer(epsilon)
-        return polygon.contains(geometry.Point(x, y))
+        """Return True if the point satisfies the inequality (or is at most epsilon away from it)."""
+        a, b, c = self.get_coefficients()
+        return a * x + b * y <= c + epsilon
 
     def get_half_plane(self):
         half_plane = get_infinite_square()
@@ -413,41 +428,31 @@ class FeasibleArea2D(VMobject):
         self._update_area()
 
     def _update_area(self):
-        new_area = get_infinite_square()
-
-        for inequality in self.inequalities:
-            new_area = Intersection(new_area, inequality.get_half_plane(),
-                color = new_area.get_color(),
-                fill_opacity = new_area.get_fill_opacity(),
-                stroke_width = new_area.get_stroke_width(),
-                stroke_color = new_area.get_stroke_color(),
-                z_index=self.get_z_index(),
-            )
+        coefficients = [iq.get_coefficients() for iq in self.inequalities]
 
-        self.area.become(new_area).set_z_index(self.get_z_index())
+        vertices, pairs = intersect_half_planes([c[:2] for c in coefficients], [c[2] for c in coefficients])
 
-        possible_points = []
-
-        for i in range(len(self.inequalities)):
-            for j in range(i + 1, len(self.inequalities)):
-                point = intersection(
-                    line(self.inequalities[i].line.get_start(), self.inequalities[i].line.get_end()),
-                    line(self.inequalities[j].line.get_start(), self.inequalities[j].line.get_end()),
-                )
+        if len(vertices) != 0:
+            new_area = Polygon(*[(x, y, 0) for x, y in vertices])
+        else:
+            new_area = VMobject()
 
-                if point:
-                    possible_points.append(point)
+        # styled like the area that it replaces (the infinite square at first)
+        new_area.match_style(self.area)
 
-        new_dots = VGroup()
+        self.area.become(new_area).set_z_index(self.get_z_index())
 
-        for point in possible_points:
-            for inequality in self.inequalities:
-                if not inequality.satisfies(*point, epsilon=0.01):
-                    break
-            else:
-                new_dots.add(Dot().move_to([*point, 0]).scale(NORMAL_DOT_SCALE))
+        # the dots are on the vertices of two inequalities (not on the borders of the square)
+        points = [[x, y, 0] for (x, y), (i, j) in zip(vertices, pairs)
+                  if i < len(self.inequalities) and j < len(self.inequalities)]
 
-        self.dots.become(new_dots).set_z_index(self.dots_z_index)
+        # moving the dots is much cheaper than creating new ones each frame
+        if len(points) == len(self.dots):
+            for dot, point in zip(self.dots, points):
+                dot.move_to(point)
+        else:
+            new_dots = VGroup(*[Dot().move_to(point).scale(NORMAL_DOT_SCALE) for point in points])
+            self.dots.become(new_dots).set_z_index(self.dots_z_index)
 
 
 class Inequality3D:
@@ -463,7 +468,7 @@ class Inequality3D:
         if self.operation == "<=":
             return lambda x, y, z: self.a * x + self.b * y + self.c * z <= self.d + epsilon
         else:
-            return lambda x, y, z: self.a * x + self.b * y + self.c >= self.d - epsilon
+            return lambda x, y, z: self.a * x + self.b * y + self.c * z >= self.d - epsilon
 
     def satisfies(self, x, y, z, epsilon=0.005):
         """Return True if the point satisfies the inequality."""
@@ -473,21 +478,12 @@ class Inequality3D:
         return self._get_function(epsilon=+epsilon)(x, y, z) \
                 and not self._get_function(epsilon=-epsilon)(x, y, z)
 
-def fibonacci_sphere(samples=5000):
-    # https://stackoverflow.com/questions/9600801/evenly-distributing-n-points-on-a-sphere
-    phi = math.pi * (math.sqrt(5.) - 1.)  # golden angle in radians
-
-    for i in range(samples):
-        y = 1 - (i / float(samples - 1)) * 2  # y goes from 1 to -1
-        radius = math.sqrt(1 - y * y)  # radius at y
-
-        theta = phi * i  # golden angle increment
-
-        x = math.cos(theta) * radius
-        z = math.sin(theta) * radius
-
-        yield np.array((x, y, z))
-
+    def get_coefficients(self) -> Tuple[float, float, float, float]:
+        """Return the (a, b, c, d) of the inequality as a*x + b*y + c*z <= d."""
+        if self.operation == "<=":
+            return (self.a, self.b, self.c, self.d)
+        else:
+            return (-self.a, -self.b, -self.c, -self.d)
 
 class Addd(Animation):
 
@@ -514,14 +510,10 @@ class Addd(Animation):
 
 
 class FeasibleArea3D(VGroup, metaclass=ConvertToOpenGL):
-    """Yeah no this implementation is an act of terrorism holy shit.
-
-    As an explanation: I was way too lazy to create a general class, so this assumes
-    that the polytope is bounded, at which point it creates many vectors, solves the
-    problem in each direction via pulp and records the distinct vertices.
+    """The feasible area of 3D inequalities, assuming that it's bounded.
 
-    For what I'm doing, I think this is fine.
-    """
+    The vertices and edges are calculated exactly by polytope.py (which caches them, so
+    adding an inequality to an area that was already calculated only cuts it)."""
 
     def __init__(self, test=False, **kwargs):
         super().__init__(**kwargs)
@@ -571,62 +563,21 @@ class FeasibleArea3D(VGroup, metaclass=ConvertToOpenGL):
             vertices = []
             edges = []
 
-        if vertices:
-            for vertex in vertices:
-                self.dots.add(Dot3D(resolution=dot_res).shift(vertex + shift).scale(NORMAL_DOT_SCALE))
-        else:
-            vertices = set()
-
-            for of in fibonacci_sphere(5000 if not self.test else 100):
-                model = LpProblem(sense=LpMaximize)
+        if not vertices or not edges:
+            polytope = get_polytope([iq.get_coefficients() for iq in self.inequalities])
+            points = [tuple(vertex) for vertex in polytope.vertices]
 
-                x = LpVariable(name="x")
-                y = LpVariable(name="y")
-                z = LpVariable(name="z")
+            vertices = vertices or points
+            edges = edges or [(points[u], points[v]) for u, v in polytope.edges]
 
-                for iq in self.inequalities:
-                    if iq.operation == "<=":
-                        model += iq.a * x + iq.b * y + iq.c * z <= iq.d
-                    else:
-                        model += iq.a * x + iq.b * y + iq.c * z >= iq.d
-
-                model += of[0] * x + of[1] * y + of[2] * z
-
-                try:
-                    status = model.solve(PULP_CBC_CMD(msg=False))
-
-                    if x.value() is not None and y.value() is not None and z.value() is not None:
-                        vertices.add((x.value(), y.value(), z.value()))
-
-                except Exception as e:
-                    print(e)
-
-            vertices = list(vertices)
-
-            for i, vertex in enumerate(vertices):
-                self.dots.add(Dot3D(resolution=dot_res).shift(vertex + shift).scale(NORMAL_DOT_SCALE))
+        for vertex in vertices:
+            self.dots.add(Dot3D(resolution=dot_res).shift(vertex + shift).scale(NORMAL_DOT_SCALE))
 
         if self.test:
             return
 
-        if edges:
-            for u, v in edges:
-                self.edges.add(Line3D(u, v, color=WHITE, resolution=line_res).shift(shift))
-        else:
-            for i in range(len(vertices)):
-                for j in range(i + 1, len(vertices)):
-                    u = vertices[i]
-                    v = vertices[j]
-
-                    # if two vertices satisfy two inequalities tightly, it's an edge
-                    tight_satisfactions = 0
-
-                    for iq in self.inequalities:
-                        if iq.tight(*u) and iq.tight(*v):
-                            tight_satisfactions += 1
-
-                    if tight_satisfactions >= 2:
-                        self.edges.add(Line3D(u, v, color=WHITE, resolution=line_res).shift(shift))
+        for u, v in edges:
+            self.edges.add(Line3D(u, v, color=WHITE, resolution=line_res).shift(shift))
 
 
 def align_object_by_coords(obj, current, desired, animation=False):
@@ -0,0 +1,178 @@
+"""Mazes as NumPy arrays and their traversal orders (independent of Manim).
+
+The maze is a boolean array of its walls, padded by a border of walls, so that the cells can be
+referred to by their flat indexes and the neighbours of a cell are just the index plus a constant
+offset (without any bounds checks). The traversals work on the flat indexes with a deque (a plain
+list as the stack for DFS) and a boolean array of the discovered cells.
+"""
+from collections import deque
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+WALL = "#"
+
+# the order in which the neighbours of a cell are discovered
+DIRECTIONS = [(0, 1), (1, 0), (-1, 0), (0, -1)]
+
+Position = Tuple[int, int]
+
+
+class Maze:
+    def __init__(self, contents: Sequence[str]):
+        self.contents = list(contents)
+
+        self.height = len(self.contents)
+        self.width = len(self.contents[0])
+
+        # the walls of the padded maze, and the offsets of the neighbours in it
+        self.walls = np.ones((self.height + 2, self.width + 2), dtype=bool)
+        self.walls[1:-1, 1:-1] = np.array([[c == WALL for c in row] for row in self.contents])
+
+        self.offsets = [dy * (self.width + 2) + dx for dx, dy in DIRECTIONS]
+
+    @classmethod
+    def from_file(cls, path: str) -> "Maze":
+        with open(path) as f:
+            return cls(f.read().splitlines())
+
+    def get_index(self, position: Position) -> int:
+        x, y = position
+        return (y + 1) * (self.width + 2) + (x + 1)
+
+    def get_positions(self, indexes: np.ndarray) -> List[Position]:
+        """Return the (x, y) positions of the flat indexes."""
+        ys, xs = np.divmod(np.asarray(indexes), self.width + 2)
+        return list(zip((xs - 1).tolist(), (ys - 1).tolist()))
+
+    def _traverse(self, start: Position, depth_first: bool) -> np.ndarray:
+        """Return the flat indexes of the cells in the order of their discovery."""
+        walls = self.walls.ravel()
+        discovered = walls.copy()
+
+        first = self.get_index(start)
+        discovered[first] = True
+
+        order = [first]
+        pending = [first] if depth_first else deque([first])
+        take = pending.pop if depth_first else pending.popleft
+
+        while len(pending) != 0:
+            current = take()
+
+            for offset in self.offsets:
+                neighbour = current + offset
+
+                if not discovered[neighbour]:
+                    discovered[neighbour] = True
+                    order.append(neighbour)
+                    pending.append(neighbour)
+
+        return np.array(order)
+
+    def get_bfs_order(self, start: Position) -> np.ndarray:
+        return self._traverse(start, depth_first=False)
+
+    def get_dfs_order(self, start: Position) -> np.ndarray:
+        """The order of discovery with a stack (the cells being discovered when they are pushed)."""
+        return self._traverse(start, depth_first=True)
+
+    def get_ranks(self, order: np.ndarray) -> np.ndarray:
+        """Return the (height, width) array of the positions of the cells in the order (-1 for the
+        ones that aren't in it)."""
+        ranks = np.full(self.walls.size, -1)
+        ranks[order] = np.arange(len(order))
+
+        return ranks.reshape(self.walls.shape)[1:-1, 1:-1]
+
+    def get_distances(self, start: Position) -> np.ndarray:
+        """Return the (height, width) array of the distances of the cells from the start (-1 for the
+        unreachable ones), expanding the whole frontier at once."""
+        distances = np.full(self.walls.shape, -1)
+        frontier = np.zeros(self.walls.shape, dtype=bool)
+
+        x, y = start
+        frontier[y + 1, x + 1] = True
+
+        distance = 0
+        while frontier.any():
+            distances[frontier] = distance
+            distance += 1
+
+            # the neighbours of the frontier that are neither walls nor reached yet (the padding
+            # keeps the frontier away from the edges of the array)
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+
+            frontier = grown & ~self.walls & (distances == -1)
+
+        return distances[1:-1, 1:-1]
+
+
+if __name__ == "__main__":
+    import time
+
+    from random import random, seed
+
+    def naive_order(contents, start, depth_first):
+        """The traversal of the original scene (without the bounds, as the mask has a border)."""
+        queue = [start]
+        discovered = {start}
+        order = [start]
+
+        while len(queue) != 0:
+            x, y = queue.pop() if depth_first else queue.pop(0)
+
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+
+                if (nx, ny) in discovered or not (0 <= nx < len(contents[0]) and 0 <= ny < len(contents)):
+                    continue
+
+                if contents[ny][nx] == WALL:
+                    continue
+
+                order.append((nx, ny))
+                queue.append((nx, ny))
+                discovered.add((nx, ny))
+
+        return order
+
+    seed(0)
+
+    for trial in range(200):
+        width, height = 1 + trial % 17, 1 + trial % 13
+        contents = ["".join(WALL if random() < 0.35 else " " for _ in range(width)) for _ in range(height)]
+
+        start = (width // 2, height // 2)
+        contents[start[1]] = contents[start[1]][:start[0]] + " " + contents[start[1]][start[0] + 1:]
+
+        maze = Maze(contents)
+
+        for depth_first in (False, True):
+            expected = naive_order(contents, start, depth_first)
+            order = maze.get_dfs_order(start) if depth_first else maze.get_bfs_order(start)
+
+            assert maze.get_positions(order) == expected
+
+            ranks = maze.get_ranks(order)
+            assert all(ranks[y, x] == i for i, (x, y) in enumerate(expected))
+            assert (ranks >= 0).sum() == len(expected)
+
+        # the distances are the layers of BFS
+        distances = maze.get_distances(start)
+        bfs = maze.get_positions(maze.get_bfs_order(start))
+        assert list(distances[[y for _, y in bfs], [x for x, _ in bfs]]) == sorted(distances[distances >= 0])
+
+    maze = Maze.from_file("maze/mask.txt")
+    start = (maze.width // 2, maze.height // 2 - 1)
+
+    for name, f in [("BFS", maze.get_bfs_order), ("DFS", maze.get_dfs_order), ("distances", maze.get_distances)]:
+        begin = time.perf_counter()
+        for _ in range(100):
+            f(start)
+
+        print(f"{name}: {(time.perf_counter() - begin) * 10:.3f}ms")
@@ -1,5 +1,6 @@
 from manim import *
 from utilities import *
+from maze import Maze
 
 from random import uniform, seed, randint
 from math import sin
@@ -10,87 +11,28 @@ class Intro(MovingCameraScene):
     def construct(self):
         self.camera.background_color = BLACK
 
-        with open("maze/mask.txt") as f:
-            contents = f.read().splitlines()
+        grid = Maze.from_file("maze/mask.txt")
 
-        dfs_order = {}
-        bfs_order = {}
-        dfs_order_inverse = {}
-        bfs_order_inverse = {}
-
-        diff_order = {}
-
-        def get_dfs_order(start):
-            queue = [start]
-            discovered = set(queue)
-            dfs_order[0] = start
-            dfs_order_inverse[start] = 0
-            i = 1
-
-            while len(queue) != 0:
-                x, y = queue.pop()
-
-                for dx, dy in [(0, 1), (1, 0), (-1, 0), (0, -1)]:
-                    nx, ny = x + dx, y + dy
-
-                    if (nx, ny) in discovered:
-                        continue
-
-                    if contents[ny][nx] == "#":
-                        continue
-
-                    dfs_order[i] = (nx, ny)
-                    dfs_order_inverse[(nx, ny)] = i
-                    queue.append((nx, ny))
-                    discovered.add((nx, ny))
-                    i += 1
-
-            return i
-
-        def get_bfs_order(start):
-            queue = [start]
-            discovered = set(queue)
-            bfs_order[0] = start
-            bfs_order_inverse[start] = 0
-            i = 1
-
-            while len(queue) != 0:
-                x, y = queue.pop(0)
-
-                for dx, dy in [(0, 1), (1, 0), (-1, 0), (0, -1)]:
-                    nx, ny = x + dx, y + dy
-
-                    if (nx, ny) in discovered:
-                        continue
-
-                    if contents[ny][nx] == "#":
-                        continue
-
-                    bfs_order[i] = (nx, ny)
-                    bfs_order_inverse[(nx, ny)] = i
-                    queue.append((nx, ny))
-                    discovered.add((nx, ny))
-                    i += 1
-
-            return i
-
-        maze, maze_dict = maze_to_vgroup(contents)
+        maze, maze_dict, walls = maze_to_mobjects(grid)
         maze.rotate(-PI / 2)
 
-        width = len(contents[0])
-        height = len(contents)
+        width = grid.width
+        height = grid.height
 
         start = (width // 2, height // 2 - 1)
 
-        number_of_tiles = get_bfs_order(start)
-        number_of_tiles = get_dfs_order(start)
+        bfs_indexes, dfs_indexes = grid.get_bfs_order(start), grid.get_dfs_order(start)
 
-        colors = color_gradient((GREEN, RED), number_of_tiles)
+        bfs_order = grid.get_positions(bfs_indexes)
+        dfs_order = grid.get_positions(dfs_indexes)
+
+        number_of_tiles = len(bfs_order)
 
-        diff_order = {}
+        colors = color_gradient((GREEN, RED), number_of_tiles)
 
-        for i in dfs_order_inverse:
-            diff_order[i] = (dfs_order_inverse[i] - bfs_order_inverse[i]) / number_of_tiles
+        # how much later DFS reaches each of the tiles than BFS
+        differences = (grid.get_ranks(dfs_indexes) - grid.get_ranks(bfs_indexes)) / number_of_tiles
+        diff_order = {(x, y): differences[y, x] for x, y in bfs_order}
 
         self.camera.frame.set_width(maze.get_width() * 1.2).move_to(maze)
 
@@ -105,10 +47,11 @@ class Intro(MovingCameraScene):
             Succession(
                 Wait(2/3),
                 AnimationGroup(
+                    FadeIn(walls),
                     *[
                         FadeIn(maze_dict[x])
                         for x in maze_dict
-                        if x not in bfs_order.values()
+                        if x not in diff_order
                     ]
                 )
             )
@@ -160,18 +103,12 @@ class Intro(MovingCameraScene):
         )
 
         # tehehe
-        for x in range(width):
-            for y in range(height):
-                if contents[y][x] == "#":
-                    maze_dict[(x, y)].set_opacity(0)
+        walls.set_opacity(0)
 
         maze.save_state()
 
         # tehehe
-        for x in range(width):
-            for y in range(height):
-                if contents[y][x] == "#":
-                    maze_dict[(x, y)].set_opacity(1)
+        walls.set_opacity(1)
 
         # reset to DFS
         self.play(
@@ -196,34 +133,21 @@ class Intro(MovingCameraScene):
         )
 
         # tehehe
-        for x in range(width):
-            for y in range(height):
-                if contents[y][x] == "#":
-                    maze_dict[(x, y)].set_opacity(0)
+        walls.set_opacity(0)
 
         mc = maze.copy()
 
         # tehehe
-        for x in range(width):
-            for y in range(height):
-                if contents[y][x] == "#":
-                    maze_dict[(x, y)].set_opacity(1)
+        walls.set_opacity(1)
 
         # reset both
         self.play(
             bfs.animate.shift(offset).set_opacity(1).scale(title_s),
             dfs.animate.shift(offset),
+            walls.animate(run_time=1).set_opacity(0),
             *[
-                maze_dict[(x, y)].animate(run_time=1).set_opacity(0)
-                for x in range(width)
-                for y in range(height)
-                if contents[y][x] == "#"
-            ],
-            *[
-                maze_dict[(x, y)].animate(run_time=1).set_fill_color(DARKER_GRAY)
-                for x in range(width)
-                for y in range(height)
-                if contents[y][x] != "#"
+                maze_dict[cell].animate(run_time=1).set_fill_color(DARKER_GRAY)
+                for cell in maze_dict
             ]
         )
 
@@ -17,27 +17,58 @@ def fade(f):
 
     return inner
 
-def maze_to_vgroup(contents):
-    maze = VGroup()
+def get_cell_position(position, width, height):
+    x, y = position
+    return (y + 0.5) * DOWN + (x + 0.5) * RIGHT + height / 2 * UP + width / 2 * LEFT
+
+
+def cells_to_vmobject(positions, width, height, **kwargs):
+    """One VMobject with a square subpath for each of the cells (instead of a mobject per cell)."""
+    positions = np.array(positions, dtype=float).reshape(-1, 2)
+
+    # the top left corners of the cells
+    corners = np.zeros((len(positions), 3))
+    corners[:, 0] = positions[:, 0] - width / 2
+    corners[:, 1] = height / 2 - positions[:, 1]
+
+    # the sides of a square as cubic curves (straight, so the handles are thirds of the way)
+    square = np.array([UP * 0, RIGHT, RIGHT + DOWN, DOWN, UP * 0])
+    t = np.array([0, 1 / 3, 2 / 3, 1])[:, None]
+    sides = np.array([a + t * (b - a) for a, b in zip(square, square[1:])])
+
+    vmobject = VMobject(**kwargs)
+    vmobject.set_points((corners[:, None, None, :] + sides[None]).reshape(-1, 3))
+
+    return vmobject
+
+
+def maze_to_mobjects(maze):
+    """Return the maze (a VGroup), the dict of the mobjects of its open cells (which are animated
+    separately) and a single mobject with all of the walls."""
+    group = VGroup()
     maze_dict = {}
 
-    for y, row in enumerate(contents):
-        i = 0
+    walls = []
+    for y, row in enumerate(maze.contents):
         for x, symbol in enumerate(row):
             if symbol == "#":
-                r = Rectangle(width=1.0, height=1.0, fill_opacity=1, fill_color=WHITE)
-                r.set_z_index(10000)
+                walls.append((x, y))
+                continue
             elif symbol == ".":
                 continue
-            else:
-                r = Rectangle(width=1.0, height=1.0)
-                r.set_z_index(0.1)
 
-            r.move_to((y + 0.5) * DOWN + (x + 0.5) * RIGHT + len(contents) / 2 * UP + len(contents[0]) / 2 * LEFT)
-            maze.add(r)
+            r = Rectangle(width=1.0, height=1.0)
+            r.set_z_index(0.1)
+
+            r.move_to(get_cell_position((x, y), maze.width, maze.height))
+            group.add(r)
             maze_dict[(x, y)] = r
 
-    return maze, maze_dict
+    walls = cells_to_vmobject(walls, maze.width, maze.height, fill_opacity=1, fill_color=WHITE, stroke_color=WHITE)
+    walls.set_z_index(10000)
+    group.add(walls)
+
+    return group, maze_dict, walls
 
 class MoveAndFadeThereBack(Animation):
 
@@ -0,0 +1,206 @@
+#!/bin/python3
+
+"""Compact graph primitives shared by the graph algorithms of the videos.
+
+Scanning the whole edge list for the neighbours of each vertex makes even a BFS O(V * E), so the
+algorithms build a CompactGraph (a CSR-style adjacency: the neighbours of all of the vertices in
+one array, with the offsets of each vertex in another) once and then get the neighbours of a
+vertex in time proportional to its degree.
+
+Running this module benchmarks the primitives against the edge list scans they replaced.
+"""
+from array import array
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+Vertex = Hashable
+Edge = Tuple[Vertex, Vertex]
+
+
+class CompactGraph:
+    """An immutable undirected graph with CSR-style adjacency arrays.
+
+    The vertices are numbered 0..n-1 in the order they were given in; the arrays use the numbers,
+    while neighbours() and the other label-based methods translate them back and forth."""
+
+    def __init__(self, vertices: Iterable[Vertex], edges: Iterable[Edge]):
+        self.vertices = list(vertices)
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+
+        n = len(self.vertices)
+        edges = [(self.index[u], self.index[v]) for u, v in edges]
+
+        degrees = [0] * (n + 1)
+        for u, v in edges:
+            degrees[u + 1] += 1
+            if u != v:
+                degrees[v + 1] += 1
+
+        # offsets[i]:offsets[i + 1] is the slice of the targets that are the neighbours of i
+        self.offsets = array("l", degrees)
+        for i in range(n):
+            self.offsets[i + 1] += self.offsets[i]
+
+        self.targets = array("l", bytes(self.offsets[n] * self.offsets.itemsize))
+
+        position = list(self.offsets[:n])
+        for u, v in edges:
+            self.targets[position[u]] = v
+            position[u] += 1
+
+            if u != v:
+                self.targets[position[v]] = u
+                position[v] += 1
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    def adjacent(self, i: int) -> array:
+        """Return the numbers of the neighbours of the vertex number i (with repetitions for parallel edges)."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbours(self, v: Vertex) -> List[Vertex]:
+        """Return the (distinct) neighbours of the vertex v."""
+        return [self.vertices[i] for i in dict.fromkeys(self.adjacent(self.index[v]))]
+
+    def degree(self, v: Vertex) -> int:
+        i = self.index[v]
+        return self.offsets[i + 1] - self.offsets[i]
+
+
+class UnionFind:
+    """A union-find (by rank, without path compression, so unions can be undone in the reverse order)."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.history = []
+
+        # the number of the components
+        self.count = n
+
+    def find(self, v: int) -> int:
+        while self.parent[v] != v:
+            v = self.parent[v]
+        return v
+
+    def union(self, u: int, v: int) -> bool:
+        """Join the components of u and v, returning False if they already were the same one."""
+        u, v = self.find(u), self.find(v)
+
+        if u == v:
+            return False
+
+        if self.rank[u] < self.rank[v]:
+            u, v = v, u
+
+        self.parent[v] = u
+        self.history.append((v, self.rank[u]))
+        self.rank[u] = max(self.rank[u], self.rank[v] + 1)
+        self.count -= 1
+
+        return True
+
+    def undo(self):
+        """Undo the last successful union."""
+        v, rank = self.history.pop()
+        u = self.parent[v]
+
+        self.parent[v] = v
+        self.rank[u] = rank
+        self.count += 1
+
+
+def bfs(graph: CompactGraph, sources: Iterable[Vertex]) -> Dict[Vertex, Vertex]:
+    """Run a BFS from the sources, returning the parent of each reached vertex (a source being its own)."""
+    parent = [-1] * len(graph)
+
+    queue = deque()
+    for v in sources:
+        i = graph.index[v]
+        parent[i] = i
+        queue.append(i)
+
+    while queue:
+        i = queue.popleft()
+
+        for j in graph.adjacent(i):
+            if parent[j] == -1:
+                parent[j] = i
+                queue.append(j)
+
+    return {graph.vertices[i]: graph.vertices[p] for i, p in enumerate(parent) if p != -1}
+
+
+def count_components(vertices: Sequence[Vertex], edges: Iterable[Edge]) -> int:
+    """Return the number of the connected components of the graph."""
+    index = {v: i for i, v in enumerate(vertices)}
+
+    components = UnionFind(len(index))
+    for u, v in edges:
+        components.union(index[u], index[v])
+
+    return components.count
+
+
+if __name__ == "__main__":
+    import time
+    import networkx as nx
+
+    def scan_neighbours(v, E):
+        """The neighbours of v, scanning the edge list (as the solvers used to)."""
+        return list(set([a for a, b in E if b == v]).union(set([b for a, b in E if a == v])))
+
+    def scan_components(V, E):
+        """The number of components using list-queue BFS with edge list scans (as the solvers used to)."""
+        total = 0
+        explored = set()
+        for v in V:
+            if v in explored:
+                continue
+
+            queue = [v]
+            explored.add(v)
+            total += 1
+            while len(queue) != 0:
+                v = queue.pop(0)
+
+                for w in scan_neighbours(v, E):
+                    if w not in explored:
+                        explored.add(w)
+                        queue.append(w)
+
+        return total
+
+    def measure(f, *args):
+        start = time.perf_counter()
+        result = f(*args)
+        return result, time.perf_counter() - start
+
+    def csr_components(V, E):
+        """The number of components using deque BFS on a CompactGraph."""
+        graph = CompactGraph(V, E)
+
+        total, explored = 0, {}
+        for v in V:
+            if v not in explored:
+                explored |= bfs(graph, [v])
+                total += 1
+
+        return total
+
+    print(f"{'n':>6} {'m':>6} | {'scan BFS':>9} {'CSR BFS':>9} {'union-find':>10}")
+
+    for n in [100, 200, 400, 800, 1600]:
+        g = nx.gnm_random_graph(n, 2 * n, seed=n)
+        vertices, edges = list(g.nodes), list(g.edges)
+
+        expected = nx.number_connected_components(g)
+
+        a, scan_time = measure(scan_components, vertices, edges)
+        b, csr_time = measure(csr_components, vertices, edges)
+        c, union_find_time = measure(count_components, vertices, edges)
+
+        assert a == b == c == expected
+
+        print(f"{n:>6} {len(edges):>6} | {scan_time:>8.4f}s {csr_time:>8.4f}s {union_find_time:>9.4f}s")
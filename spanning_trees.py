@@ -0,0 +1,204 @@
+#!/bin/python3
+
+"""Spanning trees of (small) graphs, used by the Cayley and the Tutte videos.
+
+The trees are enumerated by a deletion-contraction search (each edge is either added to the
+forest or thrown away, as long as the rest can still connect the graph), so the work done is
+polynomial in the number of the trees instead of trying all (n - 1)-subsets of the edges. Random
+trees are sampled uniformly by Wilson's algorithm and the trees are counted using Kirchhoff's
+matrix-tree theorem.
+
+Running this module checks the enumeration and the sampling against Kirchhoff's theorem.
+"""
+from random import choice
+from typing import Hashable, Iterator, List, Sequence, Tuple
+
+from graphs import UnionFind
+
+Vertex = Hashable
+Edge = Tuple[Vertex, Vertex]
+
+
+def _index(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> List[Tuple[int, int]]:
+    """Return the edges as pairs of indexes of the vertices."""
+    indexes = {v: i for i, v in enumerate(vertices)}
+    return [(indexes[u], indexes[v]) for u, v in edges]
+
+
+def _connects(n: int, edges: Sequence[Tuple[int, int]]) -> bool:
+    """Return True if the edges connect all of the n vertices."""
+    components = UnionFind(n)
+    for u, v in edges:
+        components.union(u, v)
+
+    return components.count == 1
+
+
+def yield_spanning_trees(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> Iterator[Tuple[Edge, ...]]:
+    """Yield all of the spanning trees of the graph as tuples of its edges.
+
+    The trees are yielded in the same (lexicographic) order as filtering
+    itertools.combinations(edges, n - 1) would yield them."""
+    vertices, edges = list(vertices), list(edges)
+    n = len(vertices)
+
+    indexed = _index(vertices, edges)
+
+    if n == 0 or not _connects(n, indexed):
+        return
+
+    forest = UnionFind(n)
+    tree = []
+
+    # invariant: the forest along with the edges from i on connects the graph, so each branch
+    # of the search ends with a spanning tree
+    def search(i: int) -> Iterator[Tuple[Edge, ...]]:
+        if len(tree) == n - 1:
+            yield tuple(edges[j] for j in tree)
+            return
+
+        u, v = indexed[i]
+
+        # contract (i.e. take) the edge, if it doesn't close a cycle
+        if forest.union(u, v):
+            tree.append(i)
+            yield from search(i + 1)
+            tree.pop()
+            forest.undo()
+
+        # delete the edge, if it isn't a bridge of the rest
+        if _connects(n, [indexed[j] for j in tree] + indexed[i + 1:]):
+            yield from search(i + 1)
+
+    yield from search(0)
+
+
+def count_spanning_trees(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> int:
+    """Return the number of spanning trees of the graph, using Kirchhoff's matrix-tree theorem.
+
+    The determinant of the reduced Laplacian is calculated exactly, using the fraction-free
+    (Bareiss) Gaussian elimination. Loops are ignored and parallel edges are counted."""
+    vertices = list(vertices)
+    n = len(vertices)
+
+    if n == 0:
+        return 0
+
+    laplacian = [[0] * n for _ in range(n)]
+    for u, v in _index(vertices, edges):
+        if u == v:
+            continue
+
+        laplacian[u][u] += 1
+        laplacian[v][v] += 1
+        laplacian[u][v] -= 1
+        laplacian[v][u] -= 1
+
+    # the first row and column are removed
+    matrix = [row[1:] for row in laplacian[1:]]
+    size = n - 1
+
+    sign, previous = 1, 1
+    for k in range(size):
+        if matrix[k][k] == 0:
+            pivot = next((i for i in range(k + 1, size) if matrix[i][k] != 0), None)
+
+            if pivot is None:
+                return 0
+
+            matrix[k], matrix[pivot] = matrix[pivot], matrix[k]
+            sign = -sign
+
+        for i in range(k + 1, size):
+            for j in range(k + 1, size):
+                matrix[i][j] = (matrix[i][j] * matrix[k][k] - matrix[i][k] * matrix[k][j]) // previous
+
+        previous = matrix[k][k]
+
+    return sign * matrix[size - 1][size - 1] if size != 0 else 1
+
+
+def get_random_spanning_tree(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> Tuple[Edge, ...]:
+    """Return a uniformly random spanning tree of the graph, using Wilson's algorithm.
+
+    The randomness comes from the random module, so seeding it makes the result deterministic."""
+    vertices, edges = list(vertices), list(edges)
+    n = len(vertices)
+
+    indexed = _index(vertices, edges)
+
+    if n == 0 or not _connects(n, indexed):
+        raise ValueError("The graph is not connected, so it has no spanning tree.")
+
+    # the edges incident with each vertex, so parallel edges are sampled correctly too
+    incident = [[] for _ in range(n)]
+    for i, (u, v) in enumerate(indexed):
+        if u != v:
+            incident[u].append((v, i))
+            incident[v].append((u, i))
+
+    in_tree = [False] * n
+    in_tree[0] = True
+
+    next_vertex = [None] * n
+    next_edge = [None] * n
+
+    for start in range(n):
+        # a random walk until the tree is hit, the loops being erased by overwriting the exits
+        v = start
+        while not in_tree[v]:
+            next_vertex[v], next_edge[v] = choice(incident[v])
+            v = next_vertex[v]
+
+        v = start
+        while not in_tree[v]:
+            in_tree[v] = True
+            v = next_vertex[v]
+
+    return tuple(edges[i] for i in sorted(next_edge[v] for v in range(1, n)))
+
+
+if __name__ == "__main__":
+    import networkx as nx
+    from collections import Counter
+    from itertools import combinations
+    from random import seed
+
+    seed(0)
+
+    def brute_force(vertices, edges):
+        return [
+            subset for subset in combinations(edges, len(vertices) - 1)
+            if _connects(len(vertices), _index(vertices, subset))
+        ]
+
+    graphs = [(f"K_{n}", nx.complete_graph(n)) for n in range(1, 8)]
+    graphs += [("Petersen", nx.petersen_graph()), ("Q_3", nx.hypercube_graph(3))]
+    graphs += [(f"G(9, 0.5) #{i}", nx.gnp_random_graph(9, 0.5, seed=i)) for i in range(10)]
+
+    for name, g in graphs:
+        vertices, edges = list(g.nodes), list(g.edges)
+
+        expected = count_spanning_trees(vertices, edges)
+        trees = list(yield_spanning_trees(vertices, edges))
+
+        assert len(trees) == expected, (name, len(trees), expected)
+        assert len(set(trees)) == len(trees), name
+
+        if len(edges) <= 20:
+            assert trees == brute_force(vertices, edges), name
+
+        print(f"{name}: {expected} spanning trees")
+
+    # Wilson's algorithm should hit each of the trees with the same probability
+    vertices, edges = list(range(5)), [(0, 1), (1, 2), (2, 3), (3, 0), (0, 2), (2, 4), (4, 3)]
+
+    trees = list(yield_spanning_trees(vertices, edges))
+    samples = 200 * len(trees)
+
+    counts = Counter(get_random_spanning_tree(vertices, edges) for _ in range(samples))
+
+    assert set(counts) == set(trees)
+
+    chi_squared = sum((c - samples / len(trees)) ** 2 / (samples / len(trees)) for c in counts.values())
+    print(f"Wilson: {len(trees)} trees, chi-squared {chi_squared:.2f} ({len(trees) - 1} degrees of freedom)")
@@ -0,0 +1,317 @@
+#!/bin/python3
+
+"""A persistent, project-level cache of compiled Tex/MathTex SVGs, shared by all videos.
+
+Manim only caches the compiled SVGs in the media/ folder of each video (which the build script
+happily deletes), so this module replaces Manim's tex_to_svg_file with a version that first looks
+into a cache keyed by the full TeX code of the expression (i.e. the string, the environment and
+the template) and the compiler. The least recently used entries are evicted when the cache grows
+over its size limit.
+
+Usage (from the folder of a video):
+    python3 ../tex_cache.py stats            # show hit/miss statistics and the size of the cache
+    python3 ../tex_cache.py evict [-m MB]    # evict the least recently used entries
+    python3 ../tex_cache.py warm scenes.py   # precompile all literal Tex/MathTex strings of a module
+    python3 ../tex_cache.py manim ...        # run Manim with the cache installed (used by build)
+
+Warming only covers the calls whose arguments are literal strings: the ones built at runtime (like
+Tex(f"${number}$") or Tex("$$" + str(state) + "$$")) can't be known without running the scenes,
+so they are compiled (and cached for the next builds) by the first render that uses them.
+"""
+import os
+import sys
+import ast
+import time
+import atexit
+import shutil
+import hashlib
+import argparse
+import tempfile
+
+
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), ".tex-cache")
+STATS_PATH = os.path.join(CACHE_DIRECTORY, "stats.txt")
+
+# the size (in bytes) that the cache is evicted to when a process using it exits
+MAX_SIZE = 1024 * 1024 * 1024
+
+# how old (in seconds) the temporary files and the working directories have to be to be considered
+# left over by a crashed process (the working directories live for as long as their process)
+STALE_TEMPORARY_AGE = 60 * 60
+STALE_WORK_DIRECTORY_AGE = 7 * 24 * 60 * 60
+
+# the classes whose constant arguments are precompiled by warm()
+TEX_CLASSES = {"Tex", "MathTex", "SingleStringMathTex"}
+
+stats = {"hits": 0, "misses": 0}
+
+_work_directory = None
+
+
+def get_key(expression: str, environment: str | None, tex_template) -> str:
+    """Return the cache key of the expression, which is the hash of the TeX code that Manim would compile."""
+    if environment is not None:
+        code = tex_template.get_texcode_for_expression_in_env(expression, environment)
+    else:
+        code = tex_template.get_texcode_for_expression(expression)
+
+    return hashlib.sha256(
+        f"{tex_template.tex_compiler}\n{tex_template.output_format}\n{code}".encode()
+    ).hexdigest()
+
+
+def get_entries() -> list[tuple[str, int, float]]:
+    """Return the (path, size, last use) of all of the cache entries, least recently used first."""
+    entries = []
+
+    if not os.path.exists(CACHE_DIRECTORY):
+        return entries
+
+    for name in os.listdir(CACHE_DIRECTORY):
+        if not name.endswith(".svg"):
+            continue
+
+        path = os.path.join(CACHE_DIRECTORY, name)
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:  # evicted by some other process
+            continue
+
+        entries.append((path, stat.st_size, stat.st_mtime))
+
+    return sorted(entries, key=lambda entry: entry[2])
+
+
+def remove_stale():
+    """Remove the temporary files and the working directories left over by crashed processes."""
+    if not os.path.exists(CACHE_DIRECTORY):
+        return
+
+    now = time.time()
+
+    for name in os.listdir(CACHE_DIRECTORY):
+        path = os.path.join(CACHE_DIRECTORY, name)
+
+        try:
+            age = now - os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+
+        if name.endswith(".tmp") and age > STALE_TEMPORARY_AGE:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        elif name.startswith("work-") and path != _work_directory and age > STALE_WORK_DIRECTORY_AGE:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def evict(max_size: int = MAX_SIZE) -> int:
+    """Remove the least recently used entries until the cache is at most max_size bytes (and the
+    leftovers of crashed processes), returning the number of removed entries."""
+    remove_stale()
+
+    entries = get_entries()
+    size = sum(entry[1] for entry in entries)
+
+    removed = 0
+    for path, entry_size, _ in entries:
+        if size <= max_size:
+            break
+
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+        size -= entry_size
+
+    return removed
+
+
+def _link(source: str, destination: str):
+    """Hard-link the file (copying it if that's not possible)."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _finish():
+    """Save the statistics of this process, evict the cache and remove the working directory."""
+    if stats["hits"] + stats["misses"] != 0:
+        # a single small append is atomic, so parallel processes don't overwrite each other
+        with open(STATS_PATH, "a") as f:
+            f.write(f"{stats['hits']} {stats['misses']}\n")
+
+        evict()
+
+    if _work_directory is not None:
+        shutil.rmtree(_work_directory, ignore_errors=True)
+
+
+def install():
+    """Replace Manim's tex_to_svg_file by its cached version (calling this more than once does nothing)."""
+    global _work_directory
+
+    if _work_directory is not None:
+        return
+
+    from manim import config
+    from manim.mobject.text import tex_mobject
+    from manim.utils import tex_file_writing
+
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+
+    # Manim writes (and removes) a modified copy of the SVG next to it when parsing, so each
+    # process gets its own directory to prevent parallel builds from stepping on each other's toes
+    _work_directory = tempfile.mkdtemp(prefix="work-", dir=CACHE_DIRECTORY)
+    atexit.register(_finish)
+
+    original = tex_file_writing.tex_to_svg_file
+
+    def tex_to_svg_file(expression: str, environment: str | None = None, tex_template=None):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+
+        key = get_key(expression, environment, tex_template)
+        cached_path = os.path.join(CACHE_DIRECTORY, key + ".svg")
+        work_path = os.path.join(_work_directory, key + ".svg")
+
+        if os.path.exists(work_path):
+            stats["hits"] += 1
+            return work_path
+
+        try:
+            _link(cached_path, work_path)
+
+            # the modification time is the time of the last use (for LRU eviction)
+            os.utime(cached_path)
+            stats["hits"] += 1
+        except FileNotFoundError:
+            svg_path = original(expression, environment, tex_template)
+
+            # write to a temporary file first so other processes never see a partial entry
+            fd, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIRECTORY)
+            os.close(fd)
+            shutil.copyfile(svg_path, temporary_path)
+            os.replace(temporary_path, cached_path)
+
+            _link(cached_path, work_path)
+            stats["misses"] += 1
+
+        return work_path
+
+    tex_file_writing.tex_to_svg_file = tex_to_svg_file
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+
+def get_tex_calls(path: str) -> list[tuple[str, list, dict]]:
+    """Return the (class, args, kwargs) of all Tex/MathTex constructions with literal arguments
+    in the given module (calls with arguments built at runtime, like f-strings, are skipped)."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+
+    calls = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+            continue
+
+        if node.func.id not in TEX_CLASSES or len(node.args) == 0:
+            continue
+
+        try:
+            args = [ast.literal_eval(arg) for arg in node.args]
+            kwargs = {k.arg: ast.literal_eval(k.value) for k in node.keywords if k.arg is not None}
+        except ValueError:
+            continue
+
+        if not all(isinstance(arg, str) for arg in args):
+            continue
+
+        # only the arguments that change the TeX code matter
+        kwargs = {k: v for k, v in kwargs.items() if k in ("tex_environment", "arg_separator")}
+
+        if (call := (node.func.id, args, kwargs)) not in calls:
+            calls.append(call)
+
+    return calls
+
+
+def warm(path: str):
+    """Precompile all of the literal Tex/MathTex strings found in the module (see get_tex_calls)."""
+    import manim
+
+    install()
+
+    calls = get_tex_calls(path)
+
+    start = time.perf_counter()
+    for i, (name, args, kwargs) in enumerate(calls):
+        try:
+            getattr(manim, name)(*args, **kwargs)
+        except Exception as e:
+            print(f"WARNING: failed to compile {name}{tuple(args)}: {e}")
+
+        print(f"\r[{i + 1}/{len(calls)}] {stats['hits']} hits, {stats['misses']} misses", end="")
+
+    print(f"\nWarmed up {len(calls)} expressions in {time.perf_counter() - start:.2f}s")
+
+
+def print_stats():
+    """Print the statistics of all of the processes that used the cache, along with its size."""
+    hits = misses = 0
+
+    if os.path.exists(STATS_PATH):
+        with open(STATS_PATH) as f:
+            for line in f.read().splitlines():
+                h, m = map(int, line.split())
+                hits += h
+                misses += m
+
+    entries = get_entries()
+    size = sum(entry[1] for entry in entries)
+    ratio = hits / (hits + misses) if hits + misses != 0 else 0
+
+    print(f"entries: {len(entries)} ({size / 1024 / 1024:.2f} MB, limit {MAX_SIZE / 1024 / 1024:.0f} MB)")
+    print(f"hits:    {hits}")
+    print(f"misses:  {misses}")
+    print(f"ratio:   {ratio:.2%}")
+
+
+if __name__ == "__main__":
+    # Manim's arguments are passed through as they are
+    if len(sys.argv) > 1 and sys.argv[1] == "manim":
+        install()
+
+        from manim.__main__ import main
+
+        sys.argv = ["manim"] + sys.argv[2:]
+        main()
+
+    parser = argparse.ArgumentParser(description="A persistent cache of compiled Tex/MathTex SVGs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="show hit/miss statistics and the size of the cache")
+
+    evict_parser = subparsers.add_parser("evict", help="evict the least recently used entries")
+    evict_parser.add_argument(
+        "-m", "--max-size",
+        type=int,
+        default=MAX_SIZE // 1024 // 1024,
+        help="the size to evict the cache to (in MB)",
+    )
+
+    warm_parser = subparsers.add_parser("warm", help="precompile all literal Tex/MathTex strings of a module")
+    warm_parser.add_argument("module", help="the module to warm the cache up for (i.e. scenes.py)")
+
+    arguments = parser.parse_args()
+
+    if arguments.command == "stats":
+        print_stats()
+    elif arguments.command == "evict":
+        print(f"Evicted {evict(arguments.max_size * 1024 * 1024)} entries.")
+    elif arguments.command == "warm":
+        warm(arguments.module)
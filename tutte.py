@@ -0,0 +1,405 @@
+#!/bin/python3
+
+"""Tutte and chromatic polynomials of graphs, used by the Tutte videos.
+
+The Tutte polynomial is calculated by deletion-contraction, with the usual shortcuts: it is the
+product of the polynomials of the components and of the blocks (2-connected components), a bundle
+of k parallel edges that is a block contributes x + y + ... + y^(k-1) and loops contribute a y each,
+so only the 2-connected blocks are ever split. Their polynomials are cached by canonical form,
+since the same small blocks keep appearing deep in the recursion.
+
+The polynomials are kept as integer coefficients and only converted to sympy when displayed.
+
+Running this module checks the polynomials against the subset expansion and brute force.
+"""
+from collections import defaultdict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+from graphs import CompactGraph, count_components
+
+Vertex = Hashable
+Edge = Tuple[Vertex, Vertex]
+
+# a multigraph on integer vertices, the edges (u < v) mapped to their multiplicities
+Multigraph = Dict[Tuple[int, int], int]
+
+
+class Polynomial:
+    """A polynomial with integer coefficients, stored as an {exponents: coefficient} dictionary."""
+
+    def __init__(self, coefficients: Dict[Tuple[int, ...], int], variables: Tuple[str, ...] = ("x", "y")):
+        self.coefficients = {e: c for e, c in coefficients.items() if c != 0}
+        self.variables = variables
+
+    @classmethod
+    def constant(cls, c: int, variables: Tuple[str, ...] = ("x", "y")) -> "Polynomial":
+        return cls({(0,) * len(variables): c}, variables)
+
+    def __add__(self, other: "Polynomial") -> "Polynomial":
+        coefficients = dict(self.coefficients)
+        for e, c in other.coefficients.items():
+            coefficients[e] = coefficients.get(e, 0) + c
+
+        return Polynomial(coefficients, self.variables)
+
+    def __mul__(self, other: "Polynomial") -> "Polynomial":
+        coefficients = defaultdict(int)
+        for e1, c1 in self.coefficients.items():
+            for e2, c2 in other.coefficients.items():
+                coefficients[tuple(a + b for a, b in zip(e1, e2))] += c1 * c2
+
+        return Polynomial(coefficients, self.variables)
+
+    def __pow__(self, k: int) -> "Polynomial":
+        result = Polynomial.constant(1, self.variables)
+        for _ in range(k):
+            result = result * self
+
+        return result
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Polynomial) and self.coefficients == other.coefficients
+
+    def __call__(self, *values):
+        """Evaluate the polynomial (works for ints, floats and anything else that can be multiplied)."""
+        total = 0
+        for exponents, c in self.coefficients.items():
+            term = c
+            for value, exponent in zip(values, exponents):
+                term = term * value ** exponent
+            total = total + term
+
+        return total
+
+    def degree(self) -> Tuple[int, ...]:
+        """Return the maximal exponent of each of the variables."""
+        return tuple(max((e[i] for e in self.coefficients), default=0) for i in range(len(self.variables)))
+
+    def as_array(self) -> List:
+        """Return the coefficients as a (nested) list, indexed by the exponents."""
+        def build(prefix, dimension):
+            if dimension == len(self.variables):
+                return self.coefficients.get(prefix, 0)
+
+            return [build(prefix + (i,), dimension + 1) for i in range(self.degree()[dimension] + 1)]
+
+        return build((), 0)
+
+    def as_expr(self):
+        """Return the polynomial as a sympy expression (sympy is only imported here)."""
+        import sympy
+
+        symbols = sympy.symbols(self.variables)
+        return sympy.Add(*[
+            c * sympy.Mul(*[s ** e for s, e in zip(symbols, exponents)])
+            for exponents, c in sorted(self.coefficients.items(), reverse=True)
+        ])
+
+    def __repr__(self) -> str:
+        return f"Polynomial({str(self.as_expr())})"
+
+
+X = Polynomial({(1, 0): 1})
+Y = Polynomial({(0, 1): 1})
+ONE = Polynomial.constant(1)
+
+
+def _bundle(k: int) -> Polynomial:
+    """Return 1 + y + ... + y^(k-1)."""
+    return Polynomial({(0, i): 1 for i in range(k)})
+
+
+def _to_multigraph(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> Tuple[Multigraph, int]:
+    """Return the multigraph of the graph (without loops) and the number of its loops."""
+    indexes = {v: i for i, v in enumerate(vertices)}
+
+    graph, loops = defaultdict(int), 0
+    for u, v in edges:
+        u, v = sorted((indexes[u], indexes[v]))
+
+        if u == v:
+            loops += 1
+        else:
+            graph[(u, v)] += 1
+
+    return dict(graph), loops
+
+
+def _get_blocks(graph: Multigraph) -> List[Multigraph]:
+    """Return the blocks (2-connected components and bridge bundles) of the multigraph."""
+    compact = CompactGraph(dict.fromkeys(v for e in graph for v in e), graph)
+    labels = compact.vertices
+
+    order, low = [-1] * len(compact), [-1] * len(compact)
+    blocks, stack = [], []
+    counter = 0
+
+    # iterative Hopcroft-Tarjan, so deep graphs don't hit the recursion limit
+    for root in range(len(compact)):
+        if order[root] != -1:
+            continue
+
+        order[root] = low[root] = counter
+        counter += 1
+        dfs = [(root, -1, iter(dict.fromkeys(compact.adjacent(root))))]
+
+        while dfs:
+            v, parent, neighbours = dfs[-1]
+
+            for w in neighbours:
+                if w == parent:
+                    continue
+
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append((v, w))
+                    dfs.append((w, v, iter(dict.fromkeys(compact.adjacent(w)))))
+                    break
+
+                if order[w] < order[v]:
+                    low[v] = min(low[v], order[w])
+                    stack.append((v, w))
+            else:
+                dfs.pop()
+
+                if parent == -1:
+                    continue
+
+                low[parent] = min(low[parent], low[v])
+
+                # the parent is an articulation (or the root), so the edges above form a block
+                if low[v] >= order[parent]:
+                    block = {}
+                    while True:
+                        a, b = stack.pop()
+                        edge = tuple(sorted((labels[a], labels[b])))
+                        block[edge] = graph[edge]
+
+                        if (a, b) == (parent, v):
+                            break
+
+                    blocks.append(block)
+
+    return blocks
+
+
+def _refine(adjacency: Dict[int, List[Tuple[int, int]]], colors: Dict[int, int]) -> Dict[int, int]:
+    """Refine the coloring until the color of each vertex determines the colors of its neighbours.
+
+    The new colors are ordered by the old ones first, so the result doesn't depend on the labels."""
+    while True:
+        signatures = {v: (colors[v], tuple(sorted((colors[w], k) for w, k in adjacency[v]))) for v in adjacency}
+        palette = {s: i for i, s in enumerate(sorted(set(signatures.values())))}
+
+        if len(palette) == len(set(colors.values())):
+            return colors
+
+        colors = {v: palette[signatures[v]] for v in adjacency}
+
+
+def _get_canonical_form(graph: Multigraph) -> Tuple:
+    """Return the canonical form of the multigraph, which is the same for all of its isomorphic copies.
+
+    The vertices are ordered by individualization-refinement (like nauty does, but without pruning
+    the search by automorphisms), the form being the smallest of the relabeled edge lists."""
+    adjacency = defaultdict(list)
+    for (u, v), k in graph.items():
+        adjacency[u].append((v, k))
+        adjacency[v].append((u, k))
+
+    best = None
+
+    def search(colors):
+        nonlocal best
+
+        colors = _refine(adjacency, colors)
+
+        cells = defaultdict(list)
+        for v, c in colors.items():
+            cells[c].append(v)
+
+        if len(cells) == len(colors):
+            form = tuple(sorted((*sorted((colors[u], colors[v])), k) for (u, v), k in graph.items()))
+            best = form if best is None or form < best else best
+            return
+
+        # individualize each of the vertices of the first smallest cell
+        color, cell = min(cells.items(), key=lambda item: (len(item[1]) == 1, len(item[1]), item[0]))
+        for v in cell:
+            search({w: 2 * c + (w != v and c == color) for w, c in colors.items()})
+
+    search({v: 0 for v in adjacency})
+
+    return best
+
+
+class _Cache:
+    """The Tutte polynomials of the 2-connected blocks, by their canonical forms."""
+
+    def __init__(self):
+        self.exact = {}
+        self.canonical = {}
+        self.hits = self.misses = 0
+
+    def get(self, graph: Multigraph):
+        key = frozenset(graph.items())
+
+        if key not in self.exact:
+            self.exact[key] = _get_canonical_form(graph)
+
+        polynomial = self.canonical.get(self.exact[key])
+
+        if polynomial is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return polynomial
+
+    def set(self, graph: Multigraph, polynomial: Polynomial):
+        self.canonical[self.exact[frozenset(graph.items())]] = polynomial
+
+
+_cache = _Cache()
+
+
+def _tutte(graph: Multigraph) -> Polynomial:
+    """Return the Tutte polynomial of a loopless multigraph."""
+    polynomial = ONE
+
+    for block in _get_blocks(graph):
+        if len(block) == 1:
+            k, = block.values()
+            polynomial = polynomial * (X + Y * _bundle(k - 1) if k > 1 else X)
+        else:
+            polynomial = polynomial * _tutte_block(block)
+
+    return polynomial
+
+
+def _tutte_block(block: Multigraph) -> Polynomial:
+    """Return the Tutte polynomial of a 2-connected loopless multigraph (with at least 3 vertices)."""
+    if (polynomial := _cache.get(block)) is not None:
+        return polynomial
+
+    # splitting at the vertex of the maximal degree shrinks the blocks the fastest
+    degrees = defaultdict(int)
+    for (u, v), k in block.items():
+        degrees[u] += k
+        degrees[v] += k
+
+    (u, v), k = max(block.items(), key=lambda item: (degrees[item[0][0]] + degrees[item[0][1]], item[0]))
+
+    # delete the whole bundle (the rest stays connected, since the block is 2-connected)...
+    deleted = {e: c for e, c in block.items() if e != (u, v)}
+
+    # ...and contract it (v into u), the other edges of the bundle becoming loops
+    contracted = defaultdict(int)
+    for (a, b), c in deleted.items():
+        a, b = (u if a == v else a), (u if b == v else b)
+        contracted[tuple(sorted((a, b)))] += c
+
+    polynomial = _tutte(deleted) + _bundle(k) * _tutte(dict(contracted))
+
+    _cache.set(block, polynomial)
+
+    return polynomial
+
+
+def tutte(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> Polynomial:
+    """Return the Tutte polynomial T(x, y) of the graph (parallel edges and loops are allowed)."""
+    graph, loops = _to_multigraph(list(vertices), list(edges))
+    return _tutte(graph) * Y ** loops
+
+
+def chromatic(vertices: Sequence[Vertex], edges: Sequence[Edge]) -> Polynomial:
+    """Return the chromatic polynomial P(x) of the graph, i.e. the number of its colorings using x colors.
+
+    It is calculated from the Tutte polynomial as P(x) = (-1)^(n - c) x^c T(1 - x, 0)."""
+    vertices = list(vertices)
+    graph, loops = _to_multigraph(vertices, list(edges))
+
+    if loops != 0:
+        return Polynomial({}, ("x",))
+
+    components = count_components(range(len(vertices)), graph)
+
+    one_minus_x = Polynomial({(0,): 1, (1,): -1}, ("x",))
+
+    polynomial = Polynomial({}, ("x",))
+    for (i, j), c in _tutte(graph).coefficients.items():
+        if j == 0:
+            polynomial = polynomial + Polynomial.constant(c, ("x",)) * one_minus_x ** i
+
+    sign = (-1) ** (len(vertices) - components)
+
+    return Polynomial({(i + components,): sign * c for (i,), c in polynomial.coefficients.items()}, ("x",))
+
+
+if __name__ == "__main__":
+    import time
+    from itertools import combinations, product
+
+    import networkx as nx
+
+    from spanning_trees import count_spanning_trees
+
+    def subset_expansion(vertices, edges):
+        """The Tutte polynomial by its definition (the sum over all of the subsets of the edges)."""
+        def rank(subset):
+            g = nx.Graph()
+            g.add_nodes_from(vertices)
+            g.add_edges_from(subset)
+            return len(vertices) - nx.number_connected_components(g)
+
+        r = rank(edges)
+        polynomial = Polynomial({})
+        for k in range(len(edges) + 1):
+            for subset in combinations(edges, k):
+                polynomial = polynomial + (X + Polynomial.constant(-1)) ** (r - rank(subset)) \
+                                        * (Y + Polynomial.constant(-1)) ** (k - rank(subset))
+
+        return polynomial
+
+    def colorings(vertices, edges, k):
+        indexes = {v: i for i, v in enumerate(vertices)}
+        return sum(
+            all(c[indexes[u]] != c[indexes[v]] for u, v in edges)
+            for c in product(range(k), repeat=len(vertices))
+        )
+
+    graphs = [(f"K_{n}", nx.complete_graph(n)) for n in range(1, 6)]
+    graphs += [(f"C_{n}", nx.cycle_graph(n)) for n in range(3, 7)]
+    graphs += [(f"G(7, 0.5) #{i}", nx.gnp_random_graph(7, 0.5, seed=i)) for i in range(8)]
+    graphs += [("two triangles", nx.Graph([(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (6, 6)]))]
+
+    for name, g in graphs:
+        vertices, edges = list(g.nodes), list(g.edges)
+
+        t = tutte(vertices, edges)
+        assert t == subset_expansion(vertices, edges), name
+
+        p = chromatic(vertices, edges)
+        assert all(p(k) == colorings(vertices, edges, k) for k in range(4)), name
+
+        print(f"{name}: T = {t.as_expr()}")
+
+    # parallel edges and loops
+    multigraph = [(0, 1), (0, 1), (1, 2), (2, 0), (2, 2), (2, 3)]
+    assert tutte(range(4), multigraph) == subset_expansion(list(range(4)), multigraph)
+
+    # the graphs that would take forever by the subset expansion
+    for name, g in [("Petersen", nx.petersen_graph()), ("K_7", nx.complete_graph(7)), ("4x4 grid", nx.grid_2d_graph(4, 4))]:
+        vertices, edges = list(g.nodes), list(g.edges)
+
+        start = time.perf_counter()
+        t = tutte(vertices, edges)
+        p = chromatic(vertices, edges)
+        elapsed = time.perf_counter() - start
+
+        assert t(1, 1) == count_spanning_trees(vertices, edges), name
+
+        print(f"{name}: {t(1, 1)} spanning trees, {p(3)} 3-colorings ({elapsed:.2f}s)")
+
+    print(f"cache: {_cache.hits} hits, {_cache.misses} misses")